@@ -1,3 +1,8 @@
+import time
+# Açılış süresi ölçümü için (benchmarks/startup_time.py)
+STARTUP_TIME = time.perf_counter()
+
+import io
 import os
 import warnings
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
@@ -5,20 +10,50 @@ warnings.filterwarnings('ignore', category=UserWarning)
 
 from tkinter import *
 from tkinter import ttk, filedialog, messagebox
+import queue
+import sys
 import threading
-from moviepy import AudioFileClip
-import whisper 
 
-try:
-    import cv2
-    from PIL import Image, ImageTk
-    THUMBNAIL_ENABLED = True
-except ImportError:
-    THUMBNAIL_ENABLED = False
+# Not: whisper (torch), moviepy, numpy, cv2 ve PIL burada içe aktarılmaz; pencere
+# hemen açılsın diye ilk kullanımda ya da arka plan ısınmasında yüklenirler.
+import media_info
+import pipeline
+from backends import DEFAULT_BACKEND, configure_threads
+from cache import TranscriptCache
+from config import MODEL_SIZES, load_config, save_config
+from instrument import RunRecorder
+from jobs import (CANCELLED, DONE, FAILED, FINISHED_STATES, MODEL_ERROR_PREFIX, QUEUED, STATUS_LABELS, TRANSCRIBING,
+                  JobQueue)
+from language import REROUTE, SKIP, LanguageRules
+from library import TranscriptLibrary
+import transcript
+from transcript_view import VirtualTranscriptView
+
+# Canlı segment akışı: arayüz bu aralıkla ve her turda en fazla bu kadar olayla güncellenir
+UI_FLUSH_MS = 200
+MAX_SEGMENTS_PER_FLUSH = 500
+
+# Thumbnail gösterimi için Pillow ilk kullanımda yüklenir; None: henüz denenmedi.
+# Thumbnail'ın kendisi media_info.py'de arka planda üretilir (yoksa Tk'nin PNG desteği kullanılır).
+Image = ImageTk = None
+THUMBNAIL_ENABLED = None
+
+
+def load_thumbnail_modules():
+    """Pillow'u ilk kullanımda içe aktar, kullanılabilir olup olmadığını döndür"""
+    global Image, ImageTk, THUMBNAIL_ENABLED
+    if THUMBNAIL_ENABLED is None:
+        try:
+            from PIL import Image as image_module, ImageTk as image_tk_module
+            Image, ImageTk = image_module, image_tk_module
+            THUMBNAIL_ENABLED = True
+        except ImportError:
+            THUMBNAIL_ENABLED = False
+    return THUMBNAIL_ENABLED
 
 
 class ModernTranscriptionApp:
-    def __init__(self, root):
+    def __init__(self, root, warm_up=True):
         self.root = root
         self.root.title("SpeechRecog")
         self.root.geometry("1280x720")
@@ -44,12 +79,43 @@ class ModernTranscriptionApp:
             'small': ('Segoe UI', 9)
         }
         
+        self.settings = load_config()
         self.transcript_text = ""
         self.whisper_model = None
-        self.is_processing = False
+        self.model_error = None  # Son model yüklemesi başarısız olduysa hata mesajı
+        self.model_error_reported = False  # Model hatası bu yükleme için kullanıcıya gösterildi mi
+        self.model_name = self.settings['model']
+        self.audio_mode = self.settings['audio_mode']
+        # Çıkarım arka ucu: stock (fp32) ya da int8 (dinamik nicemleme)
+        self.backend = self.settings['backend']
+        self.transcript_cache = TranscriptCache()
+        # Biten işlerin segmentleri aranabilir kütüphaneye geldikçe yazılır
+        self.library = TranscriptLibrary()
+        self.search_window = None
+        # Uzun ses modu (chunk_workers > 1 ise uzun dosyalar paralel parçalanır)
+        self.chunker = None
+        # Konuşma dışı sesi modele vermeden atla
+        self.use_vad = self.settings['vad']
+        # Tam çözümden önce dil tespiti ve atlama/yönlendirme kuralları
+        self.language_rules = LanguageRules.from_settings(self.settings)
+        
+        # İş kuyruğu: ses çıkarma ve transkripsiyon ayrı havuzlarda, üst üste biner
+        self.ui_events = queue.Queue()
+        self.job_queue = JobQueue(self.job_context, on_event=self.on_job_event, recorder_factory=self.create_recorder)
+        self.display_job = None
+        self.display_segment_count = 0
+        self.stream_started = None
+        # Arka planda yoklanan dosya bilgileri (yol -> media_info.probe sonucu)
+        self.media_info = {}
+        self.thumbnail_target = None
+        # Son gözlenen transkripsiyon hızı (ses sn / duvar sn), kuyruk ETA'sı için
+        self.transcribe_speed = None
         
         self.setup_ui()
-        self.load_model()
+        self.root.after(UI_FLUSH_MS, self.process_ui_events)
+        # Ağır modüller ve model, pencere çizildikten sonra arka planda hazırlanır
+        if warm_up:
+            self.root.after_idle(self.load_model)
     
     def setup_ui(self):
         # Ana container
@@ -92,6 +158,9 @@ class ModernTranscriptionApp:
         # Dosya yükleme kartı
         self.create_upload_card(main_frame)
         
+        # İş kuyruğu kartı
+        self.create_jobs_card(main_frame)
+        
         # 3. ORTADA KALAN ALANI DOLDURACAK OLANI EN SON PAKETLE
         # Bu, expand=True sayesinde kalan tüm boşluğu kaplayacaktır.
         self.create_transcription_cards(main_frame)
@@ -109,83 +178,69 @@ class ModernTranscriptionApp:
         self.progress['value'] = 0
         self.progress_label.configure(text="Hazır - Video seçin")
     
-    def show_thumbnail(self, video_path):
-        """Video thumbnail'ını göster"""
-        if not THUMBNAIL_ENABLED:
-            print("Thumbnail için cv2 ve Pillow kütüphaneleri gerekli.")
-            file_name = os.path.basename(video_path)
-            file_size = os.path.getsize(video_path) / (1024*1024)
-            self.drop_label.configure(text=f"✅ Video seçildi: {file_name}")
-            self.file_info_label.configure(text=f"Boyut: {file_size:.1f} MB")
-            self.file_info_label.pack(pady=(5, 0))
-            return
-
+    def show_thumbnail(self, info):
+        """Arka planda hazırlanan thumbnail'ı ve dosya bilgisini göster (hiçbir şey çözülmez)"""
+        file_name = info.get('name') or os.path.basename(info['path'])
+        details = "\n".join(media_info.describe(info)) if 'size' in info else ""
         try:
-            # Video'dan ilk frame'i al
-            cap = cv2.VideoCapture(video_path)
-            ret, frame = cap.read()
-            cap.release()
+            if not info.get('thumbnail'):
+                raise Exception("thumbnail yok")
+            if load_thumbnail_modules():
+                photo = ImageTk.PhotoImage(Image.open(info['thumbnail']))
+            else:
+                photo = PhotoImage(file=info['thumbnail'])
             
-            if ret:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Boyutları ayarla (max 200x150)
-                height, width = frame_rgb.shape[:2]
-                max_width, max_height = 200, 150
-                
-                if width > max_width or height > max_height:
-                    ratio = min(max_width/width, max_height/height)
-                    new_width = int(width * ratio)
-                    new_height = int(height * ratio)
-                    frame_rgb = cv2.resize(frame_rgb, (new_width, new_height))
-                
-                pil_image = Image.fromarray(frame_rgb)
-                photo = ImageTk.PhotoImage(pil_image)
-                
-                # Başlangıç widget'larını gizle
-                self.icon_label.pack_forget()
-                self.drop_label.pack_forget()
-                self.formats_label.pack_forget()
-                
-                # Thumbnail'ı göster
-                self.thumbnail_label.configure(image=photo)
-                self.thumbnail_label.image = photo  # Referansı tut
-                self.thumbnail_label.pack(pady=(0, 10))
-                
-                # Dosya bilgisini göster
-                file_name = os.path.basename(video_path)
-                file_size = os.path.getsize(video_path) / (1024*1024)  # MB
-                self.file_info_label.configure(text=f"✅ {file_name}\nBoyut: {file_size:.1f} MB")
-                self.file_info_label.pack(pady=(0, 10))
-                
-                # Yeni video seçimi için buton
-                # Buton zaten varsa tekrar oluşturma
-                if not hasattr(self, 'new_video_btn'):
-                    self.new_video_btn = Button(
-                        self.drop_inner,
-                        text="🔄 Başka Video Seç",
-                        font=self.fonts['small'],
-                        bg=self.colors['accent'],
-                        fg='white',
-                        relief='flat',
-                        bd=0,
-                        padx=15,
-                        pady=5,
-                        cursor='hand2',
-                        command=self.reset_upload_area
-                    )
-                self.new_video_btn.pack()
+            # Başlangıç widget'larını gizle
+            self.icon_label.pack_forget()
+            self.drop_label.pack_forget()
+            self.formats_label.pack_forget()
+            
+            # Thumbnail'ı göster
+            self.thumbnail_label.configure(image=photo)
+            self.thumbnail_label.image = photo  # Referansı tut
+            self.thumbnail_label.pack(pady=(0, 10))
+            
+            # Dosya bilgisini göster
+            self.file_info_label.configure(text=f"✅ {file_name}\n{details}")
+            self.file_info_label.pack(pady=(0, 10))
+            
+            # Yeni video seçimi için buton
+            # Buton zaten varsa tekrar oluşturma
+            if not hasattr(self, 'new_video_btn'):
+                self.new_video_btn = Button(
+                    self.drop_inner,
+                    text="🔄 Başka Video Seç",
+                    font=self.fonts['small'],
+                    bg=self.colors['accent'],
+                    fg='white',
+                    relief='flat',
+                    bd=0,
+                    padx=15,
+                    pady=5,
+                    cursor='hand2',
+                    command=self.reset_upload_area
+                )
+            self.new_video_btn.pack()
                 
         except Exception as e:
-            print(f"Thumbnail oluşturulamadı: {e}")
+            print(f"Thumbnail gösterilemedi: {e}")
             # Hata durumunda sadece dosya bilgisini göster
-            file_name = os.path.basename(video_path)
-            file_size = os.path.getsize(video_path) / (1024*1024)
-            
             self.drop_label.configure(text=f"✅ Video seçildi: {file_name}")
-            self.file_info_label.configure(text=f"Boyut: {file_size:.1f} MB")
+            self.file_info_label.configure(text=details)
             self.file_info_label.pack(pady=(5, 0))
     
+    def request_media_info(self, video_path):
+        """Dosya bilgisini ve thumbnail'ı arka planda yokla; sonuç UI olay kuyruğuyla gelir"""
+        media_info.probe_async(video_path, lambda info, error: self.ui_events.put((None, "media", (info, error))))
+    
+    def on_media_info(self, info, error=None):
+        if error is not None:
+            print(f"Medya bilgisi alınamadı ({info['name']}): {error}")
+        else:
+            self.media_info[info['path']] = info
+        if info['path'] == self.thumbnail_target:
+            self.show_thumbnail(info)
+    
     def reset_upload_area(self):
         """Upload alanını sıfırla"""
         # Thumbnail, dosya bilgisi ve butonu gizle
@@ -232,10 +287,176 @@ class ModernTranscriptionApp:
         for widget in [self.drop_frame, self.drop_inner, self.icon_label, self.drop_label, self.formats_label]:
             widget.bind("<Button-1>", lambda e: self.select_file())
     
+    def create_jobs_card(self, parent):
+        card = Frame(parent, bg=self.colors['card_bg'], relief='flat', bd=0)
+        card.pack(fill=X, pady=(0, 15), side=TOP)
+        
+        inner_frame = Frame(card, bg=self.colors['card_bg'])
+        inner_frame.pack(fill=BOTH, expand=True, padx=15, pady=10)
+        
+        header_frame = Frame(inner_frame, bg=self.colors['card_bg'])
+        header_frame.pack(fill=X, pady=(0, 5))
+        
+        title_label = Label(header_frame, text="📋 İş Kuyruğu", font=self.fonts['subheading'], bg=self.colors['card_bg'], fg=self.colors['text'])
+        title_label.pack(side=LEFT)
+        
+        cancel_btn = self.create_mini_button(header_frame, "🚫 İptal", self.cancel_selected_job)
+        cancel_btn.pack(side=RIGHT, padx=(5, 0))
+        
+        priority_btn = self.create_mini_button(header_frame, "⬆️ Öne al", self.raise_selected_job)
+        priority_btn.pack(side=RIGHT)
+        
+        self.queue_eta_label = Label(header_frame, text="", font=self.fonts['small'], bg=self.colors['card_bg'], fg=self.colors['text_secondary'])
+        self.queue_eta_label.pack(side=RIGHT, padx=(0, 10))
+        
+        search_btn = self.create_mini_button(header_frame, "🔍 Ara", self.search_library)
+        search_btn.pack(side=RIGHT, padx=(0, 10))
+        
+        self.search_entry = Entry(header_frame, font=self.fonts['small'], bg='#404040', fg=self.colors['text'], insertbackground=self.colors['text'], relief='flat', bd=0, width=28)
+        self.search_entry.pack(side=RIGHT, padx=(0, 5), ipady=4)
+        self.search_entry.bind("<Return>", lambda event: self.search_library())
+        
+        style = ttk.Style()
+        style.configure("Jobs.Treeview", background='#404040', fieldbackground='#404040', foreground=self.colors['text'], borderwidth=0, font=self.fonts['small'])
+        style.configure("Jobs.Treeview.Heading", font=self.fonts['small'])
+        style.map("Jobs.Treeview", background=[('selected', self.colors['accent'])])
+        
+        columns = ("position", "file", "duration", "priority", "status", "progress")
+        self.jobs_view = ttk.Treeview(inner_frame, columns=columns, show='headings', height=4, style="Jobs.Treeview", selectmode='browse')
+        for column, heading, width, anchor in (
+            ("position", "Sıra", 50, CENTER),
+            ("file", "Dosya", 350, W),
+            ("duration", "Süre", 70, CENTER),
+            ("priority", "Öncelik", 70, CENTER),
+            ("status", "Durum", 180, W),
+            ("progress", "İlerleme", 80, CENTER),
+        ):
+            self.jobs_view.heading(column, text=heading)
+            self.jobs_view.column(column, width=width, anchor=anchor, stretch=(column == "file"))
+        self.jobs_view.pack(fill=X)
+        self.jobs_view.bind("<<TreeviewSelect>>", self.on_job_select)
+    
+    def job_duration(self, job):
+        """İşin ses süresi: çıkarıldıysa gerçek süre, değilse arka plan yoklamasındaki süre"""
+        return job.duration or self.media_info.get(job.path, {}).get('duration') or 0.0
+    
+    def refresh_job_rows(self):
+        """İş satırlarını (sıra, süre, durum, ilerleme) ve kuyruğun kalan süresini güncelle"""
+        remaining = 0.0
+        for job in self.job_queue.jobs.values():
+            duration = self.job_duration(job)
+            if job.status not in FINISHED_STATES:
+                remaining += max(duration - job.position, 0.0)
+            position = self.job_queue.queue_position(job) if job.status == QUEUED else ""
+            if job.status == DONE:
+                progress = "%100"
+            elif job.duration > 0 and job.position > 0:
+                progress = f"%{min(job.position / job.duration, 1.0) * 100:.0f}"
+            else:
+                progress = ""
+            length = self.format_time(duration).split(',')[0] if duration else ""
+            values = (position, os.path.basename(job.path), length, job.priority, STATUS_LABELS[job.status], progress)
+            item = str(job.id)
+            if self.jobs_view.exists(item):
+                self.jobs_view.item(item, values=values)
+            else:
+                self.jobs_view.insert('', END, iid=item, values=values)
+        if remaining and self.transcribe_speed:
+            self.queue_eta_label.configure(text=f"Kuyruk ~{self.format_eta(remaining / self.transcribe_speed)}")
+        else:
+            self.queue_eta_label.configure(text="")
+    
+    def selected_job(self):
+        selection = self.jobs_view.selection()
+        return self.job_queue.jobs.get(int(selection[0])) if selection else None
+    
+    def on_job_select(self, event=None):
+        job = self.selected_job()
+        if job is not None and job is not self.display_job:
+            self.show_job(job)
+    
+    def cancel_selected_job(self):
+        job = self.selected_job()
+        if job is None:
+            messagebox.showinfo("Bilgi", "İptal edilecek işi listeden seçin.")
+            return
+        if self.job_queue.cancel(job.id):
+            self.update_status(f"🚫 İptal istendi: {os.path.basename(job.path)}")
+    
+    def raise_selected_job(self):
+        job = self.selected_job()
+        if job is None:
+            messagebox.showinfo("Bilgi", "Öne alınacak işi listeden seçin.")
+            return
+        if not self.job_queue.set_priority(job.id, job.priority + 1):
+            messagebox.showinfo("Bilgi", "Yalnızca sırada ya da hazırda bekleyen işler öne alınabilir.")
+    
+    def search_library(self):
+        """Kütüphanede ara ve sonuçları (dosya, zaman kodu, metin) bir pencerede listele"""
+        query = self.search_entry.get().strip()
+        if not query:
+            return
+        try:
+            started = time.perf_counter()
+            results = self.library.search(query)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            messagebox.showerror("Hata", f"Arama hatası: {str(e)}")
+            return
+        self.update_status(f"🔍 \"{query}\": {len(results)} sonuç ({elapsed_ms:.0f} ms)")
+        if not results:
+            messagebox.showinfo("Bilgi", "Kütüphanede eşleşen transkript bulunamadı.")
+            return
+        
+        if self.search_window is None or not self.search_window.winfo_exists():
+            self.search_window = Toplevel(self.root, bg=self.colors['bg'])
+            self.search_window.geometry("800x350")
+            columns = ("file", "time", "text")
+            self.search_view = ttk.Treeview(self.search_window, columns=columns, show='headings', style="Jobs.Treeview", selectmode='browse')
+            for column, heading, width in (("file", "Dosya", 200), ("time", "Zaman", 80), ("text", "Metin", 500)):
+                self.search_view.heading(column, text=heading)
+                self.search_view.column(column, width=width, anchor=W, stretch=(column == "text"))
+            self.search_view.pack(fill=BOTH, expand=True, padx=10, pady=10)
+            self.search_view.bind("<<TreeviewSelect>>", self.on_search_select)
+        self.search_window.title(f"🔍 {query}")
+        self.search_view.delete(*self.search_view.get_children())
+        self.search_results = results
+        for index, result in enumerate(results):
+            name = result['name'] if result['complete'] else f"{result['name']} (yarım)"
+            self.search_view.insert('', END, iid=str(index), values=(name, self.format_time(result['start']).split(',')[0], result['text']))
+        self.search_window.lift()
+    
+    def on_search_select(self, event=None):
+        selection = self.search_view.selection()
+        if selection:
+            self.open_search_result(self.search_results[int(selection[0])])
+    
+    def open_search_result(self, result):
+        """Sonucun dosyasını kartlarda göster (gerekirse kütüphaneden yükle) ve zaman koduna atla"""
+        job = self.display_job
+        if job is None or os.path.abspath(job.path) != result['path']:
+            job = next((j for j in self.job_queue.jobs.values()
+                        if os.path.abspath(j.path) == result['path'] and j.status in FINISHED_STATES), None)
+            if job is not None:
+                self.show_job(job)
+            else:
+                self.display_job = None
+                self.transcript_store.clear()
+                self.transcript_store.extend(self.library.file_segments(result['file_id']))
+                self.display_segment_count = 0
+        index = self.transcript_store.index_at(result['start'])
+        for view in self.transcript_views.values():
+            view.first_visible = 0
+            view.scroll_to_index(index)
+        self.update_status(f"🔍 {result['name']} · {self.format_time(result['start']).split(',')[0]}")
+    
     def create_transcription_cards(self, parent):
         trans_container = Frame(parent, bg=self.colors['bg'])
         trans_container.pack(fill=BOTH, expand=True, pady=(0, 15))
         
+        # Gösterilen işin segmentleri; iki kart da yalnızca görünen satırları buradan çizer
+        self.transcript_store = transcript.SegmentStore()
+        self.transcript_views = {}
         self.create_transcript_card(trans_container, "⏰ TimeCode Transcript", "timecode")
         self.create_transcript_card(trans_container, "📝 Transkript", "clean")
     
@@ -264,18 +485,11 @@ class ModernTranscriptionApp:
         text_frame = Frame(inner_frame, bg=self.colors['card_bg'])
         text_frame.pack(fill=BOTH, expand=True)
         
-        text_widget = Text(text_frame, font=self.fonts['body'], bg='#404040', fg=self.colors['text'], insertbackground=self.colors['text'], selectbackground=self.colors['accent'], relief='flat', bd=0, padx=10, pady=10, wrap=WORD)
-        
-        scrollbar = ttk.Scrollbar(text_frame, orient=VERTICAL, command=text_widget.yview)
-        text_widget.configure(yscrollcommand=scrollbar.set)
-        
-        text_widget.pack(side=LEFT, fill=BOTH, expand=True)
-        scrollbar.pack(side=RIGHT, fill=Y)
-        
-        if card_type == "timecode":
-            self.timecode_text = text_widget
-        else:
-            self.clean_text = text_widget
+        text_options = dict(font=self.fonts['body'], bg='#404040', fg=self.colors['text'], insertbackground=self.colors['text'], selectbackground=self.colors['accent'], relief='flat', bd=0, padx=10, pady=10)
+        view = VirtualTranscriptView(text_frame, self.transcript_store, clean=(card_type != "timecode"),
+                                     text_options=text_options, bg=self.colors['card_bg'])
+        view.pack(fill=BOTH, expand=True)
+        self.transcript_views[card_type] = view
     
     def create_progress_bar(self, parent):
         self.progress_container = Frame(parent, bg=self.colors['bg'])
@@ -302,6 +516,11 @@ class ModernTranscriptionApp:
         self.status_label = Label(status_frame, text="Hazır", font=self.fonts['small'], bg=self.colors['bg'], fg=self.colors['text_secondary'], anchor=W)
         self.status_label.pack(side=LEFT)
         
+        self.model_selector = ttk.Combobox(status_frame, values=MODEL_SIZES, state='readonly', width=8, font=self.fonts['small'])
+        self.model_selector.set(self.model_name)
+        self.model_selector.bind("<<ComboboxSelected>>", self.change_model)
+        self.model_selector.pack(side=RIGHT, padx=(10, 0))
+        
         self.model_status = Label(status_frame, text="Model yükleniyor...", font=self.fonts['small'], bg=self.colors['bg'], fg=self.colors['text_secondary'], anchor=E)
         self.model_status.pack(side=RIGHT)
     
@@ -312,133 +531,305 @@ class ModernTranscriptionApp:
         return button
     
     def load_model(self):
+        """Ağır modülleri içe aktar ve seçili modeli arka planda yükle"""
+        model_name = self.model_name
+        self.whisper_model = None
+        self.model_error = None
+        self.model_error_reported = False
+        self.model_status.configure(text=f"Model yükleniyor ({model_name})...", fg=self.colors['text_secondary'])
+        
         def load():
+            # Tk'ye bu thread'den dokunulmaz; sonuç "model" olayıyla ana thread'e iletilir
             try:
-                self.whisper_model = whisper.load_model("turbo") 
-                self.model_status.configure(text="✅ Model hazır", fg=self.colors['success'])
-                self.update_status("Model başarıyla yüklendi")
+                import_seconds = pipeline.warm_up_imports()
+                load_thumbnail_modules()
+                configure_threads(self.settings['intra_op_threads'], self.settings['inter_op_threads'])
+                model, load_seconds = pipeline.get_model(model_name, self.backend)
+                result = (model_name, model, import_seconds, load_seconds, None)
             except Exception as e:
-                self.model_status.configure(text="❌ Model hatası", fg=self.colors['error'])
-                self.update_status(f"Model yükleme hatası: {str(e)}")
+                result = (model_name, None, 0.0, 0.0, str(e))
+            self.ui_events.put((None, "model", result))
         
         thread = threading.Thread(target=load, daemon=True)
         thread.start()
     
+    def on_model_loaded(self, model_name, model, import_seconds, load_seconds, error):
+        """Arka planda yüklenen modelin sonucu (ana thread'de, process_ui_events'ten)"""
+        if model_name != self.model_name:
+            return  # Bu sırada başka bir model seçildi
+        if error is not None:
+            # Modeli bekleyen işler bu hatayla sonlanır
+            self.model_error = error
+            self.model_status.configure(text="❌ Model hatası", fg=self.colors['error'])
+            self.update_status(f"Model yükleme hatası: {error}")
+            return
+        self.whisper_model = model
+        self.update_chunker()
+        timing = f"{load_seconds:.1f} sn" if load_seconds else "bellekten"
+        backend = "" if self.backend == DEFAULT_BACKEND else f", {self.backend}"
+        self.model_status.configure(text=f"✅ Model hazır ({model_name}{backend}, {timing})", fg=self.colors['success'])
+        self.update_status(f"Model başarıyla yüklendi (modüller {import_seconds:.1f} sn, model {timing})")
+    
+    def update_chunker(self):
+        """Uzun ses modu açıksa, işçi havuzunu seçili modele göre hazırla"""
+        workers = self.settings['chunk_workers']
+        if self.chunker is not None and self.chunker.model_name != self.model_name:
+            self.chunker.close()
+            self.chunker = None
+        if self.chunker is None and workers > 1:
+            from chunked import ChunkedTranscriber
+            self.chunker = ChunkedTranscriber(self.model_name, workers=workers, backend=self.backend,
+                                              inter_op_threads=self.settings['inter_op_threads'])
+    
+    def change_model(self, event=None):
+        """Model seçim kutusundan yeni model seçildi"""
+        model_name = self.model_selector.get()
+        if model_name == self.model_name:
+            return
+        if self.has_active_jobs():
+            messagebox.showwarning("Uyarı", "Kuyrukta işler var, model değiştirilemez.")
+            self.model_selector.set(self.model_name)
+            return
+        self.model_name = model_name
+        save_config({'model': model_name})
+        self.load_model()
+    
     def update_status(self, message):
         self.status_label.configure(text=message)
         self.root.update_idletasks()
     
     def select_file(self):
-        if self.is_processing:
-            messagebox.showwarning("Uyarı", "İşlem devam ediyor, lütfen bekleyin.")
-            return
-            
-        file_path = filedialog.askopenfilename(
+        file_paths = filedialog.askopenfilenames(
             title="Video Dosyası Seç",
             filetypes=[("Video files", "*.mp4 *.avi *.mov *.mkv *.wmv"), ("All files", "*.*")]
         )
-        if file_path:
-            self.show_thumbnail(file_path)
-            self.process_video(file_path)
+        if file_paths:
+            self.thumbnail_target = file_paths[-1]
+            for file_path in file_paths:
+                self.request_media_info(file_path)
+                self.process_video(file_path)
+    
+    def process_video(self, video_path, priority=0):
+        """Videoyu iş kuyruğuna ekle; ses çıkarma ve transkripsiyon sırası gelince yapılır"""
+        job = self.job_queue.submit(video_path, priority)
+        self.update_status(f"➕ Kuyruğa eklendi: {os.path.basename(video_path)}")
+        return job
+    
+    def job_context(self):
+        """İş kuyruğunun her iş için kullandığı pipeline parametreleri"""
+        return {
+            'model': self.whisper_model,
+            'model_name': self.model_name,
+            'model_error': self.model_error,
+            'backend': self.backend,
+            'audio_mode': self.audio_mode,
+            'cache': self.transcript_cache,
+            'library': self.library,
+            'chunker': self.chunker,
+            'vad': self.use_vad,
+            'language_rules': self.language_rules,
+        }
     
-    def process_video(self, video_path):
-        if not self.whisper_model:
-            messagebox.showerror("Hata", "Whisper modeli henüz yüklenmedi. Lütfen bekleyin.")
+    def create_recorder(self, job):
+        """Her iş için aşama sürelerini toplayan kaydedici (rapor iş bitip ekrana yazılınca eklenir)"""
+        return RunRecorder(job.path, profile=self.settings['profile'], model=self.model_name, backend=self.backend,
+                           audio_mode=self.audio_mode, vad=self.use_vad, mode="gui")
+    
+    def finish_recorder(self, job):
+        if job.recorder is None:
             return
-        
-        def process():
-            audio_path = None
+        job.recorder.finish(duration=job.duration, segments=len(job.segments), status=job.status, error=job.error,
+                            cache_hit=job.prepared is not None and job.prepared['entry'] is not None)
+        job.recorder = None
+    
+    def has_active_jobs(self):
+        return any(job.status not in FINISHED_STATES for job in self.job_queue.jobs.values())
+    
+    def on_job_event(self, job, kind, info=None):
+        # İşçi thread'lerinden gelir; Tk'ye yalnızca ana thread'den dokunulur
+        self.ui_events.put((job, kind, info))
+    
+    def process_ui_events(self):
+        """Kuyruktaki iş olaylarını toplu halde işle: segmentleri yaz, satırları ve ilerlemeyi güncelle
+        (Tk olay döngüsünü boğmamak için her turda sınırlı sayıda olay işlenir)"""
+        render_started = time.perf_counter()
+        new_segments = 0
+        changed_jobs = set()
+        finished_jobs = []
+        for _ in range(MAX_SEGMENTS_PER_FLUSH):
             try:
-                self.is_processing = True
-                
-                # Adım 1: Ses çıkarma
-                self.update_progress("🎵 Ses dosyası çıkarılıyor...", 20)
-                
-                import tempfile
-                temp_dir = tempfile.gettempdir()
-                # Dosya adını daha benzersiz hale getirelim
-                base_name = os.path.basename(video_path)
-                audio_filename = f"temp_audio_{os.path.splitext(base_name)[0]}.wav"
-                audio_path = os.path.join(temp_dir, audio_filename)
-                
-                with AudioFileClip(video_path) as audio_clip:
-                    audio_clip.write_audiofile(audio_path, logger=None, codec='pcm_s16le')
-                
-                if not os.path.exists(audio_path):
-                    raise Exception("Ses dosyası oluşturulamadı")
-                
-                # Adım 2: Transkripsiyon başlangıcı
-                self.update_progress("🤖 AI ile transkripsiyon yapılıyor...", 50)
-                
-                # fp16=False, çoğu CPU için daha kararlı çalışır.
-                result = self.whisper_model.transcribe(audio_path, fp16=False)
-                
-                # Adım 3: Metin işleme
-                self.update_progress("📝 Metinler işleniyor...", 80)
-                
-                segments = result.get('segments', [{'start': 0, 'end': 0, 'text': result.get('text', '')}])
-                
-                self.root.after(0, lambda: self.timecode_text.delete(1.0, END))
-                self.root.after(0, lambda: self.clean_text.delete(1.0, END))
-                
-                # Adım 4: Sonuçları yazma
-                self.update_progress("✍️ Sonuçlar hazırlanıyor...", 90)
-                
-                clean_transcript = ""
-                
-                for segment in segments:
-                    start_time = self.format_time(segment.get('start', 0))
-                    end_time = self.format_time(segment.get('end', 0))
-                    text = segment.get('text', '').strip()
-                    
-                    if text:
-                        timecoded_line = f"[{start_time} --> {end_time}] {text}\n"
-                        self.root.after(0, self.timecode_text.insert, END, timecoded_line)
-                        clean_transcript += text + " "
-                
-                if clean_transcript.strip():
-                    self.root.after(0, self.clean_text.insert, END, clean_transcript.strip())
-                
-                # Tamamlandı
-                self.update_progress("✅ Transkripsiyon tamamlandı!", 100)
-                
-            except Exception as e:
-                error_msg = str(e)
-                print(f"Detaylı hata: {error_msg}")
-                self.update_progress(f"❌ Hata oluştu", 0) # Mesajı kısa tut
-                self.root.after(0, lambda: messagebox.showerror("Hata", f"Transkripsiyon sırasında hata oluştu:\n{error_msg}"))
-            finally:
-                self.is_processing = False
-                # Geçici dosyayı güvenli şekilde sil
-                if audio_path and os.path.exists(audio_path):
-                    try:
-                        os.remove(audio_path)
-                    except Exception as e_del:
-                        print(f"Geçici ses dosyası silinemedi: {e_del}")
-    
-        thread = threading.Thread(target=process, daemon=True)
-        thread.start()
+                job, kind, info = self.ui_events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "media":
+                self.on_media_info(*info)
+                changed_jobs.add(None)
+                continue
+            if kind == "model":
+                self.on_model_loaded(*info)
+                continue
+            if kind == "segment":
+                index, segment = info
+                # show_job ile zaten yazılmış segmentleri tekrar yazma
+                if job is self.display_job and index >= self.display_segment_count:
+                    new_segments += self.transcript_store.append_segment(segment)
+                    self.display_segment_count = index + 1
+                continue
+            changed_jobs.add(job)
+            if kind == "stage":
+                self.on_pipeline_stage(job, *info)
+            elif kind == "status":
+                self.on_job_status(job, info)
+                if info in FINISHED_STATES:
+                    finished_jobs.append(job)
+            # "priority": yalnızca satırın yenilenmesi yeterli
+        
+        if new_segments:
+            self.refresh_transcript_views()
+        if new_segments and self.display_job is not None and self.display_job.recorder is not None:
+            self.display_job.recorder.add("ui_render", time.perf_counter() - render_started)
+        for job in finished_jobs:
+            self.finish_recorder(job)
+        self.report_failures([job for job in finished_jobs if job.status == FAILED])
+        if changed_jobs:
+            self.refresh_job_rows()
+        self.update_stream_progress()
+        self.root.after(UI_FLUSH_MS, self.process_ui_events)
+    
+    def on_job_status(self, job, status):
+        if status == TRANSCRIBING and (self.display_job is None or self.display_job.status in FINISHED_STATES
+                                       or self.display_job.status == QUEUED):
+            self.show_job(job)
+            self.stream_started = time.perf_counter()
+        elif job is self.display_job and status == DONE:
+            self.update_progress(f"✅ Transkripsiyon tamamlandı: {os.path.basename(job.path)}", 100)
+        elif job is self.display_job and status == CANCELLED:
+            self.update_progress(f"🚫 İş iptal edildi: {os.path.basename(job.path)}", 0)
+        elif status == FAILED and job is self.display_job:
+            self.update_progress(f"❌ Hata oluştu", 0) # Mesajı kısa tut
+    
+    def report_failures(self, jobs):
+        """Başarısız işleri tek pencerede bildir; model hatası her yükleme için bir kez gösterilir"""
+        model_failed = [job for job in jobs if (job.error or "").startswith(MODEL_ERROR_PREFIX)]
+        failed = [job for job in jobs if job not in model_failed]
+        if model_failed and not self.model_error_reported:
+            self.model_error_reported = True
+            names = "\n".join(os.path.basename(job.path) for job in model_failed)
+            messagebox.showerror("Hata", f"Model yüklenemedi, bekleyen işler durduruldu:\n{self.model_error}\n\n{names}")
+        if failed:
+            details = "\n".join(f"{os.path.basename(job.path)}: {job.error}" for job in failed)
+            messagebox.showerror("Hata", f"Transkripsiyon sırasında hata oluştu:\n{details}")
+    
+    def show_job(self, job):
+        """Bir işin transkriptini (o ana kadar çözülen kısmıyla) kartlarda göster"""
+        self.display_job = job
+        segments = list(job.segments)
+        self.transcript_store.clear()
+        self.transcript_store.extend(segments)
+        for view in self.transcript_views.values():
+            view.reset()
+        self.display_segment_count = len(segments)
+    
+    def refresh_transcript_views(self):
+        for view in self.transcript_views.values():
+            view.refresh()
+    
+    def update_stream_progress(self):
+        """Gösterilen işin ilerlemesini çözülen zaman / toplam süreden hesapla"""
+        job = self.display_job
+        if job is None or job.status != TRANSCRIBING or self.stream_started is None:
+            return
+        if job.duration <= 0 or job.position <= 0:
+            return
+        fraction = min(job.position / job.duration, 1.0)
+        elapsed = time.perf_counter() - self.stream_started
+        if elapsed > 0:
+            self.transcribe_speed = job.position / elapsed
+        eta = elapsed * (1 - fraction) / fraction
+        position = self.format_time(job.position).split(',')[0]
+        total = self.format_time(job.duration).split(',')[0]
+        self.update_progress(f"🤖 {os.path.basename(job.path)}: {position} / {total} · Kalan ~{self.format_eta(eta)}",
+                             10 + int(fraction * 89))
+    
+    def format_eta(self, seconds):
+        """Kalan süreyi kısa metne çevirir"""
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{hours} sa {minutes} dk"
+        if minutes:
+            return f"{minutes} dk {seconds} sn"
+        return f"{seconds} sn"
+    
+    def on_pipeline_stage(self, job, stage, info=None):
+        """Gösterilen işin pipeline aşamalarını progress bar'a yansıt"""
+        if stage == "vad":
+            skipped_minutes = info['skipped_seconds'] / 60
+            self.update_status(f"🔇 {os.path.basename(job.path)}: konuşma dışı ses atlandı %{info['skipped_ratio'] * 100:.0f} ({skipped_minutes:.1f} dk)")
+        if stage in ("extract", "extracted"):
+            self.on_extract_stage(job, stage, info)
+            return
+        if stage == "language":
+            self.on_language_stage(job, info)
+            return
+        if job is not self.display_job:
+            return
+        if stage == "transcribe":
+            self.stream_started = time.perf_counter()
+            self.update_progress("🤖 AI ile transkripsiyon yapılıyor...", 10)
+        elif stage == "cache_hit":
+            self.update_progress("⚡ Transkript önbellekten alındı", 90)
+        elif stage == "resume":
+            position = self.format_time(info['position']).split(',')[0]
+            self.update_status(f"⏯️ Kaldığı yerden devam ediliyor: {info['windows_done']}/{info['windows']} pencere ({position})")
+    
+    def on_extract_stage(self, job, stage, info=None):
+        """Ses çıkarma durumunu ve verimini göster (başka bir iş transkribe ediliyorsa yalnızca durum satırında)"""
+        name = os.path.basename(job.path)
+        if stage == "extract":
+            message, percentage = f"🎵 Ses çıkarılıyor: {name}", 5
+        else:
+            speed = info['duration'] / info['seconds'] if info['seconds'] else 0
+            megabytes_per_second = info['bytes'] / 1024 / 1024 / max(info['seconds'], 1e-3)
+            audio_length = self.format_time(info['duration']).split(',')[0]
+            message, percentage = (f"🎵 Ses çıkarıldı: {name}, {audio_length} ses {info['seconds']:.1f} sn'de "
+                                   f"({speed:.0f}x gerçek zaman, {megabytes_per_second:.0f} MB/sn)"), 10
+        busy = self.display_job is not None and self.display_job is not job and self.display_job.status == TRANSCRIBING
+        if busy:
+            self.update_status(message)
+        else:
+            self.update_progress(message, percentage)
+    
+    def on_language_stage(self, job, info):
+        """Dil ön geçişinin sonucunu ve kural kararını durum satırında göster"""
+        name = os.path.basename(job.path)
+        if job.recorder is not None:
+            job.recorder.update(language=info['language'], language_action=info['action'])
+        if info['action'] == SKIP:
+            self.update_status(f"⏭️ {name} atlandı: {info['reason']}")
+        elif info['action'] == REROUTE:
+            self.update_status(f"🔀 {name} {self.language_rules.reroute_model} modeline yönlendirildi: {info['reason']}")
+        else:
+            self.update_status(f"🌐 {name}: dil {info['language']} (%{info['probability'] * 100:.0f}), "
+                               f"konuşma oranı %{info['speech_ratio'] * 100:.0f}")
     
     def format_time(self, seconds):
         """Zamanı saat:dakika:saniye,milisaniye formatına dönüştürür."""
-        hours, remainder = divmod(seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        milliseconds = int((seconds - int(seconds)) * 1000)
-        return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02},{milliseconds:03}"
+        return pipeline.format_time(seconds)
     
     def delete_transcript(self, card_type):
         try:
-            if card_type == "timecode":
-                self.timecode_text.delete(1.0, END)
-            else:
-                self.clean_text.delete(1.0, END)
+            self.transcript_views[card_type].clear()
             self.update_status("🗑️ Transkript temizlendi")
         except Exception as e:
             messagebox.showerror("Hata", f"Silme hatası: {str(e)}")
 
     def copy_transcript(self, card_type):
         try:
-            text = self.timecode_text.get(1.0, END).strip() if card_type == "timecode" else self.clean_text.get(1.0, END).strip()
+            view = self.transcript_views[card_type]
+            buffer = io.StringIO()
+            transcript.write_txt(self.transcript_store, buffer, view.first_visible, clean=view.clean)
+            text = buffer.getvalue().strip()
             
             if text:
                 self.root.clipboard_clear()
@@ -451,26 +842,23 @@ class ModernTranscriptionApp:
     
     def save_transcript(self, card_type):
         try:
-            if card_type == "timecode":
-                text = self.timecode_text.get(1.0, END).strip()
-                default_name = "zaman_kodlu_transkript.txt"
-            else:
-                text = self.clean_text.get(1.0, END).strip()
-                default_name = "temiz_transkript.txt"
+            view = self.transcript_views[card_type]
+            default_name = "zaman_kodlu_transkript.txt" if card_type == "timecode" else "temiz_transkript.txt"
             
-            if not text:
+            if not view.count():
                 messagebox.showinfo("Bilgi", "Kaydedilecek transkript bulunamadı.")
                 return
             
+            # TXT kartın görünümünü korur; SRT/VTT/JSON her zaman zaman kodlu segmentlerden yazılır
+            filetypes = [(label, f"*{extension}") for extension, (label, _) in transcript.EXPORT_FORMATS.items()]
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".txt",
-                filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+                filetypes=filetypes + [("All files", "*.*")],
                 initialfile=default_name
             )
             
             if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
+                transcript.export(self.transcript_store, file_path, view.first_visible, clean=view.clean)
                 self.update_status(f"💾 Transkript kaydedildi: {os.path.basename(file_path)}")
         
         except Exception as e:
@@ -478,6 +866,27 @@ class ModernTranscriptionApp:
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        import batch
+        sys.exit(batch.main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "cache":
+        import cache
+        sys.exit(cache.main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        import server
+        sys.exit(server.main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "search":
+        import library
+        sys.exit(library.main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "watch":
+        import watch
+        sys.exit(watch.main(sys.argv[2:]))
+
     root = Tk()
-    app = ModernTranscriptionApp(root)
+    if os.environ.get("SPEECHRECOG_STARTUP_PROBE"):
+        # benchmarks/startup_time.py: pencere ilk kez çizilince açılış süresini yaz ve çık
+        app = ModernTranscriptionApp(root, warm_up=False)
+        root.after_idle(lambda: (print(f"SPEECHRECOG_STARTUP {time.perf_counter() - STARTUP_TIME:.4f}", flush=True), root.destroy()))
+    else:
+        app = ModernTranscriptionApp(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""İşlemci (CPU) için çıkarım arka uçları ve thread ayarları.
+
+"stock" modeli olduğu gibi (fp32) çalıştırır. "int8" modelin doğrusal
+(Linear) katmanlarını dinamik int8 nicemlemeyle (quantize_dynamic) çevirir:
+ağırlıklar int8 saklanır, aktivasyonlar çalışma anında nicemlenir. Bellek ve
+matris çarpımı maliyeti düşer; doğruluk kaybı benchmarks/bench_backends.py
+ile fp32'ye karşı ölçülebilir. Nicemlenmiş model yalnızca CPU'da çalışır.
+"""
+BACKEND_STOCK = "stock"
+BACKEND_INT8 = "int8"
+BACKENDS = (BACKEND_STOCK, BACKEND_INT8)
+DEFAULT_BACKEND = BACKEND_STOCK
+
+_inter_op_configured = False
+
+
+def configure_threads(intra_op=0, inter_op=0):
+    """torch işlem içi/işlemler arası thread sayılarını ayarla (0 = torch varsayılanı)"""
+    global _inter_op_configured
+    try:
+        import torch
+        if intra_op:
+            torch.set_num_threads(max(1, int(intra_op)))
+        # İşlemler arası havuz süreç başına yalnızca bir kez, ilk paralel işten önce ayarlanabilir
+        if inter_op and not _inter_op_configured:
+            torch.set_num_interop_threads(max(1, int(inter_op)))
+            _inter_op_configured = True
+    except Exception as e:
+        print(f"Torch thread ayarları uygulanamadı: {e}")
+
+
+def _plain_linear_layers(module):
+    """Whisper'ın Linear alt sınıflarını düz nn.Linear ile değiştirir (ağırlıklar paylaşılır).
+
+    quantize_dynamic modül türünü birebir eşleştirdiği için alt sınıflar
+    aksi halde nicemlenmeden kalır.
+    """
+    import torch
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+            plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            plain.weight = child.weight
+            plain.bias = child.bias
+            setattr(module, name, plain)
+        else:
+            _plain_linear_layers(child)
+
+
+def quantize_int8(model):
+    """Modelin Linear katmanlarını dinamik int8 nicemlenmiş katmanlarla değiştirir"""
+    import torch
+    model = model.cpu().float().eval()
+    _plain_linear_layers(model)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def apply_backend(model, backend=DEFAULT_BACKEND):
+    """Yüklenmiş modeli seçilen arka uca hazırlar"""
+    backend = backend or DEFAULT_BACKEND
+    if backend == BACKEND_STOCK:
+        return model
+    if backend == BACKEND_INT8:
+        return quantize_int8(model)
+    raise Exception(f"Bilinmeyen arka uç: {backend} (seçenekler: {', '.join(BACKENDS)})")
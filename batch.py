@@ -0,0 +1,284 @@
+"""Toplu (batch) transkripsiyon: bir klasördeki ya da glob ile eşleşen tüm videoları
+arayüz olmadan işler.
+
+Kullanım:
+    python SpeechRecog.py batch <klasör|glob> [--workers N] [--model turbo]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pipeline
+from backends import BACKENDS, configure_threads
+from cache import TranscriptCache
+from chunked import DEFAULT_CHUNK_SECONDS, ChunkedTranscriber
+from config import load_config
+from instrument import RunRecorder, default_report_path
+from language import SKIP, LanguageRules
+from library import TranscriptLibrary
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.wmv')
+
+# Her işçi süreçte model yalnızca bir kez yüklenir
+_worker_model = None
+_worker_audio_mode = None
+_worker_model_name = None
+_worker_cache = None
+_worker_vad = False
+_worker_backend = None
+_worker_report = None
+_worker_profile = False
+_worker_library = None
+_worker_language_rules = None
+
+
+def collect_inputs(target, recursive=False):
+    """Klasör ya da glob deseninden işlenecek dosyaları topla"""
+    if os.path.isdir(target):
+        pattern = os.path.join(target, '**', '*') if recursive else os.path.join(target, '*')
+        candidates = glob.glob(pattern, recursive=recursive)
+    else:
+        candidates = glob.glob(target, recursive=True)
+    files = [
+        path for path in candidates
+        if os.path.isfile(path) and path.lower().endswith(VIDEO_EXTENSIONS)
+    ]
+    return sorted(files)
+
+
+def output_paths(video_path):
+    """Girdinin yanına yazılacak (zaman kodlu, temiz) transkript yolları"""
+    base = os.path.splitext(video_path)[0]
+    return f"{base}.timecode.txt", f"{base}.txt"
+
+
+def write_atomic(path, text):
+    """Önce geçici dosyaya yaz, sonra yerine koy (yarım yazılmış çıktı görünmez)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_outputs(video_path, segments):
+    timecoded, clean = pipeline.format_segments(segments)
+    timecode_path, clean_path = output_paths(video_path)
+    write_atomic(timecode_path, timecoded.strip())
+    write_atomic(clean_path, clean.strip())
+
+
+def _init_worker(model_name, threads_per_worker, audio_mode, use_cache, use_vad, backend, inter_op_threads,
+                 report_path, profile, use_library, language_rules=None):
+    global _worker_model, _worker_audio_mode, _worker_model_name, _worker_cache, _worker_vad, _worker_backend
+    global _worker_report, _worker_profile, _worker_library, _worker_language_rules
+    _worker_language_rules = language_rules
+    _worker_report = report_path
+    _worker_profile = profile
+    _worker_audio_mode = audio_mode
+    _worker_vad = use_vad
+    _worker_model_name = model_name
+    _worker_backend = backend
+    _worker_cache = TranscriptCache() if use_cache else None
+    _worker_library = TranscriptLibrary() if use_library else None
+    configure_threads(threads_per_worker, inter_op_threads)
+    _worker_model = pipeline.load_whisper_model(model_name, backend)
+
+
+def _process_one(video_path, chunker=None):
+    started = time.perf_counter()
+    vad_stats = {}
+    language = {}
+    stages = []
+    recorder = RunRecorder(video_path, profile=_worker_profile, report_path=_worker_report, model=_worker_model_name,
+                           backend=_worker_backend, audio_mode=_worker_audio_mode, vad=_worker_vad,
+                           mode="chunked" if chunker is not None else "batch")
+
+    def on_stage(stage, info=None):
+        stages.append(stage)
+        if stage == "vad":
+            vad_stats.update(info)
+        elif stage == "language":
+            language.update(info)
+
+    try:
+        with recorder.activate():
+            segments, duration = pipeline.transcribe_file(
+                _worker_model, video_path, audio_mode=_worker_audio_mode,
+                cache=_worker_cache, model_name=_worker_model_name, chunker=chunker,
+                vad=_worker_vad, on_stage=on_stage, backend=_worker_backend, language_rules=_worker_language_rules
+            )
+            # Dil kurallarına takılan dosyalar için çıktı yazılmaz
+            if language.get('action') != SKIP:
+                write_outputs(video_path, segments)
+                if _worker_library is not None:
+                    _worker_library.index_file(video_path, segments, _worker_model_name, duration)
+        recorder.finish(duration=duration, segments=len(segments), status="done", error=None,
+                        cache_hit="cache_hit" in stages, skipped_seconds=vad_stats.get('skipped_seconds', 0.0),
+                        language=language.get('language'), language_action=language.get('action'))
+        return {'path': video_path, 'duration': duration, 'segments': len(segments),
+                'skipped': vad_stats.get('skipped_seconds', 0.0), 'language': language.get('language'),
+                'language_skipped': language.get('reason') if language.get('action') == SKIP else None,
+                'elapsed': time.perf_counter() - started, 'error': None}
+    except Exception as e:
+        recorder.finish(duration=0.0, segments=0, status="failed", error=str(e), cache_hit=False)
+        return {'path': video_path, 'duration': 0.0, 'segments': 0, 'skipped': 0.0,
+                'elapsed': time.perf_counter() - started, 'error': str(e)}
+
+
+def print_summary(results, wall_seconds):
+    done = [r for r in results if not r['error']]
+    failed = [r for r in results if r['error']]
+    audio_seconds = sum(r['duration'] for r in done)
+    files_per_hour = len(done) / wall_seconds * 3600 if wall_seconds > 0 else 0.0
+    audio_per_wall = audio_seconds / wall_seconds if wall_seconds > 0 else 0.0
+
+    print("")
+    print(f"Tamamlanan: {len(done)}  Hatalı: {len(failed)}  Toplam süre: {wall_seconds:.1f} sn")
+    print(f"Verim: {files_per_hour:.1f} dosya/saat, {audio_per_wall:.2f} ses-sn/duvar-sn")
+    skipped = sum(r.get('skipped', 0.0) for r in done)
+    if skipped:
+        print(f"VAD ile atlanan ses: {skipped / 60:.1f} dk (%{skipped / audio_seconds * 100:.0f})")
+    language_skipped = [r for r in done if r.get('language_skipped')]
+    if language_skipped:
+        print(f"Dil/konuşma kuralıyla atlanan: {len(language_skipped)} dosya")
+    for r in failed:
+        print(f"  ❌ {r['path']}: {r['error']}")
+
+
+def print_result(index, total, result):
+    status = "✅" if not result['error'] else "❌"
+    if result.get('language_skipped'):
+        status = "⏭️"
+    language = f", {result['language']}" if result.get('language') else ""
+    print(f"[{index}/{total}] {status} {os.path.basename(result['path'])} "
+          f"({result['duration']:.0f} sn ses{language}, {result['elapsed']:.1f} sn)")
+
+
+def run_pool(files, args):
+    """Dosyaları işçi süreçlere dağıt (her süreç bir dosyayı baştan sona işler)"""
+    workers = max(1, min(args.workers, len(files)))
+    threads_per_worker = args.intra_op_threads or max(1, (os.cpu_count() or 1) // workers)
+    print(f"{len(files)} dosya, {workers} işçi süreç, model: {args.model}, arka uç: {args.backend}")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(args.model, threads_per_worker, args.audio_mode, not args.no_cache, args.vad,
+                                       args.backend, args.inter_op_threads, args.report, args.profile,
+                                       not args.no_library, language_rules(args))) as executor:
+        futures = [executor.submit(_process_one, path) for path in files]
+        for index, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            print_result(index, len(files), result)
+    return results
+
+
+def run_chunked(files, args):
+    """Uzun ses modu: dosyalar sırayla, her dosyanın parçaları paralel işlenir"""
+    global _worker_audio_mode, _worker_model_name, _worker_cache, _worker_vad, _worker_backend
+    global _worker_report, _worker_profile, _worker_library, _worker_language_rules
+    print(f"{len(files)} dosya, uzun ses modu: {args.chunk_workers} işçi süreç, model: {args.model}, arka uç: {args.backend}")
+    _worker_audio_mode = args.audio_mode
+    _worker_vad = args.vad
+    _worker_model_name = args.model
+    _worker_backend = args.backend
+    _worker_report = args.report
+    _worker_profile = args.profile
+    _worker_cache = None if args.no_cache else TranscriptCache()
+    _worker_library = None if args.no_library else TranscriptLibrary()
+    # Parçalı modda bu süreçte model yüklü olmadığından dil ön geçişi yapılmaz
+    _worker_language_rules = None
+
+    chunker = ChunkedTranscriber(args.model, workers=args.chunk_workers, chunk_seconds=args.chunk_seconds,
+                                 threads_per_worker=args.intra_op_threads or None, backend=args.backend,
+                                 inter_op_threads=args.inter_op_threads)
+    results = []
+    try:
+        for index, path in enumerate(files, 1):
+            result = _process_one(path, chunker=chunker)
+            results.append(result)
+            print_result(index, len(files), result)
+    finally:
+        chunker.close()
+    return results
+
+
+def add_language_arguments(parser, settings):
+    """Dil ön geçişi seçenekleri (batch ve watch ortak)"""
+    parser.add_argument('--no-language-detect', dest='language_detect', action='store_false',
+                        default=settings['language_detect'], help="Dili önceden tespit edip sabitleme")
+    parser.add_argument('--languages', nargs='+', default=settings['languages'],
+                        help="Yalnızca bu dillerdeki dosyaları transkribe et (ör. tr en)")
+    parser.add_argument('--min-speech-ratio', type=float, default=settings['min_speech_ratio'],
+                        help="Konuşma oranı bunun altındaki dosyaları atla (0-1)")
+    parser.add_argument('--reroute-model', default=settings['reroute_model'],
+                        help="--languages dışındaki dosyaları atlamak yerine bu modelle transkribe et")
+
+
+def language_rules(args):
+    return LanguageRules(args.language_detect, args.languages, args.min_speech_ratio, args.reroute_model)
+
+
+def build_parser():
+    settings = load_config()
+    parser = argparse.ArgumentParser(prog="SpeechRecog.py batch", description="Klasördeki videoları toplu olarak transkribe eder.")
+    parser.add_argument('target', help="Klasör yolu ya da glob deseni (ör. 'arsiv/**/*.mp4')")
+    parser.add_argument('--workers', type=int, default=1, help="Paralel işçi süreç sayısı (her biri kendi modelini yükler)")
+    parser.add_argument('--model', default=settings['model'], help="Whisper model adı")
+    parser.add_argument('--audio-mode', choices=pipeline.AUDIO_MODES, default=settings['audio_mode'],
+                        help="memory: sesi doğrudan belleğe çöz, wav: geçici WAV dosyası kullan")
+    parser.add_argument('--chunk-workers', type=int, default=settings['chunk_workers'],
+                        help="Uzun ses modu: dosyaları sırayla işler, her dosyayı sessizliklerden bölüp bu kadar süreçte paralel transkribe eder")
+    parser.add_argument('--chunk-seconds', type=float, default=DEFAULT_CHUNK_SECONDS, help="Uzun ses modunda hedef parça uzunluğu (sn)")
+    parser.add_argument('--vad', action='store_true', default=settings['vad'],
+                        help="Konuşma dışı sesi (sessizlik, gürültü) modele vermeden atla")
+    parser.add_argument('--backend', choices=BACKENDS, default=settings['backend'],
+                        help="Çıkarım arka ucu: stock (fp32) ya da int8 (dinamik nicemleme, yalnızca CPU)")
+    parser.add_argument('--intra-op-threads', type=int, default=settings['intra_op_threads'],
+                        help="İşçi başına torch işlem içi thread sayısı (0 = çekirdek sayısı / işçi)")
+    parser.add_argument('--inter-op-threads', type=int, default=settings['inter_op_threads'],
+                        help="torch işlemler arası thread sayısı (0 = torch varsayılanı)")
+    parser.add_argument('--no-cache', action='store_true', help="Transkript önbelleğini kullanma")
+    parser.add_argument('--no-library', action='store_true', help="Transkriptleri aranabilir kütüphaneye ekleme")
+    parser.add_argument('--report', default=None,
+                        help="Dosya başına aşama sürelerinin yazılacağı JSONL raporu (varsayılan: ~/.speechrecog/reports/runs.jsonl)")
+    parser.add_argument('--profile', action='store_true', default=settings['profile'],
+                        help="Her dosyayı cProfile ile izle (.prof dosyaları raporun yanına yazılır)")
+    add_language_arguments(parser, settings)
+    parser.add_argument('--recursive', action='store_true', help="Klasör verildiyse alt klasörleri de tara")
+    parser.add_argument('--skip-existing', action='store_true', help="Çıktısı zaten olan dosyaları atla")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    files = collect_inputs(args.target, recursive=args.recursive)
+    if args.skip_existing:
+        files = [f for f in files if not all(os.path.exists(p) for p in output_paths(f))]
+    if not files:
+        print("İşlenecek video bulunamadı.")
+        return 1
+
+    started = time.perf_counter()
+    if args.chunk_workers > 1:
+        results = run_chunked(files, args)
+    else:
+        results = run_pool(files, args)
+
+    print_summary(results, time.perf_counter() - started)
+    print(f"Çalıştırma raporu: {args.report or default_report_path()}")
+    return 0 if all(not r['error'] for r in results) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
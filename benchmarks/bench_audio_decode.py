@@ -0,0 +1,57 @@
+"""Ses hazırlama yollarını karşılaştırır: bellek içi çözme vs. geçici WAV.
+
+WAV yolunda süreye, whisper'ın transcribe içinde WAV'ı tekrar çözmesi de dahil
+edilir; böylece iki yol da modele hazır 16 kHz float32 sese kadar ölçülür.
+
+Kullanım:
+    python benchmarks/bench_audio_decode.py video.mp4 [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import whisper  # noqa: E402
+
+import pipeline  # noqa: E402
+
+
+def run_memory(video_path):
+    audio = pipeline.decode_audio_to_memory(video_path)
+    return len(audio) / pipeline.SAMPLE_RATE, 0
+
+
+def run_wav(video_path):
+    audio_path = None
+    try:
+        audio_path, _ = pipeline.extract_audio_wav(video_path)
+        written = os.path.getsize(audio_path)
+        audio = whisper.load_audio(audio_path)
+        return len(audio) / pipeline.SAMPLE_RATE, written
+    finally:
+        pipeline.remove_temp_audio(audio_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('video')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    runners = {pipeline.AUDIO_MODE_MEMORY: run_memory, pipeline.AUDIO_MODE_WAV: run_wav}
+    for mode, runner in runners.items():
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            duration, written = runner(args.video)
+            timings.append(time.perf_counter() - started)
+        best = min(timings)
+        print(f"{mode:>6}: en iyi {best:.2f} sn, ortalama {sum(timings) / len(timings):.2f} sn, "
+              f"{duration / best:.1f}x gerçek zaman, diske yazılan {written / (1024 * 1024):.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Çıkarım arka uçlarını (stock fp32, int8) sabit bir ses kümesi üzerinde karşılaştırır.
+
+Her yapılandırma ayrı bir alt süreçte çalışır (tepe bellek ölçümü birbirine
+karışmasın diye). Her biri için gerçek zaman faktörü (RTF = transkripsiyon
+süresi / ses süresi), tepe RSS ve fp32'ye göre kelime hata oranı (WER)
+yazdırılır. Bir dosyanın yanında <ad>.ref.txt varsa WER ona karşı hesaplanır.
+
+Yapılandırma biçimi: arka_uç[:işlem_içi_thread[:işlemler_arası_thread]]
+
+Kullanım:
+    python benchmarks/bench_backends.py sesler/ --model turbo --configs stock int8 int8:4:1
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pipeline  # noqa: E402
+from backends import configure_threads  # noqa: E402
+from instrument import peak_rss_mb  # noqa: E402
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac', '.m4a', '.ogg', '.mp4', '.mkv', '.mov', '.avi', '.wmv')
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+def collect_media(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.lower().endswith(AUDIO_EXTENSIONS))
+        else:
+            files.append(path)
+    return files
+
+
+def parse_config(text):
+    parts = text.split(':')
+    backend = parts[0]
+    intra = int(parts[1]) if len(parts) > 1 and parts[1] else 0
+    inter = int(parts[2]) if len(parts) > 2 and parts[2] else 0
+    return backend, intra, inter
+
+
+def word_errors(reference, hypothesis):
+    """Kelime düzeyinde düzenleme uzaklığı (ekleme + silme + değiştirme)"""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1], len(ref)
+
+
+def run_child(config, model_name, files):
+    """Tek yapılandırmayı bu süreçte çalıştırır, sonucu tek JSON satırı olarak yazar"""
+    backend, intra, inter = parse_config(config)
+    configure_threads(intra, inter)
+    started = time.perf_counter()
+    model = pipeline.load_whisper_model(model_name, backend)
+    load_seconds = time.perf_counter() - started
+
+    texts, audio_seconds, transcribe_seconds = {}, 0.0, 0.0
+    for path in files:
+        audio = pipeline.decode_audio_to_memory(path)
+        audio_seconds += len(audio) / pipeline.SAMPLE_RATE
+        started = time.perf_counter()
+        segments = pipeline.transcribe_audio(model, audio)
+        transcribe_seconds += time.perf_counter() - started
+        texts[path] = " ".join(segment['text'].strip() for segment in segments)
+
+    print(RESULT_PREFIX + json.dumps({
+        'config': config, 'load_seconds': load_seconds, 'audio_seconds': audio_seconds,
+        'transcribe_seconds': transcribe_seconds, 'peak_rss_mb': peak_rss_mb(), 'texts': texts,
+    }, ensure_ascii=False), flush=True)
+
+
+def run_config(config, model_name, files):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", config, "--model", model_name] + files
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise Exception(f"{config} çalıştırılamadı: {proc.stderr.strip()[-500:]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('media', nargs='+', help="Ses/video dosyaları ya da klasörler")
+    parser.add_argument('--model', default=pipeline.DEFAULT_MODEL)
+    parser.add_argument('--configs', nargs='+', default=["stock", "int8"])
+    parser.add_argument('--json', help="Sonuçları bu JSON dosyasına da yaz")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    files = collect_media(args.media)
+    if args.child:
+        run_child(args.child, args.model, files)
+        return 0
+    if not files:
+        print("Ses dosyası bulunamadı.")
+        return 1
+
+    # Referans: varsa <ad>.ref.txt, yoksa fp32 (stock) çıktısı
+    configs = args.configs if "stock" in args.configs else ["stock"] + args.configs
+    results = [run_config(config, args.model, files) for config in configs]
+    baseline = next(result for result in results if result['config'] == "stock")
+    references = {}
+    for path in files:
+        ref_path = os.path.splitext(path)[0] + ".ref.txt"
+        if os.path.exists(ref_path):
+            with open(ref_path, 'r', encoding='utf-8') as f:
+                references[path] = f.read()
+        else:
+            references[path] = baseline['texts'][path]
+
+    print(f"{len(files)} dosya, model: {args.model}, referans: "
+          f"{'ref.txt' if any(os.path.exists(os.path.splitext(p)[0] + '.ref.txt') for p in files) else 'stock (fp32)'}")
+    print(f"{'yapılandırma':<16}{'yükleme sn':>12}{'RTF':>8}{'hızlanma':>10}{'tepe RSS MB':>13}{'WER':>8}")
+    for result in results:
+        errors = words = 0
+        for path in files:
+            edits, count = word_errors(references[path], result['texts'][path])
+            errors += edits
+            words += count
+        result['rtf'] = result['transcribe_seconds'] / result['audio_seconds'] if result['audio_seconds'] else 0.0
+        result['wer'] = errors / words if words else 0.0
+        speedup = baseline['transcribe_seconds'] / result['transcribe_seconds'] if result['transcribe_seconds'] else 0.0
+        print(f"{result['config']:<16}{result['load_seconds']:>12.1f}{result['rtf']:>8.3f}{speedup:>9.2f}x"
+              f"{result['peak_rss_mb'] or 0:>13.0f}{result['wer'] * 100:>7.1f}%")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'model': args.model, 'files': files, 'results': results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Parçalı paralel transkripsiyonun işçi sayısına göre hızlanmasını ölçer.
+
+Model yükleme süresi ölçüme dahil edilmez (her havuz önce ısıtılır).
+
+Kullanım:
+    python benchmarks/bench_chunked.py kayit.mp4 --workers 1 2 4 8 --model tiny
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline  # noqa: E402
+from chunked import DEFAULT_CHUNK_SECONDS, ChunkedTranscriber  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('media')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--model', default=pipeline.DEFAULT_MODEL)
+    parser.add_argument('--chunk-seconds', type=float, default=DEFAULT_CHUNK_SECONDS)
+    args = parser.parse_args(argv)
+
+    audio = pipeline.decode_audio_to_memory(args.media)
+    duration = len(audio) / pipeline.SAMPLE_RATE
+    print(f"Ses süresi: {duration:.0f} sn, model: {args.model}, parça: {args.chunk_seconds:.0f} sn")
+
+    baseline = None
+    for workers in args.workers:
+        chunker = ChunkedTranscriber(args.model, workers=workers, chunk_seconds=args.chunk_seconds)
+        try:
+            chunker.warm_up()
+            started = time.perf_counter()
+            segments = chunker.transcribe(audio)
+            elapsed = time.perf_counter() - started
+        finally:
+            chunker.close()
+        # Hızlanma, listedeki ilk işçi sayısına göre hesaplanır (genelde 1)
+        if baseline is None:
+            baseline = elapsed
+        speedup = baseline / elapsed
+        efficiency = speedup / (workers / args.workers[0])
+        print(f"{workers:>3} işçi: {elapsed:7.1f} sn, {duration / elapsed:6.2f}x gerçek zaman, "
+              f"hızlanma {speedup:.2f}x, verim %{efficiency * 100:.0f}, {len(segments)} segment")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
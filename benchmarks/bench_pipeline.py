@@ -0,0 +1,314 @@
+"""Transkripsiyon hattı için tekrarlanabilir, çevrimdışı benchmark paketi.
+
+Sentetik medya (ton, sessizlik ve konuşmaya benzeyen genlik modülasyonlu
+gürültü) ffmpeg lavfi ile yerelde üretilip MP4/MKV olarak birkaç uzunlukta
+saklanır. Her dosya, arayüzdeki iş kuyruğuyla aynı yoldan (prepare_media ->
+transcribe_prepared -> format_segments) arayüzsüz işlenir. Model olarak
+"stub" (ağ ve model indirmesi gerektirmez, yalnızca hattın kendi maliyetini
+ölçer) ya da önceden indirilmiş küçük bir whisper modeli (ör. tiny) kullanılır.
+
+Her durum ayrı bir alt süreçte çalışır; aşama başına süre (tekrarların
+medyanı), verim (ses sn / aşama sn), ilk segment gecikmesi, tepe bellek ve
+aşama başına bellek (aşama sonundaki RSS ve aşama sırasında tepe belleğin
+artışı) raporlanır. Sonuçlar benchmarks/results/pipeline/<commit>.json olarak
+saklanır; iki sonuç eşik değeriyle karşılaştırılabilir (aşama başına bellek
+dahil; gerileme varsa çıkış kodu 1).
+
+Kullanım:
+    python benchmarks/bench_pipeline.py run --model stub --lengths 30 120 600
+    python benchmarks/bench_pipeline.py run --model tiny --compare-to a1b2c3d
+    python benchmarks/bench_pipeline.py compare a1b2c3d e4f5a6b --threshold 0.10
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pipeline  # noqa: E402
+from cache import data_dir  # noqa: E402
+from instrument import RunRecorder, peak_rss_mb  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results", "pipeline")
+RESULT_PREFIX = "BENCH_RESULT "
+
+CONTAINERS = {
+    'mp4': ["-c:v", "mpeg4", "-c:a", "aac"],
+    'mkv': ["-c:v", "mpeg4", "-c:a", "flac"],
+}
+
+# 30 sn'lik döngü: 10 sn ton, 5 sn sessizlik, 15 sn hece hızında (4 Hz) modüle edilmiş gürültü
+AUDIO_EXPRESSION = (
+    "if(lt(mod(t,30),10), 0.3*sin(2*PI*440*t),"
+    " if(lt(mod(t,30),15), 0, 0.3*(2*random(0)-1)*(0.5+0.5*sin(2*PI*4*t))))"
+)
+
+# Karşılaştırmada bu kadar saniyeden ve MB'tan küçük farklar gürültü sayılır
+MIN_DELTA_SECONDS = 0.02
+MIN_DELTA_MB = 5.0
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def media_dir():
+    path = os.path.join(data_dir(), "bench_media")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def generate_media(seconds, container):
+    """Sentetik medyayı (yoksa) üretir ve yolunu döndürür; aynı parametreler aynı dosyayı verir"""
+    path = os.path.join(media_dir(), f"synthetic_{int(seconds)}s.{container}")
+    if os.path.exists(path):
+        return path
+    cmd = [
+        pipeline.ffmpeg_binary(), "-nostdin", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"color=c=black:s=160x120:r=5:d={seconds}",
+        "-f", "lavfi", "-i", f"aevalsrc='{AUDIO_EXPRESSION}':s=44100:d={seconds}",
+        "-shortest", *CONTAINERS[container], path + ".tmp." + container,
+    ]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise Exception(f"Sentetik medya üretilemedi: {proc.stderr.decode(errors='ignore').strip()}")
+    os.replace(path + ".tmp." + container, path)
+    return path
+
+
+class StubModel:
+    """whisper modelinin transcribe arayüzünü taklit eder: her 5 sn için sabit bir segment döndürür"""
+
+    def transcribe(self, audio, **options):
+        duration = len(audio) / pipeline.SAMPLE_RATE
+        segments = [
+            {'start': float(start), 'end': float(min(start + 5, duration)), 'text': f"segment {index}"}
+            for index, start in enumerate(range(0, int(duration), 5))
+        ]
+        return {'text': " ".join(segment['text'] for segment in segments), 'segments': segments}
+
+
+def run_case_once(model, media, audio_mode):
+    recorder = RunRecorder(media, report_path=os.devnull)
+    first_segment = []
+    started = time.perf_counter()
+
+    def on_segment(segment):
+        if not first_segment:
+            first_segment.append(time.perf_counter() - started)
+
+    with recorder.activate():
+        prepared = pipeline.prepare_media(media, audio_mode=audio_mode, as_array=True)
+        try:
+            # Tüm uzunluklar aynı (pencereli) yoldan ölçülsün; 10 dk üstü checkpoint yoluna sapmasın
+            segments, duration = pipeline.transcribe_prepared(model, prepared, on_segment=on_segment,
+                                                              checkpoint=False)
+        finally:
+            pipeline.release_media(prepared)
+        pipeline.format_segments(segments)
+    report = recorder.report(duration=duration)
+    return {
+        'duration': duration,
+        'segments': len(segments),
+        'stages': report['stages'],
+        'stage_rss_mb': report['stage_rss_mb'],
+        'stage_peak_growth_mb': report['stage_peak_growth_mb'],
+        'total_seconds': time.perf_counter() - started,
+        'first_segment_seconds': first_segment[0] if first_segment else None,
+    }
+
+
+def run_child(media, model_name, repeats, audio_mode):
+    """Tek durumu bu süreçte çalıştırır, sonucu tek JSON satırı olarak yazar"""
+    started = time.perf_counter()
+    model = StubModel() if model_name == "stub" else pipeline.load_whisper_model(model_name)
+    load_seconds = time.perf_counter() - started
+    rss_after_load = peak_rss_mb()
+
+    runs = [run_case_once(model, media, audio_mode) for _ in range(repeats)]
+    stage_names = sorted({name for run in runs for name in run['stages']})
+    stages = {name: statistics.median(run['stages'].get(name, 0.0) for run in runs) for name in stage_names}
+    stage_rss = {name: statistics.median(run['stage_rss_mb'][name] for run in runs if name in run['stage_rss_mb'])
+                 for name in stage_names if any(name in run['stage_rss_mb'] for run in runs)}
+    # Tepe bellek süreç boyunca yalnızca artar; artış ilk tekrarda görülür, medyan yerine en büyüğü alınır
+    stage_peak_growth = {name: max(run['stage_peak_growth_mb'].get(name, 0.0) for run in runs)
+                         for name in stage_names if any(name in run['stage_peak_growth_mb'] for run in runs)}
+    first_segments = [run['first_segment_seconds'] for run in runs if run['first_segment_seconds'] is not None]
+    print(RESULT_PREFIX + json.dumps({
+        'duration': runs[0]['duration'],
+        'segments': runs[0]['segments'],
+        'load_seconds': load_seconds,
+        'stages': stages,
+        'stage_rss_mb': stage_rss,
+        'stage_peak_growth_mb': stage_peak_growth,
+        'total_seconds': statistics.median(run['total_seconds'] for run in runs),
+        'first_segment_seconds': statistics.median(first_segments) if first_segments else None,
+        'rss_after_load_mb': rss_after_load,
+        'peak_rss_mb': peak_rss_mb(),
+    }), flush=True)
+
+
+def run_case(media, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "child", media, "--model", args.model,
+           "--repeats", str(args.repeats), "--audio-mode", args.audio_mode]
+    # Alt süreç kullanıcının ~/.speechrecog klasörüne (günlük, rapor) bir şey bırakmasın
+    with tempfile.TemporaryDirectory(prefix="speechrecog_bench_") as scratch:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                              env=dict(os.environ, SPEECHRECOG_DATA_DIR=scratch))
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise Exception(f"{os.path.basename(media)} ölçülemedi: {proc.stderr.strip()[-500:]}")
+
+
+def result_path(name):
+    """Commit kısaltması ya da dosya yolundan sonuç dosyasının yolunu bulur"""
+    if os.path.exists(name):
+        return name
+    path = os.path.join(RESULTS_DIR, f"{name}.json")
+    if os.path.exists(path):
+        return path
+    matches = [entry for entry in os.listdir(RESULTS_DIR) if entry.startswith(name)] if os.path.isdir(RESULTS_DIR) else []
+    if len(matches) == 1:
+        return os.path.join(RESULTS_DIR, matches[0])
+    raise Exception(f"Sonuç bulunamadı: {name}")
+
+
+def load_result(name):
+    with open(result_path(name), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def print_case(key, case):
+    duration = case['duration'] or 1.0
+    stages = "  ".join(
+        f"{name} {seconds:.2f} sn ({duration / seconds:.0f}x)" if seconds else f"{name} 0 sn"
+        for name, seconds in case['stages'].items()
+    )
+    first = case['first_segment_seconds']
+    print(f"{key:<14} toplam {case['total_seconds']:.2f} sn, ilk segment "
+          f"{'-' if first is None else f'{first:.2f} sn'}, tepe RSS {case['peak_rss_mb'] or 0:.0f} MB")
+    print(f"{'':<14} {stages}")
+    memory = "  ".join(
+        f"{name} {mb:.0f} MB (+{case.get('stage_peak_growth_mb', {}).get(name, 0.0):.0f})"
+        for name, mb in case.get('stage_rss_mb', {}).items()
+    )
+    if memory:
+        print(f"{'':<14} RSS: {memory}")
+
+
+def case_metrics(case):
+    """Karşılaştırılan ölçümler: (ad, değer, mutlak fark eşiği)"""
+    metrics = [(f"stage:{name}", seconds, MIN_DELTA_SECONDS) for name, seconds in case['stages'].items()]
+    metrics.append(("total_seconds", case['total_seconds'], MIN_DELTA_SECONDS))
+    if case.get('first_segment_seconds') is not None:
+        metrics.append(("first_segment_seconds", case['first_segment_seconds'], MIN_DELTA_SECONDS))
+    if case.get('peak_rss_mb') is not None:
+        metrics.append(("peak_rss_mb", case['peak_rss_mb'], MIN_DELTA_MB))
+    # Eski sonuçlarda aşama başına bellek yoktur; karşılığı olmayan ölçümler atlanır
+    metrics.extend((f"rss:{name}", mb, MIN_DELTA_MB) for name, mb in case.get('stage_rss_mb', {}).items())
+    metrics.extend((f"peak_growth:{name}", mb, MIN_DELTA_MB)
+                   for name, mb in case.get('stage_peak_growth_mb', {}).items())
+    return metrics
+
+
+def compare_results(old, new, threshold):
+    """İki sonucu karşılaştırır, gerileyen ölçüm sayısını döndürür"""
+    if old.get('model') != new.get('model'):
+        print(f"Uyarı: farklı modeller karşılaştırılıyor ({old.get('model')} / {new.get('model')})")
+    print(f"{old['commit']} -> {new['commit']} (eşik %{threshold * 100:.0f})")
+    regressions = 0
+    for key, case in new['cases'].items():
+        if key not in old['cases']:
+            continue
+        previous = dict((name, value) for name, value, _ in case_metrics(old['cases'][key]))
+        for name, value, min_delta in case_metrics(case):
+            if name not in previous or not previous[name]:
+                continue
+            change = (value - previous[name]) / previous[name]
+            regressed = change > threshold and value - previous[name] > min_delta
+            regressions += regressed
+            marker = "❌" if regressed else ("✅" if change < -threshold else "  ")
+            print(f"{marker} {key:<14} {name:<28} {previous[name]:>10.3f} -> {value:>10.3f} ({change * 100:+.1f}%)")
+    print(f"{regressions} gerileme" if regressions else "Gerileme yok")
+    return regressions
+
+
+def run(args):
+    commit = current_commit()
+    cases = {}
+    for container in args.containers:
+        for seconds in args.lengths:
+            media = generate_media(seconds, container)
+            key = f"{container}-{int(seconds)}s"
+            cases[key] = run_case(media, args)
+            print_case(key, cases[key])
+
+    result = {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'model': args.model,
+        'audio_mode': args.audio_mode,
+        'repeats': args.repeats,
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'cases': cases,
+    }
+    if not args.no_record:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{commit}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"Sonuç kaydedildi: {os.path.relpath(path, ROOT)}")
+    if args.compare_to:
+        return 1 if compare_results(load_result(args.compare_to), result, args.threshold) else 0
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Benchmark'ı çalıştır ve sonucu kaydet")
+    run_parser.add_argument('--model', default="stub", help="stub ya da whisper model adı (ör. tiny)")
+    run_parser.add_argument('--lengths', type=float, nargs='+', default=[30, 120, 600], help="Medya uzunlukları (sn)")
+    run_parser.add_argument('--containers', nargs='+', choices=sorted(CONTAINERS), default=["mp4", "mkv"])
+    run_parser.add_argument('--repeats', type=int, default=3)
+    run_parser.add_argument('--audio-mode', choices=pipeline.AUDIO_MODES, default=pipeline.DEFAULT_AUDIO_MODE)
+    run_parser.add_argument('--no-record', action='store_true', help="Sonucu dosyaya kaydetme")
+    run_parser.add_argument('--compare-to', help="Bu commit'in (ya da dosyanın) sonucuyla karşılaştır")
+    run_parser.add_argument('--threshold', type=float, default=0.10, help="Gerileme eşiği (0.10 = %%10)")
+
+    compare_parser = commands.add_parser('compare', help="İki sonucu karşılaştır")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.10)
+
+    child_parser = commands.add_parser('child')
+    child_parser.add_argument('media')
+    child_parser.add_argument('--model', default="stub")
+    child_parser.add_argument('--repeats', type=int, default=3)
+    child_parser.add_argument('--audio-mode', default=pipeline.DEFAULT_AUDIO_MODE)
+
+    args = parser.parse_args(argv)
+    if args.command == 'child':
+        run_child(args.media, args.model, args.repeats, args.audio_mode)
+        return 0
+    if args.command == 'compare':
+        return 1 if compare_results(load_result(args.old), load_result(args.new), args.threshold) else 0
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Transkripsiyon servisine eşzamanlı istek gönderen yük testi istemcisi.
+
+Sunucu verilmezse, verilen modelle (varsayılan tiny) yerel bir servis alt
+süreç olarak başlatılır; ses verilmezse sentetik WAV dosyaları (ton + gürültü)
+üretilir. Böylece test tamamen çevrimdışı çalışır (modelin önceden indirilmiş
+olması yeterlidir). İstek gecikmeleri, toplam verim ve sunucunun ortalama
+toplu çözme boyutu yazdırılır.
+
+Kullanım:
+    python benchmarks/load_test_server.py --clients 8 --requests 32 --seconds 45
+    python benchmarks/load_test_server.py --url http://127.0.0.1:8765 --media kayit.mp4
+"""
+import argparse
+import array
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_RATE = 16000
+
+
+def synthetic_wav(path, seconds, seed):
+    """Değişen frekanslı ton ve hafif gürültüden oluşan 16 kHz mono WAV yazar"""
+    rng = random.Random(seed)
+    samples = array.array('h')
+    frequency = 220.0
+    for i in range(int(seconds * SAMPLE_RATE)):
+        if i % SAMPLE_RATE == 0:
+            frequency = rng.choice((220.0, 330.0, 440.0, 0.0))
+        value = 0.3 * math.sin(2 * math.pi * frequency * i / SAMPLE_RATE) + rng.uniform(-0.02, 0.02)
+        samples.append(int(value * 32767))
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+
+
+def request_json(url, data=None, headers=None, timeout=600):
+    request = urllib.request.Request(url, data=data, headers=headers or {})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def wait_for_server(url, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            return request_json(f"{url}/metrics", timeout=5)
+        except Exception:
+            time.sleep(0.5)
+    raise Exception(f"Servis {timeout} sn içinde hazır olmadı: {url}")
+
+
+def run_request(url, media):
+    started = time.perf_counter()
+    with open(media, 'rb') as f:
+        body = f.read()
+    job = request_json(f"{url}/jobs", data=body, headers={
+        'Content-Type': 'application/octet-stream',
+        'X-Filename': os.path.basename(media),
+    })
+    while True:
+        job = request_json(f"{url}/jobs/{job['id']}?wait=30")
+        if job['status'] in ("done", "failed"):
+            break
+    return time.perf_counter() - started, job
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(ratio * len(ordered)))] if ordered else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="Çalışan bir servis (verilmezse yerel servis başlatılır)")
+    parser.add_argument('--model', default="tiny")
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--clients', type=int, default=4, help="Eşzamanlı istemci sayısı")
+    parser.add_argument('--requests', type=int, default=16, help="Toplam istek sayısı")
+    parser.add_argument('--seconds', type=float, default=45, help="Sentetik ses uzunluğu")
+    parser.add_argument('--media', nargs='*', help="Sentetik ses yerine gönderilecek dosyalar")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="speechrecog_load_")
+    media = args.media
+    if not media:
+        media = []
+        for index in range(min(args.requests, 4)):
+            path = os.path.join(workdir, f"synthetic_{index}.wav")
+            synthetic_wav(path, args.seconds, seed=index)
+            media.append(path)
+
+    server = None
+    url = args.url
+    if not url:
+        url = f"http://127.0.0.1:{args.port}"
+        env = dict(os.environ, SPEECHRECOG_DATA_DIR=workdir)
+        server = subprocess.Popen([
+            sys.executable, os.path.join(ROOT, "SpeechRecog.py"), "serve", "--port", str(args.port),
+            "--model", args.model, "--max-batch", str(args.max_batch), "--no-cache",
+        ], env=env)
+    try:
+        wait_for_server(url)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            results = list(pool.map(lambda i: run_request(url, media[i % len(media)]), range(args.requests)))
+        wall = time.perf_counter() - started
+        metrics = request_json(f"{url}/metrics")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies = [latency for latency, _ in results]
+    failed = [job for _, job in results if job['status'] != "done"]
+    audio_seconds = sum(job.get('duration', 0.0) for _, job in results)
+    print(f"İstek: {len(results)} ({len(failed)} hata), istemci: {args.clients}, duvar süresi: {wall:.1f} sn")
+    print(f"Gecikme p50: {percentile(latencies, 0.5):.2f} sn, p95: {percentile(latencies, 0.95):.2f} sn, "
+          f"en fazla: {max(latencies):.2f} sn")
+    print(f"Verim: {len(results) / wall * 3600:.0f} istek/saat, ses sn / duvar sn: {audio_seconds / wall:.2f}")
+    print(f"Toplu çözme: {metrics['batches']} çağrı, ortalama boyut {metrics['mean_batch_size']:.2f}, "
+          f"dağılım {metrics['batch_size_histogram']}")
+    for job in failed[:3]:
+        print(f"  Hata: {job.get('error')}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
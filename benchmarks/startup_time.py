@@ -0,0 +1,90 @@
+"""Arayüzün açılış süresini ölçer ve commit'ler arasında izler.
+
+Uygulama SPEECHRECOG_STARTUP_PROBE=1 ile başlatılır; pencere ilk kez
+çizildiğinde süreyi yazıp kapanır. Her ölçüm, commit özetiyle birlikte
+benchmarks/results/startup.jsonl dosyasına eklenir ve bir önceki farklı
+commit'teki ölçümle karşılaştırılır.
+
+Kullanım:
+    python benchmarks/startup_time.py [--runs 5] [--no-record]
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "startup.jsonl")
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def measure_once():
+    """(süreç başlangıcından pencereye toplam sn, uygulama içi sn) döndürür"""
+    env = dict(os.environ, SPEECHRECOG_STARTUP_PROBE="1")
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, os.path.join(ROOT, "SpeechRecog.py")], env=env,
+                          capture_output=True, text=True, timeout=120)
+    wall = time.perf_counter() - started
+    for line in proc.stdout.splitlines():
+        if line.startswith("SPEECHRECOG_STARTUP "):
+            return wall, float(line.split()[1])
+    raise Exception(f"Açılış ölçülemedi:\n{proc.stderr.strip()}")
+
+
+def previous_result(commit):
+    if not os.path.exists(RESULTS_PATH):
+        return None
+    previous = None
+    with open(RESULTS_PATH, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                if entry['commit'] != commit:
+                    previous = entry
+    return previous
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--no-record', action='store_true', help="Sonucu dosyaya ekleme")
+    args = parser.parse_args(argv)
+
+    # İlk çalıştırma disk önbelleğini ısıtır, ölçüme katılmaz
+    measure_once()
+    runs = [measure_once() for _ in range(args.runs)]
+    entry = {
+        'commit': current_commit(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'runs': args.runs,
+        'wall_median': round(statistics.median(run[0] for run in runs), 4),
+        'app_median': round(statistics.median(run[1] for run in runs), 4),
+    }
+    print(f"Commit {entry['commit']}: pencere {entry['wall_median'] * 1000:.0f} ms "
+          f"(uygulama içi {entry['app_median'] * 1000:.0f} ms), {args.runs} ölçümün medyanı")
+
+    previous = previous_result(entry['commit'])
+    if previous:
+        change = (entry['wall_median'] - previous['wall_median']) / previous['wall_median'] * 100
+        print(f"Önceki ({previous['commit']}): {previous['wall_median'] * 1000:.0f} ms, değişim %{change:+.1f}")
+
+    if not args.no_record:
+        os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+        with open(RESULTS_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Kalıcı transkript önbelleği.
+
+Aynı medya aynı model ve aynı çözme seçenekleriyle ikinci kez transkribe
+edilmez: anahtar; dosya parmak izi (ya da çözülmüş sesin özeti), model adı ve
+seçeneklerden üretilir. Kayıtlar SQLite içinde sıkıştırılmış JSON olarak tutulur,
+toplam boyut sınırı aşılınca en uzun süredir kullanılmayan (LRU) kayıtlar silinir.
+
+Kullanım:
+    python SpeechRecog.py cache stats
+    python SpeechRecog.py cache clear [--model turbo]
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+
+DEFAULT_MAX_MB = int(os.environ.get("SPEECHRECOG_CACHE_MAX_MB", "200"))
+
+# Parmak izi için dosyanın başından, ortasından ve sonundan okunacak bayt sayısı
+FINGERPRINT_BLOCK = 1024 * 1024
+
+# Önbellekte yalnızca arayüzün ve dışa aktarmanın kullandığı alanlar saklanır
+SEGMENT_FIELDS = ('start', 'end', 'text')
+
+
+def data_dir():
+    """Uygulamanın kalıcı veri klasörü (SPEECHRECOG_DATA_DIR ile değiştirilebilir)"""
+    path = os.environ.get("SPEECHRECOG_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".speechrecog")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_fingerprint(path):
+    """Dosyanın boyutu ile baş/orta/son bloklarından hızlı bir parmak izi üret"""
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as f:
+        for offset in sorted({0, max(0, size // 2 - FINGERPRINT_BLOCK // 2), max(0, size - FINGERPRINT_BLOCK)}):
+            f.seek(offset)
+            digest.update(f.read(FINGERPRINT_BLOCK))
+    return digest.hexdigest()
+
+
+def audio_fingerprint(audio):
+    """Çözülmüş ses dizisinin içerik özeti (kapsayıcıdan bağımsız eşleşme için)"""
+    return hashlib.sha256(memoryview(audio).cast('B')).hexdigest()
+
+
+class TranscriptCache:
+    def __init__(self, path=None, max_bytes=None):
+        self.path = path or os.path.join(data_dir(), "transcripts.db")
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_MAX_MB * 1024 * 1024
+        self.lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, model TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, last_used REAL NOT NULL, data BLOB NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _bump(self, conn, name):
+        conn.execute(
+            "INSERT INTO counters(name, value) VALUES (?, 1)"
+            " ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,)
+        )
+
+    @staticmethod
+    def make_key(fingerprint, model_name, options=None):
+        """Parmak izi + model + çözme seçeneklerinden önbellek anahtarı üret"""
+        payload = json.dumps({'media': fingerprint, 'model': model_name, 'options': options or {}}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key, count=True):
+        """Kayıt varsa {'segments', 'duration'} (ve varsa 'language') döndürür, yoksa None.
+
+        Birden çok anahtara bakan çağıran count=False verip sonucu record_lookup ile bir kez sayar.
+        """
+        with self.lock, self._connect() as conn:
+            row = conn.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            if count:
+                self._bump(conn, 'hits' if row is not None else 'misses')
+        return json.loads(zlib.decompress(row[0])) if row is not None else None
+
+    def record_lookup(self, hit):
+        with self.lock, self._connect() as conn:
+            self._bump(conn, 'hits' if hit else 'misses')
+
+    def put(self, key, model_name, segments, duration=0.0, language=None):
+        """language: ön geçişin sonucu; önbellekten dönüldüğünde dil kuralları bununla uygulanır"""
+        slim = [{field: segment.get(field) for field in SEGMENT_FIELDS} for segment in segments]
+        payload = {'segments': slim, 'duration': duration}
+        if language:
+            payload['language'] = language
+        data = zlib.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        now = time.time()
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries(key, model, size, created, last_used, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, len(data), now, now, data)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self._bump(conn, 'evictions')
+
+    def invalidate(self, model_name=None, keep_model=None):
+        """Kayıtları sil: belirli bir modelinkileri, verilen model dışındakileri ya da hepsini"""
+        with self.lock, self._connect() as conn:
+            if model_name is not None:
+                cursor = conn.execute("DELETE FROM entries WHERE model = ?", (model_name,))
+            elif keep_model is not None:
+                cursor = conn.execute("DELETE FROM entries WHERE model != ?", (keep_model,))
+            else:
+                cursor = conn.execute("DELETE FROM entries")
+            return cursor.rowcount
+
+    def stats(self):
+        with self.lock, self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            'hits': counters.get('hits', 0),
+            'misses': counters.get('misses', 0),
+            'evictions': counters.get('evictions', 0),
+            'entries': entries,
+            'bytes': size,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="SpeechRecog.py cache", description="Transkript önbelleğini yönetir.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help="İsabet/ıska sayaçlarını ve boyutu göster")
+    clear = sub.add_parser('clear', help="Kayıtları sil")
+    clear.add_argument('--model', help="Yalnızca bu modelin kayıtlarını sil")
+    clear.add_argument('--keep-model', help="Bu model dışındaki tüm kayıtları sil")
+    args = parser.parse_args(argv)
+
+    cache = TranscriptCache()
+    if args.command == 'stats':
+        stats = cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / lookups * 100 if lookups else 0.0
+        print(f"Kayıt: {stats['entries']}  Boyut: {stats['bytes'] / (1024 * 1024):.1f} MB / {cache.max_bytes / (1024 * 1024):.0f} MB")
+        print(f"İsabet: {stats['hits']}  Iska: {stats['misses']}  (%{ratio:.1f})  Tahliye: {stats['evictions']}")
+    else:
+        removed = cache.invalidate(model_name=args.model, keep_model=args.keep_model)
+        print(f"{removed} kayıt silindi.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Uzun kayıtlar için kaldığı yerden devam edebilen (checkpoint'li) transkripsiyon.
+
+Ses, sessizlik noktalarına hizalanmış sabit pencerelere bölünür ve sırayla
+transkribe edilir. Biten her pencerenin segmentleri, girdinin özetiyle
+adlandırılmış bir JSONL günlüğüne (~/.speechrecog/checkpoints/<anahtar>.jsonl)
+eklenir ve diske yazılır. Uygulama çöker ya da iş iptal edilirse aynı dosya
+tekrar açıldığında tamamlanan pencereler günlükten okunur, transkripsiyon
+son tamamlanan pencereden sonra devam eder. İş bitince günlük silinir
+(sonuç artık transkript önbelleğindedir).
+
+Günlük biçimi: ilk satır {"type": "header", ...} (pencere sınırları dahil),
+sonraki her satır {"type": "window", "index", "segments", "prompt"}. Yarım
+yazılmış son satır okunurken yok sayılır.
+"""
+import json
+import os
+
+import pipeline
+from cache import data_dir
+
+
+# Bundan kısa sesler için günlük tutulmaz (baştan transkribe etmek ucuzdur)
+CHECKPOINT_MIN_SECONDS = 600
+CHECKPOINT_WINDOW_SECONDS = 120
+
+
+def checkpoints_dir():
+    path = os.path.join(data_dir(), "checkpoints")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def journal_path(key):
+    return os.path.join(checkpoints_dir(), f"{key}.jsonl")
+
+
+def should_checkpoint(duration):
+    return duration >= CHECKPOINT_MIN_SECONDS
+
+
+def read_journal(path, header):
+    """Günlükteki tamamlanmış pencereleri sırayla döndürür; başlık uyuşmazsa boş liste"""
+    if not os.path.exists(path):
+        return []
+    windows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    for number, line in enumerate(lines):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            break  # Yarım kalmış son satır
+        if number == 0:
+            if entry.get('type') != "header" or entry.get('bounds') != header['bounds']:
+                return []
+            continue
+        if entry.get('type') != "window" or entry.get('index') != len(windows):
+            break
+        windows.append(entry)
+    return windows
+
+
+def _append(f, entry):
+    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def iter_checkpointed_segments(model, audio, key, window_seconds=CHECKPOINT_WINDOW_SECONDS, on_stage=None,
+                               language=None):
+    """chunked.iter_window_segments gibi çalışır, ama her pencereyi günlüğe yazar ve günlükten devam eder"""
+    from chunked import PROMPT_CHARS, SegmentMerger, shift_segments, split_audio
+
+    chunks = split_audio(audio, window_seconds)
+    header = {
+        'type': "header",
+        'window_seconds': window_seconds,
+        'duration': len(audio) / pipeline.SAMPLE_RATE,
+        'bounds': [[round(own_start, 3), round(own_end, 3)] for own_start, own_end, _, _ in chunks],
+    }
+    path = journal_path(key)
+    done = read_journal(path, header)
+    if done and on_stage:
+        on_stage("resume", {'windows_done': len(done), 'windows': len(chunks), 'position': chunks[len(done) - 1][1]})
+
+    # Günlüğü yalnızca okunabilen kısmıyla yeniden yaz (yarım satır ya da eski başlık kalmasın)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        for entry in [header] + done:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    os.replace(path + ".tmp", path)
+
+    merger = SegmentMerger()
+    prompt = None
+    with open(path, 'a', encoding='utf-8') as journal:
+        for index, (own_start, own_end, offset, chunk) in enumerate(chunks):
+            last = index == len(chunks) - 1
+            if index < len(done):
+                segments, prompt = done[index]['segments'], done[index]['prompt']
+            else:
+                result = model.transcribe(chunk, initial_prompt=prompt, **pipeline.decode_options(language))
+                segments = shift_segments(result.get('segments', []), offset)
+                prompt = result.get('text', '').strip()[-PROMPT_CHARS:] or None
+                _append(journal, {'type': "window", 'index': index, 'segments': segments, 'prompt': prompt})
+            yield from merger.add(own_start, own_end, segments, last=last)
+        yield from merger.finish()
+    remove_journal(key)
+
+
+def remove_journal(key):
+    try:
+        os.remove(journal_path(key))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Checkpoint günlüğü silinemedi: {e}")
@@ -0,0 +1,267 @@
+"""Uzun ses dosyaları için paralel parçalı transkripsiyon.
+
+Ses, hedef parça uzunluğunun çevresindeki en sessiz noktalardan bölünür; her
+parça kendi modelini yüklemiş ayrı bir süreçte transkribe edilir. Sonuçlar
+zaman kaymaları düzeltilerek tek bir segment listesinde birleştirilir, dikiş
+yerlerinde çift çıkan segmentler atılır. Çıktı, tek parça transcribe ile aynı
+biçimdedir ({'start', 'end', 'text', ...}).
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import pipeline
+from backends import DEFAULT_BACKEND, configure_threads
+
+
+DEFAULT_CHUNK_SECONDS = 300
+# Canlı akışta sırayla transkribe edilen pencerelerin hedef uzunluğu
+STREAM_WINDOW_SECONDS = 120
+# Pencereler arası bağlam için bir önceki pencerenin son kaç karakteri istem olarak verilir
+PROMPT_CHARS = 200
+# Bölme noktası hedefin bu kadar saniye önü/arkasında aranır
+SEARCH_WINDOW_SECONDS = 30
+# Kelimelerin dikişte kesilmemesi için parçalar iki yandan bu kadar taşar
+PAD_SECONDS = 0.5
+FRAME_SECONDS = 0.05
+# Sessizlik ararken enerji bu kadar kare boyunca ortalanır (tek sessiz kare yerine boşluk bulmak için)
+SMOOTH_FRAMES = 6
+
+_worker_model = None
+
+
+def frame_energy(audio, frame_seconds=FRAME_SECONDS):
+    """Sesi sabit karelere böler, her karenin RMS enerjisini döndürür"""
+    frame = max(1, int(frame_seconds * pipeline.SAMPLE_RATE))
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:count * frame].reshape(count, frame)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def find_split_points(audio, chunk_seconds=DEFAULT_CHUNK_SECONDS, search_seconds=SEARCH_WINDOW_SECONDS):
+    """Hedef uzunluk çevresindeki en sessiz noktalardan bölme örnek indekslerini bul"""
+    total = len(audio)
+    chunk = int(chunk_seconds * pipeline.SAMPLE_RATE)
+    if total <= chunk + chunk // 2:
+        return []
+
+    energy = frame_energy(audio)
+    if len(energy) >= SMOOTH_FRAMES:
+        energy = np.convolve(energy, np.ones(SMOOTH_FRAMES) / SMOOTH_FRAMES, mode='same')
+    frame = int(FRAME_SECONDS * pipeline.SAMPLE_RATE)
+    search = int(search_seconds / FRAME_SECONDS)
+
+    splits = []
+    last = 0
+    target = chunk
+    while total - target > chunk // 2:
+        center = target // frame
+        low = max(last // frame + 1, center - search)
+        high = min(len(energy), center + search)
+        if high <= low:
+            split = target
+        else:
+            split = (low + int(np.argmin(energy[low:high]))) * frame
+        splits.append(split)
+        last = split
+        target = split + chunk
+    return splits
+
+
+def split_audio(audio, chunk_seconds=DEFAULT_CHUNK_SECONDS, pad_seconds=PAD_SECONDS):
+    """Sesi parçalara böler; (kendi_başı_sn, kendi_sonu_sn, parça_başı_sn, parça) listesi döndürür"""
+    pad = int(pad_seconds * pipeline.SAMPLE_RATE)
+    bounds = [0] + find_split_points(audio, chunk_seconds) + [len(audio)]
+    chunks = []
+    for own_start, own_end in zip(bounds, bounds[1:]):
+        start = max(0, own_start - pad)
+        end = min(len(audio), own_end + pad)
+        chunks.append((
+            own_start / pipeline.SAMPLE_RATE,
+            own_end / pipeline.SAMPLE_RATE,
+            start / pipeline.SAMPLE_RATE,
+            audio[start:end],
+        ))
+    return chunks
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+class SegmentMerger:
+    """Parça sonuçlarını sırayla alıp tek segment akışına çeviren birleştirici.
+
+    Bir segment, orta noktası hangi parçanın kendi aralığına düşüyorsa o
+    parçadan alınır; dikişte art arda gelen aynı metinli segmentler
+    tekilleştirilir. Son segment bir sonraki parçayla birleşebileceği için
+    bir adım geriden verilir; finish() onu da döndürür.
+    """
+
+    def __init__(self):
+        self.pending = None
+        self.count = 0
+
+    def _emit(self):
+        segment = self.pending
+        segment['id'] = self.count
+        self.count += 1
+        return segment
+
+    def add(self, own_start, own_end, segments, last=False):
+        """Zamanları mutlak olan bir parçanın segmentlerini ekler, kesinleşenleri döndürür"""
+        if last:
+            own_end = float('inf')
+        ready = []
+        for segment in segments:
+            middle = (segment['start'] + segment['end']) / 2
+            if middle < own_start or middle >= own_end:
+                continue
+            segment = dict(segment)
+            if self.pending is not None:
+                previous = self.pending
+                if (_normalize(segment['text']) == _normalize(previous['text'])
+                        and segment['start'] - previous['end'] < 1.0):
+                    previous['end'] = max(previous['end'], segment['end'])
+                    continue
+                segment['start'] = max(segment['start'], previous['end'])
+                segment['end'] = max(segment['end'], segment['start'])
+                ready.append(self._emit())
+            self.pending = segment
+        return ready
+
+    def finish(self):
+        if self.pending is None:
+            return []
+        ready = [self._emit()]
+        self.pending = None
+        return ready
+
+
+def merge_chunk_segments(chunk_results):
+    """Parça sonuçlarını tek listede birleştirir.
+
+    chunk_results: (kendi_başı, kendi_sonu, segmentler) listesi; segment zamanları
+    zaten mutlak zamana kaydırılmış olmalıdır.
+    """
+    merger = SegmentMerger()
+    ordered = sorted(chunk_results, key=lambda item: item[0])
+    merged = []
+    for index, (own_start, own_end, segments) in enumerate(ordered):
+        merged.extend(merger.add(own_start, own_end, segments, last=index == len(ordered) - 1))
+    merged.extend(merger.finish())
+    return merged
+
+
+def shift_segments(segments, offset):
+    """Parça içi segment zamanlarını mutlak zamana kaydırır (yalnızca start/end/text tutulur)"""
+    shifted = []
+    for segment in segments:
+        segment = {key: value for key, value in segment.items() if key in ('start', 'end', 'text')}
+        segment['start'] = segment.get('start', 0) + offset
+        segment['end'] = segment.get('end', 0) + offset
+        shifted.append(segment)
+    return shifted
+
+
+def iter_window_segments(model, audio, window_seconds=STREAM_WINDOW_SECONDS, language=None):
+    """Sesi sessizlik sınırlarındaki pencerelerle sırayla transkribe eder.
+
+    Segmentler tüm dosyanın bitmesi beklenmeden, pencereler çözüldükçe
+    (mutlak zamanlarıyla) üretilir. Bir önceki pencerenin metni bir sonrakine
+    initial_prompt olarak verilir. language verilmezse dil her pencerede yeniden tespit edilir.
+    """
+    merger = SegmentMerger()
+    chunks = split_audio(audio, window_seconds)
+    prompt = None
+    for index, (own_start, own_end, offset, chunk) in enumerate(chunks):
+        result = model.transcribe(chunk, initial_prompt=prompt, **pipeline.decode_options(language))
+        segments = shift_segments(result.get('segments', []), offset)
+        yield from merger.add(own_start, own_end, segments, last=index == len(chunks) - 1)
+        prompt = result.get('text', '').strip()[-PROMPT_CHARS:] or None
+    yield from merger.finish()
+
+
+def _init_worker(model_name, threads_per_worker, backend=DEFAULT_BACKEND, inter_op_threads=0):
+    global _worker_model
+    configure_threads(threads_per_worker, inter_op_threads)
+    _worker_model = pipeline.load_whisper_model(model_name, backend)
+
+
+def _warm_up():
+    # Havuzdaki her sürecin başlatılıp modelini yüklemesi için kısa bir iş
+    time.sleep(0.2)
+    return os.getpid()
+
+
+def _transcribe_chunk(own_start, own_end, offset, audio, language=None):
+    segments = pipeline.transcribe_audio(_worker_model, audio, language)
+    return own_start, own_end, shift_segments(segments, offset)
+
+
+class ChunkedTranscriber:
+    """Uzun sesleri N işçi sürece dağıtan transkripsiyon havuzu.
+
+    Havuz ilk kullanımda açılır ve kapatılana kadar modelleri sıcak tutar.
+    """
+
+    def __init__(self, model_name=pipeline.DEFAULT_MODEL, workers=2, chunk_seconds=DEFAULT_CHUNK_SECONDS,
+                 threads_per_worker=None, backend=DEFAULT_BACKEND, inter_op_threads=0):
+        self.model_name = model_name
+        self.backend = backend
+        self.inter_op_threads = inter_op_threads
+        self.workers = max(1, int(workers))
+        self.chunk_seconds = chunk_seconds
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.executor = None
+
+    def options(self):
+        """Önbellek anahtarına katılacak parçalama seçenekleri"""
+        return {'chunk_seconds': self.chunk_seconds}
+
+    def should_chunk(self, duration):
+        return self.workers > 1 and duration > self.chunk_seconds * 1.5
+
+    def start(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker, self.backend, self.inter_op_threads)
+            )
+        return self.executor
+
+    def warm_up(self):
+        """Tüm işçileri başlatıp modellerini yüklemelerini bekle"""
+        executor = self.start()
+        for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+            future.result()
+
+    def transcribe(self, audio, language=None):
+        """float32 sesi parçalayıp paralel transkribe eder, birleştirilmiş segmentleri döndürür"""
+        return list(self.iter_transcribe(audio, language))
+
+    def iter_transcribe(self, audio, language=None):
+        """transcribe ile aynı, ama segmentleri parçalar sırayla bittikçe üretir"""
+        executor = self.start()
+        futures = [
+            executor.submit(_transcribe_chunk, own_start, own_end, offset, chunk, language)
+            for own_start, own_end, offset, chunk in split_audio(audio, self.chunk_seconds)
+        ]
+        merger = SegmentMerger()
+        try:
+            for index, future in enumerate(futures):
+                own_start, own_end, segments = future.result()
+                yield from merger.add(own_start, own_end, segments, last=index == len(futures) - 1)
+            yield from merger.finish()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
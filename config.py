@@ -0,0 +1,93 @@
+"""Uygulama ayarları.
+
+Ayarlar sırasıyla varsayılanlardan, speechrecog.json dosyasından (önce
+uygulama klasöründe, yoksa ~/.speechrecog içinde aranır) ve ortam
+değişkenlerinden okunur; sonradan gelen öncekini ezer.
+
+Örnek speechrecog.json:
+    {"model": "small", "vad": true, "chunk_workers": 4}
+"""
+import json
+import os
+
+from cache import data_dir
+
+
+CONFIG_FILENAME = "speechrecog.json"
+
+# Arayüzde seçilebilen model boyutları (küçükten büyüğe)
+MODEL_SIZES = ("tiny", "base", "small", "medium", "large", "turbo")
+
+DEFAULTS = {
+    'model': "turbo",
+    'audio_mode': "memory",
+    'chunk_workers': 0,
+    'vad': False,
+    # Çıkarım arka ucu (stock: fp32, int8: dinamik nicemleme) ve torch thread sayıları (0 = varsayılan)
+    'backend': "stock",
+    'intra_op_threads': 0,
+    'inter_op_threads': 0,
+    # Her işi cProfile ile izle (.prof dosyaları ~/.speechrecog/reports içine yazılır)
+    'profile': False,
+    # Tam çözümden önce dili tespit edip sabitle; izin verilen diller (boş = hepsi),
+    # en düşük konuşma oranı ve kurala uymayan dilleri çözecek model ("" = atla)
+    'language_detect': True,
+    'languages': [],
+    'min_speech_ratio': 0.0,
+    'reroute_model': "",
+}
+
+ENV_OVERRIDES = {
+    'model': ("SPEECHRECOG_MODEL", str),
+    'audio_mode': ("SPEECHRECOG_AUDIO_MODE", str),
+    'chunk_workers': ("SPEECHRECOG_CHUNK_WORKERS", int),
+    'vad': ("SPEECHRECOG_VAD", lambda value: value == "1"),
+    'backend': ("SPEECHRECOG_BACKEND", str),
+    'intra_op_threads': ("SPEECHRECOG_INTRA_OP_THREADS", int),
+    'inter_op_threads': ("SPEECHRECOG_INTER_OP_THREADS", int),
+    'profile': ("SPEECHRECOG_PROFILE", lambda value: value == "1"),
+    'language_detect': ("SPEECHRECOG_LANGUAGE_DETECT", lambda value: value == "1"),
+    'languages': ("SPEECHRECOG_LANGUAGES", lambda value: [item.strip() for item in value.split(",") if item.strip()]),
+    'min_speech_ratio': ("SPEECHRECOG_MIN_SPEECH_RATIO", float),
+    'reroute_model': ("SPEECHRECOG_REROUTE_MODEL", str),
+}
+
+
+def config_path():
+    """Okunacak/yazılacak ayar dosyasının yolu"""
+    if os.environ.get("SPEECHRECOG_CONFIG"):
+        return os.environ["SPEECHRECOG_CONFIG"]
+    local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), CONFIG_FILENAME)
+    if os.path.exists(local_path):
+        return local_path
+    return os.path.join(data_dir(), CONFIG_FILENAME)
+
+
+def load_config():
+    settings = dict(DEFAULTS)
+    path = config_path()
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+        except Exception as e:
+            print(f"Ayar dosyası okunamadı ({path}): {e}")
+    for key, (name, convert) in ENV_OVERRIDES.items():
+        if os.environ.get(name):
+            settings[key] = convert(os.environ[name])
+    return settings
+
+
+def save_config(updates):
+    """Verilen ayarları dosyadaki mevcut ayarlarla birleştirip kaydet"""
+    path = config_path()
+    settings = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except Exception:
+            settings = {}
+    settings.update(updates)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, ensure_ascii=False, indent=2)
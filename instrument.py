@@ -0,0 +1,211 @@
+"""Aşama bazlı süre ölçümü ve makinece okunabilir çalıştırma raporu.
+
+Her iş için bir RunRecorder oluşturulur ve işi yürüten thread'de activate()
+ile etkinleştirilir. pipeline içindeki stage("extract") gibi bloklar yalnızca
+o thread'de etkin bir kaydedici varsa süre toplar, yoksa hiçbir şey yapmaz.
+Dil tespiti, instrument_model ile sarılan model.detect_language üzerinden
+ayrıca ölçülür. Her aşamanın sonunda sürecin bellek kullanımı (RSS) ve aşama
+boyunca tepe belleğin ne kadar arttığı da kaydedilir; bellek süreç geneli
+olduğundan örtüşen işlerde aşamalara yaklaşık dağılır. İş bitince finish()
+raporu JSONL dosyasına bir satır olarak ekler (varsayılan:
+~/.speechrecog/reports/runs.jsonl).
+
+Profil modu (profile=True) her activate() bloğunu cProfile ile izler ve rapor
+klasörüne <çalıştırma>_<thread>.prof yazar (snakeviz, pstats ile açılabilir).
+Python 3.12+ aynı anda tek profil izin verdiğinden, örtüşen işlerde ilk
+başlayan profillenir, diğerleri uyarıyla profilsiz çalışır. py-spy ile
+dışarıdan örneklemek için thread adları (extract_*, transcribe_*) anlamlı
+tutulmuştur.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from cache import data_dir
+
+
+REPORT_FILENAME = "runs.jsonl"
+
+_local = threading.local()
+
+
+def reports_dir():
+    path = os.path.join(data_dir(), "reports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def default_report_path():
+    return os.environ.get("SPEECHRECOG_REPORT") or os.path.join(reports_dir(), REPORT_FILENAME)
+
+
+def peak_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (MB), ölçülemiyorsa None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux'ta KB, macOS'ta bayt
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024
+    except Exception:
+        return None
+
+
+def rss_mb():
+    """Sürecin şu anki bellek kullanımı (MB), ölçülemiyorsa None"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except Exception:
+        return None
+
+
+def current():
+    """Bu thread'de etkin olan kaydedici (yoksa None)"""
+    return getattr(_local, 'recorder', None)
+
+
+@contextmanager
+def stage(name):
+    """Etkin kaydedici varsa bloğun süresini ve bitişindeki belleği verilen aşamaya ekler"""
+    recorder = current()
+    if recorder is None:
+        yield
+        return
+    started = time.perf_counter()
+    peak_before = peak_rss_mb()
+    try:
+        yield
+    finally:
+        recorder.add(name, time.perf_counter() - started)
+        recorder.add_memory(name, rss_mb(), peak_before, peak_rss_mb())
+
+
+def instrument_model(model):
+    """model.detect_language çağrılarını "language_detection" aşaması olarak ölçülür hale getirir"""
+    if getattr(model, '_speechrecog_instrumented', False):
+        return model
+    detect_language = model.detect_language
+
+    def timed_detect_language(*args, **kwargs):
+        with stage("language_detection"):
+            return detect_language(*args, **kwargs)
+
+    model.detect_language = timed_detect_language
+    model._speechrecog_instrumented = True
+    return model
+
+
+def _start_profiler():
+    """cProfile'ı başlatır; Python 3.12+ süreç başına tek profil izin verir, doluysa None"""
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        print(f"Profil atlandı, başka bir profil zaten etkin: {e}")
+        return None
+    return profiler
+
+
+class RunRecorder:
+    """Tek bir çalıştırmanın (bir dosyanın) aşama sürelerini ve özet bilgilerini toplar"""
+
+    def __init__(self, source, profile=False, report_path=None, **info):
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.source = source
+        self.profile = profile
+        self.report_path = report_path or default_report_path()
+        self.info = dict(info)
+        self.stages = {}
+        self.stage_rss = {}  # aşama -> bitişlerinde görülen en yüksek RSS (MB)
+        self.stage_peak_growth = {}  # aşama -> aşama sırasında tepe belleğin toplam artışı (MB)
+        self.started = time.perf_counter()
+        self.created = time.time()
+        self.lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_memory(self, name, rss, peak_before, peak_after):
+        with self.lock:
+            if rss is not None:
+                self.stage_rss[name] = max(self.stage_rss.get(name, 0.0), rss)
+            if peak_before is not None and peak_after is not None:
+                self.stage_peak_growth[name] = self.stage_peak_growth.get(name, 0.0) + peak_after - peak_before
+
+    def update(self, **info):
+        with self.lock:
+            self.info.update(info)
+
+    @contextmanager
+    def activate(self):
+        """Bu thread'deki pipeline ölçümlerini bu kaydediciye yönlendir"""
+        previous = current()
+        _local.recorder = self
+        profiler = None
+        try:
+            if self.profile:
+                profiler = _start_profiler()
+            yield self
+        finally:
+            _local.recorder = previous
+            if profiler is not None:
+                profiler.disable()
+                name = threading.current_thread().name.replace(' ', '_')
+                try:
+                    profiler.dump_stats(os.path.join(os.path.dirname(self.report_path), f"{self.run_id}_{name}.prof"))
+                except Exception as e:
+                    print(f"Profil yazılamadı: {e}")
+
+    def report(self, **extra):
+        with self.lock:
+            stages = {name: round(seconds, 4) for name, seconds in self.stages.items()}
+            stage_rss = {name: round(mb, 1) for name, mb in self.stage_rss.items()}
+            stage_peak_growth = {name: round(mb, 1) for name, mb in self.stage_peak_growth.items()}
+            info = dict(self.info)
+        info.update(extra)
+        wall = time.perf_counter() - self.started
+        duration = info.get('duration') or 0.0
+        if 'transcribe' in stages and 'language_detection' in stages:
+            stages['decode'] = round(max(0.0, stages['transcribe'] - stages['language_detection']), 4)
+        return {
+            'run_id': self.run_id,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.created)),
+            'source': self.source,
+            **info,
+            'stages': stages,
+            'wall_seconds': round(wall, 4),
+            'rtf': round(wall / duration, 4) if duration else None,
+            'transcribe_rtf': round(stages.get('transcribe', 0.0) / duration, 4) if duration else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'stage_rss_mb': stage_rss,
+            'stage_peak_growth_mb': stage_peak_growth,
+        }
+
+    def finish(self, **extra):
+        """Raporu oluşturup JSONL dosyasına ekler ve döndürür"""
+        report = self.report(**extra)
+        try:
+            os.makedirs(os.path.dirname(self.report_path) or ".", exist_ok=True)
+            with open(self.report_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Çalıştırma raporu yazılamadı: {e}")
+        return report
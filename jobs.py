@@ -0,0 +1,301 @@
+"""Çok dosyalı iş kuyruğu ve zamanlayıcı.
+
+Her iş iki aşamadan geçer: ses çıkarma (G/Ç ve ffmpeg ağırlıklı) ve
+transkripsiyon (işlemci ağırlıklı). İki aşamanın ayrı, sınırlı havuzları
+vardır; böylece N. dosya transkribe edilirken N+1. dosyanın sesi çıkarılır.
+Hazırda bekleyen (çıkarılmış) ses sayısı max_ready ile sınırlanır, bellek
+şişmez. İşlerin önceliği değiştirilebilir ve iptal edilebilir; iptal,
+transkripsiyon sırasında da segment aralarında etkili olur.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import pipeline
+
+
+# Model yüklenemediği için düşen işlerin hata mesajı bununla başlar
+MODEL_ERROR_PREFIX = "Model yüklenemedi"
+
+QUEUED = "queued"
+EXTRACTING = "extracting"
+READY = "ready"
+TRANSCRIBING = "transcribing"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+STATUS_LABELS = {
+    QUEUED: "⏳ Sırada",
+    EXTRACTING: "🎵 Ses çıkarılıyor",
+    READY: "📦 Hazır",
+    TRANSCRIBING: "🤖 Transkribe ediliyor",
+    DONE: "✅ Tamamlandı",
+    FAILED: "❌ Hata",
+    CANCELLED: "🚫 İptal edildi",
+}
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, path, priority=0):
+        self.id = next(Job._ids)
+        self.path = path
+        self.priority = priority
+        self.status = QUEUED
+        self.cancel_event = threading.Event()
+        self.prepared = None
+        self.segments = []
+        self.duration = 0.0
+        self.position = 0.0
+        self.error = None
+        # instrument.RunRecorder; kuyruk yalnızca etkinleştirir, raporu sahibi yazar
+        self.recorder = None
+        self.created = time.time()
+        self.finished = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def activate_recorder(self):
+        return self.recorder.activate() if self.recorder is not None else nullcontext()
+
+    def sort_key(self, sequence):
+        # Yüksek öncelik önce, eşit öncelikte önce eklenen önce
+        return (-self.priority, sequence)
+
+
+class JobQueue:
+    """Öncelikli, iki aşamalı iş kuyruğu.
+
+    context() her iş için pipeline parametrelerini döndürür: model, model_name,
+    backend, audio_mode, cache, chunker, vad ve isteğe bağlı library (segmentler
+    geldikçe library.TranscriptLibrary'ye yazılır) ile language_rules
+    (language.LanguageRules, dil ön geçişi); model yüklenemediyse model_error
+    (bekleyen işler bu hatayla başarısız olur). on_event(job, olay, bilgi) iş durumları
+    değiştikçe ("status"), öncelik değişince ("priority"), aşama bilgisi geldikçe
+    ("stage") ve her segmentte ("segment", bilgi = (sıra, segment)) çağrılır.
+    recorder_factory(iş) verilirse her işe bir instrument.RunRecorder atanır ve
+    iki aşama da o kaydediciyle ölçülür.
+    """
+
+    def __init__(self, context, on_event=None, extract_workers=2, transcribe_workers=1, max_ready=1,
+                 recorder_factory=None):
+        self.context = context
+        self.on_event = on_event
+        self.recorder_factory = recorder_factory
+        self.jobs = {}
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.pending = []  # (sıralama, iş) yığını, ses çıkarma bekleyenler
+        self.ready = []    # (sıralama, iş) yığını, transkripsiyon bekleyenler
+        # Çıkarılmakta + hazırda bekleyen + transkribe edilen işlerin üst sınırı
+        self.slots = threading.Semaphore(transcribe_workers + max_ready)
+        self.extract_pool = ThreadPoolExecutor(max_workers=extract_workers, thread_name_prefix="extract")
+        self.stopped = False
+
+        threading.Thread(target=self._dispatch_loop, name="dispatch", daemon=True).start()
+        for index in range(transcribe_workers):
+            threading.Thread(target=self._transcribe_loop, name=f"transcribe_{index}", daemon=True).start()
+
+    def _emit(self, job, kind, info=None):
+        if self.on_event:
+            try:
+                self.on_event(job, kind, info)
+            except Exception as e:
+                print(f"İş olayı işlenemedi: {e}")
+
+    def _set_status(self, job, status):
+        job.status = status
+        if status in FINISHED_STATES:
+            job.finished = time.time()
+        self._emit(job, "status", status)
+
+    def submit(self, path, priority=0):
+        job = Job(path, priority)
+        if self.recorder_factory is not None:
+            job.recorder = self.recorder_factory(job)
+        with self.condition:
+            self.jobs[job.id] = job
+            heapq.heappush(self.pending, (job.sort_key(next(self.sequence)), job))
+            self.condition.notify_all()
+        self._emit(job, "status", QUEUED)
+        return job
+
+    def cancel(self, job_id):
+        """İşi iptal et; sırada ise hemen, çalışıyorsa bir sonraki segmentte durur"""
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return False
+        job.cancel_event.set()
+        released = None
+        with self.condition:
+            if any(item[1] is job for item in self.pending):
+                self.pending = [item for item in self.pending if item[1] is not job]
+                heapq.heapify(self.pending)
+                self._set_status(job, CANCELLED)
+            elif any(item[1] is job for item in self.ready):
+                # Sesi çıkarılmış ama henüz transkribe edilmemiş: belleği hemen bırak
+                self.ready = [item for item in self.ready if item[1] is not job]
+                heapq.heapify(self.ready)
+                released = job.prepared
+                self._set_status(job, CANCELLED)
+            self.condition.notify_all()
+        if released is not None:
+            pipeline.release_media(released)
+            self.slots.release()
+        return True
+
+    def set_priority(self, job_id, priority):
+        """Sıradaki ya da hazırda bekleyen bir işin önceliğini değiştir; değiştiyse True"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        with self.condition:
+            if job.status not in (QUEUED, READY):
+                return False  # Çalışan ya da biten işin sırası yok
+            job.priority = priority
+            self.pending = [(job_.sort_key(key[1]), job_) for key, job_ in self.pending]
+            self.ready = [(job_.sort_key(key[1]), job_) for key, job_ in self.ready]
+            heapq.heapify(self.pending)
+            heapq.heapify(self.ready)
+        self._emit(job, "priority", priority)
+        return True
+
+    def queue_position(self, job):
+        """Sırada bekleyen işin sıra numarası (1'den başlar), sırada değilse 0"""
+        with self.condition:
+            ordered = sorted(self.pending, key=lambda item: item[0])
+        for index, (_, queued) in enumerate(ordered, 1):
+            if queued is job:
+                return index
+        return 0
+
+    def shutdown(self):
+        with self.condition:
+            self.stopped = True
+            for job in self.jobs.values():
+                job.cancel_event.set()
+            self.condition.notify_all()
+        self.extract_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch_loop(self):
+        """Sırası gelen işi, hazır ses sınırı izin verdikçe ses çıkarma havuzuna gönder"""
+        while True:
+            self.slots.acquire()
+            with self.condition:
+                while not self.pending and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                _, job = heapq.heappop(self.pending)
+                self._set_status(job, EXTRACTING)
+            self.extract_pool.submit(self._extract, job)
+
+    def _extract(self, job):
+        context = self.context()
+        language_rules = context.get('language_rules')
+        try:
+            with job.activate_recorder():
+                job.prepared = pipeline.prepare_media(
+                    job.path, audio_mode=context['audio_mode'], cache=context['cache'],
+                    model_name=context['model_name'],
+                    options=pipeline.transcribe_options(context['vad'], context['backend'],
+                                                        language_rules is not None and language_rules.detect),
+                    vad=context['vad'], as_array=True, language_rules=language_rules,
+                    chunker=context['chunker'], streaming=True, pool_only=context['model'] is None,
+                    on_stage=lambda stage, info=None: self._emit(job, "stage", (stage, info))
+                )
+            job.check_cancelled()
+        except Exception as e:
+            if job.prepared is not None:
+                pipeline.release_media(job.prepared)
+            job.error = None if isinstance(e, JobCancelled) else str(e)
+            self._set_status(job, CANCELLED if isinstance(e, JobCancelled) else FAILED)
+            self.slots.release()
+            return
+
+        with self.condition:
+            job.duration = job.prepared['duration'] or (job.prepared['entry'] or {}).get('duration', 0.0)
+            heapq.heappush(self.ready, (job.sort_key(next(self.sequence)), job))
+            self._set_status(job, READY)
+            self.condition.notify_all()
+
+    def _transcribe_loop(self):
+        while True:
+            with self.condition:
+                while not self.ready and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                _, job = heapq.heappop(self.ready)
+            try:
+                self._transcribe(job)
+            finally:
+                pipeline.release_media(job.prepared)
+                self.slots.release()
+
+    def _transcribe(self, job):
+        if job.cancelled:
+            self._set_status(job, CANCELLED)
+            return
+        self._set_status(job, TRANSCRIBING)
+        library = None
+        indexer = None
+
+        def on_segment(segment):
+            nonlocal indexer
+            job.check_cancelled()
+            job.segments.append(segment)
+            job.position = max(job.position, segment.get('end', 0))
+            if library is not None:
+                # Kütüphane satırı ilk segmentte açılır; dil kuralıyla atlanan dosyalar kütüphaneye girmez
+                if indexer is None:
+                    indexer = library.indexer(job.path, context['model_name'])
+                indexer.add(segment)
+            self._emit(job, "segment", (len(job.segments) - 1, segment))
+
+        job.segments = []
+        try:
+            context = self.context()
+            # Model arka planda hâlâ yükleniyorsa bekle; yükleme başarısız olduysa iş o hatayla biter
+            while context['model'] is None and context['chunker'] is None and job.prepared['entry'] is None:
+                if context.get('model_error'):
+                    raise RuntimeError(f"{MODEL_ERROR_PREFIX}: {context['model_error']}")
+                job.check_cancelled()
+                time.sleep(0.5)
+                context = self.context()
+            library = context.get('library')
+            with job.activate_recorder():
+                pipeline.transcribe_prepared(
+                    context['model'], job.prepared, cache=context['cache'], model_name=context['model_name'],
+                    on_stage=lambda stage, info=None: self._emit(job, "stage", (stage, info)),
+                    chunker=context['chunker'], on_segment=on_segment,
+                    language_rules=context.get('language_rules')
+                )
+            self._set_status(job, DONE)
+        except JobCancelled:
+            self._set_status(job, CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            print(f"Detaylı hata: {job.error}")
+            self._set_status(job, FAILED)
+        finally:
+            # İptal edilen ya da hata veren işlerin o ana kadarki segmentleri "yarım" olarak kalır
+            if indexer is not None:
+                indexer.finish(job.duration, complete=job.status == DONE)
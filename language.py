@@ -0,0 +1,176 @@
+"""Tam çözümden önce ucuz dil tespiti ve erken çıkış kuralları.
+
+transcribe dil verilmeden çağrıldığında Whisper dili her çağrıda (pencereli
+çözümde her pencerede) yeniden tespit eder ve sonucu kimseyle paylaşmaz.
+Bu ön geçiş, çıkarılmış sesin her yerine yayılmış kısa yoklamalardan en çok
+konuşma içeren birkaçını seçip yüklü modelle dili bir kez tespit eder ve
+yoklamalardan konuşma oranını tahmin eder. Sonuç dosya başına
+~/.speechrecog/languages.db içinde saklanır; tam çözüm language= ile
+sabitlenerek yapılır.
+
+LanguageRules ile istenmeyen dosyalar tam model geçişine girmeden elenir:
+dili izin verilenler arasında olmayanlar atlanır (ya da reroute_model
+ayarlıysa o modelle çözülür), konuşma oranı eşiğin altındakiler atlanır.
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+
+import pipeline
+from cache import TranscriptCache, data_dir, file_fingerprint
+
+
+# Konuşma oranı tahmini için sesin her yerine eşit aralıklarla yayılan yoklamalar
+PROBE_COUNT = 20
+PROBE_SECONDS = 10
+# Dil tespitine bu yoklamalardan en çok konuşma içeren bu kadarı verilir
+DETECT_WINDOWS = 3
+
+TRANSCRIBE = "transcribe"
+SKIP = "skip"
+REROUTE = "reroute"
+
+_default_cache = None
+
+
+class LanguageRules:
+    """Ön geçişin açık olup olmadığı ve tespit sonucuna göre yapılacak iş"""
+
+    def __init__(self, detect=True, languages=(), min_speech_ratio=0.0, reroute_model=None):
+        self.detect = detect
+        self.languages = tuple(languages or ())
+        self.min_speech_ratio = min_speech_ratio
+        self.reroute_model = reroute_model or None
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings['language_detect'], settings['languages'], settings['min_speech_ratio'],
+                   settings['reroute_model'])
+
+    def decide(self, result):
+        """(eylem, gerekçe): TRANSCRIBE, SKIP ya da REROUTE"""
+        if result['speech_ratio'] < self.min_speech_ratio:
+            return SKIP, f"konuşma oranı %{result['speech_ratio'] * 100:.0f} < %{self.min_speech_ratio * 100:.0f}"
+        if self.languages and result['language'] not in self.languages:
+            reason = f"dil {result['language']} ({', '.join(self.languages)} dışında)"
+            return (REROUTE, reason) if self.reroute_model else (SKIP, reason)
+        return TRANSCRIBE, None
+
+
+class LanguageCache:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "languages.db")
+        self.lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS languages ("
+                " key TEXT PRIMARY KEY, language TEXT NOT NULL, probability REAL NOT NULL,"
+                " speech_ratio REAL NOT NULL, created REAL NOT NULL)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self.lock, self._connect() as conn:
+            row = conn.execute("SELECT language, probability, speech_ratio FROM languages WHERE key = ?",
+                               (key,)).fetchone()
+        if row is None:
+            return None
+        return {'language': row[0], 'probability': row[1], 'speech_ratio': row[2]}
+
+    def put(self, key, result):
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO languages(key, language, probability, speech_ratio, created)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, result['language'], result['probability'], result['speech_ratio'], time.time())
+            )
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LanguageCache()
+    return _default_cache
+
+
+def sample_probes(audio, count=PROBE_COUNT, probe_seconds=PROBE_SECONDS):
+    """Sesin her yerine eşit aralıklarla yayılmış kısa yoklamalar; her biri (konuşma oranı, ses)"""
+    from vad import detect_speech
+
+    probe = int(probe_seconds * pipeline.SAMPLE_RATE)
+    if len(audio) <= probe * count:
+        starts = range(0, max(1, len(audio)), probe)
+    else:
+        step = (len(audio) - probe) / (count - 1)
+        starts = [int(index * step) for index in range(count)]
+    probes = []
+    for start in starts:
+        window = audio[start:start + probe]
+        if len(window) == 0:
+            continue
+        speech = sum(end - begin for begin, end in detect_speech(window))
+        probes.append((speech / len(window), window))
+    return probes
+
+
+def detect_language(model, windows):
+    """Pencerelerin dil olasılıklarının ortalamasından (dil, olasılık)"""
+    import whisper
+
+    totals = {}
+    for window in windows:
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(window), model.dims.n_mels).to(model.device)
+        _, probabilities = model.detect_language(mel)
+        for language, probability in probabilities.items():
+            totals[language] = totals.get(language, 0.0) + probability
+    language = max(totals, key=totals.get)
+    return language, totals[language] / len(windows)
+
+
+def prepass_key(prepared, model_name):
+    return TranscriptCache.make_key(file_fingerprint(prepared['source']), model_name,
+                                    {'language_prepass': True, 'vad': prepared['mapping'] is not None})
+
+
+def run_prepass(model, prepared, model_name, cache=None):
+    """Dosyanın dilini ve konuşma oranını (önbellekten ya da tespit ederek) döndürür.
+
+    {'language', 'probability', 'speech_ratio', 'cached'} sözlüğü; model çok
+    dilli değilse ya da ses dizi olarak hazır değilse None.
+    """
+    samples = prepared['samples']
+    if not getattr(model, 'is_multilingual', False) or samples is None or isinstance(samples, str):
+        return None
+    key = prepass_key(prepared, model_name) if cache is not None and prepared['source'] else None
+    if key is not None:
+        result = cache.get(key)
+        if result is not None:
+            result['cached'] = True
+            return result
+
+    probes = sample_probes(samples)
+    if not probes:
+        return None
+    vad_stats = prepared['vad_stats']
+    if vad_stats is not None:
+        # Ses zaten VAD'den geçti; oran özgün sesten hesaplanmış istatistikten gelir
+        speech_ratio = 1.0 - vad_stats['skipped_ratio']
+    else:
+        speech_ratio = sum(ratio * len(window) for ratio, window in probes) / sum(len(window) for _, window in probes)
+    windows = [window for _, window in sorted(probes, key=lambda item: item[0], reverse=True)[:DETECT_WINDOWS]]
+    language, probability = detect_language(model, windows)
+    result = {'language': language, 'probability': probability, 'speech_ratio': speech_ratio}
+    if key is not None:
+        cache.put(key, result)
+    result['cached'] = False
+    return result
@@ -0,0 +1,251 @@
+"""Aranabilir transkript kütüphanesi.
+
+Tamamlanan (ve yarıda kalan) her işin segmentleri ~/.speechrecog/library.db
+içindeki SQLite veritabanına segment başına bir satır (dosya, başlangıç,
+bitiş, metin) olarak yazılır. Metin, segments tablosuna tetikleyicilerle bağlı
+bir FTS5 diziniyle aranır; binlerce saatlik kayıtta "şu söz nerede geçti"
+sorusu milisaniyeler içinde, zaman koduyla birlikte yanıtlanır. Segmentler
+transkripsiyon sırasında küçük gruplar halinde eklenir; dizin hiçbir zaman
+baştan kurulmaz. Aynı dosya tekrar transkribe edilirse (içerik parmak izine
+göre) eski satırları yenileriyle değiştirilir.
+
+Kullanım:
+    python SpeechRecog.py search "bütçe toplantısı" [--limit 20] [--file kayit]
+    python SpeechRecog.py search --stats
+"""
+import argparse
+import contextlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from cache import data_dir, file_fingerprint
+from pipeline import format_time
+
+
+# İndeksleyici bu kadar segment ya da saniye biriktirince veritabanına yazar
+FLUSH_SEGMENTS = 50
+FLUSH_SECONDS = 2.0
+DEFAULT_LIMIT = 50
+
+
+def match_expression(query):
+    """Kullanıcı sorgusunu güvenli bir FTS5 ifadesine çevirir.
+
+    Tırnak içindeki kısımlar öbek olarak aranır; diğer kelimeler (Türkçe ekler
+    için) önek olarak eşleşir: "toplantı" -> "toplantısı". Tüm terimler geçmeli.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"?|(\S+)', query):
+        text = (phrase or word).replace('"', ' ').strip()
+        if text:
+            terms.append(f'"{text}"' if phrase else f'"{text}"*')
+    return " ".join(terms)
+
+
+class TranscriptLibrary:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "library.db")
+        self.lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " id INTEGER PRIMARY KEY, fingerprint TEXT UNIQUE NOT NULL, path TEXT NOT NULL, name TEXT NOT NULL,"
+                " model TEXT, duration REAL NOT NULL DEFAULT 0, segments INTEGER NOT NULL DEFAULT 0,"
+                " complete INTEGER NOT NULL DEFAULT 0, updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                " id INTEGER PRIMARY KEY, file_id INTEGER NOT NULL, start REAL NOT NULL, end REAL NOT NULL,"
+                " text TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS segments_file ON segments(file_id, start)")
+            self.fts = self._create_fts(conn)
+
+    def _create_fts(self, conn):
+        """FTS5 dizinini ve senkron tutan tetikleyicileri kur; FTS5 yoksa LIKE aramasına düş"""
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5("
+                " text, content='segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 kullanılamıyor, arama yavaş olacak: {e}")
+            return False
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN"
+            " INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text); END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN"
+            " INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text); END"
+        )
+        return True
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def begin(self, path, model_name=None, fingerprint=None):
+        """Dosya için kayıt aç (varsa eski segmentlerini sil) ve dosya kimliğini döndür"""
+        fingerprint = fingerprint or file_fingerprint(path)
+        with self.lock, self._connect() as conn:
+            row = conn.execute("SELECT id FROM files WHERE fingerprint = ?", (fingerprint,)).fetchone()
+            if row is None:
+                cursor = conn.execute(
+                    "INSERT INTO files(fingerprint, path, name, model, updated) VALUES (?, ?, ?, ?, ?)",
+                    (fingerprint, os.path.abspath(path), os.path.basename(path), model_name, time.time())
+                )
+                return cursor.lastrowid
+            file_id = row[0]
+            conn.execute("DELETE FROM segments WHERE file_id = ?", (file_id,))
+            conn.execute(
+                "UPDATE files SET path = ?, name = ?, model = ?, duration = 0, segments = 0, complete = 0,"
+                " updated = ? WHERE id = ?",
+                (os.path.abspath(path), os.path.basename(path), model_name, time.time(), file_id)
+            )
+            return file_id
+
+    def add_segments(self, file_id, segments):
+        rows = [(file_id, segment.get('start', 0), segment.get('end', 0), segment.get('text', '').strip())
+                for segment in segments]
+        rows = [row for row in rows if row[3]]
+        if not rows:
+            return
+        with self.lock, self._connect() as conn:
+            conn.executemany("INSERT INTO segments(file_id, start, end, text) VALUES (?, ?, ?, ?)", rows)
+            conn.execute("UPDATE files SET segments = segments + ?, updated = ? WHERE id = ?",
+                         (len(rows), time.time(), file_id))
+
+    def finish(self, file_id, duration=0.0, complete=True):
+        with self.lock, self._connect() as conn:
+            conn.execute("UPDATE files SET duration = ?, complete = ?, updated = ? WHERE id = ?",
+                         (duration, int(complete), time.time(), file_id))
+
+    def indexer(self, path, model_name=None):
+        return LibraryIndexer(self, path, model_name)
+
+    def index_file(self, path, segments, model_name=None, duration=0.0):
+        """Bitmiş bir transkripti tek seferde ekle (toplu mod)"""
+        file_id = self.begin(path, model_name)
+        self.add_segments(file_id, segments)
+        self.finish(file_id, duration)
+
+    def search(self, query, limit=DEFAULT_LIMIT, name=None):
+        """Eşleşen segmentler: {'file_id', 'path', 'name', 'start', 'end', 'text', 'complete'} listesi"""
+        columns = "f.id, f.path, f.name, s.start, s.end, s.text, f.complete"
+        name_filter = " AND f.name LIKE ?" if name else ""
+        name_args = (f"%{name}%",) if name else ()
+        with self.lock, self._connect() as conn:
+            if self.fts:
+                expression = match_expression(query)
+                if not expression:
+                    return []
+                rows = conn.execute(
+                    f"SELECT {columns} FROM segments_fts JOIN segments s ON s.id = segments_fts.rowid"
+                    f" JOIN files f ON f.id = s.file_id WHERE segments_fts MATCH ?{name_filter}"
+                    " ORDER BY rank LIMIT ?", (expression,) + name_args + (limit,)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM segments s JOIN files f ON f.id = s.file_id"
+                    f" WHERE s.text LIKE ?{name_filter} ORDER BY f.name, s.start LIMIT ?",
+                    (f"%{query.strip()}%",) + name_args + (limit,)
+                ).fetchall()
+        return [{'file_id': file_id, 'path': path, 'name': file_name, 'start': start, 'end': end, 'text': text,
+                 'complete': bool(complete)} for file_id, path, file_name, start, end, text, complete in rows]
+
+    def file_segments(self, file_id):
+        with self.lock, self._connect() as conn:
+            rows = conn.execute("SELECT start, end, text FROM segments WHERE file_id = ? ORDER BY start",
+                                (file_id,)).fetchall()
+        return [{'start': start, 'end': end, 'text': text} for start, end, text in rows]
+
+    def stats(self):
+        with self.lock, self._connect() as conn:
+            files, seconds, segments = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(duration), 0), COALESCE(SUM(segments), 0) FROM files"
+            ).fetchone()
+        return {'files': files, 'seconds': seconds, 'segments': segments,
+                'bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0}
+
+
+class LibraryIndexer:
+    """Bir işin segmentlerini geldikçe küçük gruplar halinde kütüphaneye yazar.
+
+    Kütüphane hataları transkripsiyonu durdurmaz; yalnızca yazdırılır.
+    """
+
+    def __init__(self, library, path, model_name=None):
+        self.library = library
+        self.pending = []
+        self.last_flush = time.monotonic()
+        try:
+            self.file_id = library.begin(path, model_name)
+        except Exception as e:
+            print(f"Kütüphane kaydı açılamadı: {e}")
+            self.file_id = None
+
+    def add(self, segment):
+        if self.file_id is None:
+            return
+        self.pending.append(segment)
+        if len(self.pending) >= FLUSH_SEGMENTS or time.monotonic() - self.last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        segments, self.pending = self.pending, []
+        self.last_flush = time.monotonic()
+        try:
+            self.library.add_segments(self.file_id, segments)
+        except Exception as e:
+            print(f"Segmentler kütüphaneye yazılamadı: {e}")
+
+    def finish(self, duration=0.0, complete=True):
+        if self.file_id is None:
+            return
+        self.flush()
+        try:
+            self.library.finish(self.file_id, duration, complete)
+        except Exception as e:
+            print(f"Kütüphane kaydı kapatılamadı: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="SpeechRecog.py search", description="Transkript kütüphanesinde arar.")
+    parser.add_argument('query', nargs='?', default="", help="Aranacak kelimeler (tırnak içinde öbek)")
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help="En fazla sonuç sayısı")
+    parser.add_argument('--file', default=None, help="Yalnızca adında bu metin geçen dosyalarda ara")
+    parser.add_argument('--stats', action='store_true', help="Kütüphane boyutunu göster")
+    args = parser.parse_args(argv)
+
+    library = TranscriptLibrary()
+    if args.stats:
+        stats = library.stats()
+        print(f"Dosya: {stats['files']}  Ses: {stats['seconds'] / 3600:.1f} saat  Segment: {stats['segments']}"
+              f"  Boyut: {stats['bytes'] / (1024 * 1024):.1f} MB")
+        return 0
+    if not args.query.strip():
+        parser.error("aranacak metin gerekli")
+
+    started = time.perf_counter()
+    results = library.search(args.query, limit=args.limit, name=args.file)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for result in results:
+        partial = " (yarım)" if not result['complete'] else ""
+        print(f"{result['name']}{partial}  [{format_time(result['start']).split(',')[0]}]  {result['text']}")
+    print(f"{len(results)} sonuç, {elapsed_ms:.0f} ms")
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Arka planda çalışan, diskte önbelleklenen thumbnail ve medya bilgisi yoklaması.
+
+Seçilen her dosya için tek ffprobe çağrısıyla süre, kap, video/ses codec'i ve
+ses izi bilgisi toplanır; dosyanın başındaki (çoğu zaman siyah) kare yerine
+sürenin ~%10'undaki bir anahtar kareden küçük bir PNG thumbnail üretilir.
+Sonuçlar ~/.speechrecog/media_info altında yol + değişiklik zamanı + boyuttan
+türetilen anahtarla saklanır; aynı dosya tekrar açıldığında hiçbir şey
+çözülmez. Tk ana thread'i hiç beklemez: probe_async sonucu geri çağrıyla verir.
+"""
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import pipeline
+from cache import data_dir
+
+
+THUMBNAIL_WIDTH = 200
+THUMBNAIL_HEIGHT = 150
+# Önbellekte tutulan en fazla dosya sayısı (en eski kullanılanlar silinir)
+MAX_ENTRIES = 500
+
+_executor = None
+
+
+def cache_dir():
+    path = os.path.join(data_dir(), "media_info")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_key(path, stat):
+    payload = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def thumbnail_time(duration):
+    """Temsil edici kare zamanı: sürenin %10'u, 1 ile 60 sn arasında"""
+    if not duration or duration < 2:
+        return 0.0
+    return min(max(duration * 0.1, 1.0), 60.0, duration / 2)
+
+
+def render_thumbnail(path, output_path, seconds):
+    """ffmpeg ile hedef zamandan önceki anahtar kareye atlayıp yalnızca anahtar kareleri çözerek PNG üretir"""
+    cmd = [
+        pipeline.ffmpeg_binary(), "-nostdin", "-loglevel", "error", "-y",
+        "-skip_frame", "nokey", "-ss", f"{seconds:.3f}", "-i", path,
+        "-map", "0:v:0", "-frames:v", "1",
+        "-vf", f"scale={THUMBNAIL_WIDTH}:{THUMBNAIL_HEIGHT}:force_original_aspect_ratio=decrease",
+        output_path,
+    ]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=60)
+        return proc.returncode == 0 and os.path.exists(output_path)
+    except Exception as e:
+        print(f"ffmpeg ile thumbnail üretilemedi: {e}")
+        return False
+
+
+def render_thumbnail_cv2(path, output_path, seconds):
+    """ffmpeg başarısız olursa OpenCV ile aynı zamana atlayıp kareyi küçültür"""
+    try:
+        import cv2
+    except ImportError:
+        return False
+    cap = cv2.VideoCapture(path)
+    try:
+        cap.set(cv2.CAP_PROP_POS_MSEC, seconds * 1000)
+        ret, frame = cap.read()
+        if not ret:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = cap.read()
+    finally:
+        cap.release()
+    if not ret:
+        return False
+    height, width = frame.shape[:2]
+    ratio = min(THUMBNAIL_WIDTH / width, THUMBNAIL_HEIGHT / height, 1.0)
+    if ratio < 1.0:
+        frame = cv2.resize(frame, (int(width * ratio), int(height * ratio)), interpolation=cv2.INTER_AREA)
+    return bool(cv2.imwrite(output_path, frame))
+
+
+def prune(directory, keep=MAX_ENTRIES):
+    """Önbellekte keep'ten fazla kayıt varsa en eski kullanılanları sil"""
+    entries = [name for name in os.listdir(directory) if name.endswith(".json")]
+    if len(entries) <= keep:
+        return
+    entries.sort(key=lambda name: os.path.getmtime(os.path.join(directory, name)))
+    for name in entries[:len(entries) - keep]:
+        for suffix in (".json", ".png"):
+            try:
+                os.remove(os.path.join(directory, name[:-5] + suffix))
+            except OSError:
+                pass
+
+
+def probe(path):
+    """Dosyanın bilgisini (önbellekten ya da yoklayarak) döndürür.
+
+    {'path', 'name', 'size', 'duration', 'format', 'video', 'audio',
+    'audio_tracks', 'thumbnail' (PNG yolu ya da None), 'cached'} sözlüğü.
+    """
+    stat = os.stat(path)
+    directory = cache_dir()
+    key = cache_key(path, stat)
+    info_path = os.path.join(directory, f"{key}.json")
+    thumbnail_path = os.path.join(directory, f"{key}.png")
+
+    if os.path.exists(info_path):
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            os.utime(info_path)  # en son kullanılma zamanı (prune için)
+            if info['thumbnail'] and not os.path.exists(info['thumbnail']):
+                info['thumbnail'] = None
+            info['path'] = path
+            info['cached'] = True
+            return info
+        except Exception:
+            pass
+
+    metadata = pipeline.probe_media(path) or {}
+    info = {
+        'path': path,
+        'name': os.path.basename(path),
+        'size': stat.st_size,
+        'duration': metadata.get('duration', 0.0),
+        'format': metadata.get('format'),
+        'video': metadata.get('video'),
+        'audio': metadata.get('audio'),
+        'audio_tracks': metadata.get('audio_tracks', 0),
+        'thumbnail': None,
+    }
+    # ffprobe yoksa video olup olmadığı bilinmez; yine de thumbnail denenir
+    if metadata.get('has_video', True):
+        seconds = thumbnail_time(info['duration'])
+        if render_thumbnail(path, thumbnail_path, seconds) or render_thumbnail_cv2(path, thumbnail_path, seconds):
+            info['thumbnail'] = thumbnail_path
+
+    info['cached'] = False
+    if not metadata and not info['thumbnail']:
+        return info  # Yoklanamadı (ffprobe/ffmpeg yok ya da dosya okunamadı): önbelleğe yazma
+
+    try:
+        with open(info_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(info, f, ensure_ascii=False)
+        os.replace(info_path + ".tmp", info_path)
+        prune(directory)
+    except Exception as e:
+        print(f"Medya bilgisi önbelleğe yazılamadı: {e}")
+    return info
+
+
+def probe_async(path, callback):
+    """Yoklamayı arka plan thread'inde yapar; callback(bilgi, hata) o thread'den çağrılır"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="media_info")
+
+    def run():
+        try:
+            callback(probe(path), None)
+        except Exception as e:
+            callback({'path': path, 'name': os.path.basename(path)}, e)
+
+    return _executor.submit(run)
+
+
+def describe(info):
+    """Arayüzde gösterilecek kısa bilgi satırları"""
+    lines = [f"Boyut: {info.get('size', 0) / (1024 * 1024):.1f} MB"]
+    details = []
+    if info.get('duration'):
+        details.append(pipeline.format_time(info['duration']).split(',')[0])
+    video = info.get('video')
+    if video:
+        details.append(f"{video['codec']} {video['width']}x{video['height']}")
+    audio = info.get('audio')
+    if audio:
+        tracks = f", {info['audio_tracks']} ses izi" if info.get('audio_tracks', 0) > 1 else ""
+        details.append(f"{audio['codec']} {audio['sample_rate'] // 1000} kHz {audio['channels']} kanal{tracks}")
+    elif info.get('format'):
+        details.append("ses izi yok")
+    if details:
+        lines.append(" · ".join(details))
+    return lines
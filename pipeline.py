@@ -0,0 +1,576 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from backends import DEFAULT_BACKEND, apply_backend
+from cache import TranscriptCache, audio_fingerprint, file_fingerprint
+from instrument import instrument_model, stage as timed_stage
+
+# Not: numpy, whisper (torch) ve moviepy ağır modüllerdir; arayüzün hızlı açılması
+# için yalnızca kullanıldıkları fonksiyonların içinde içe aktarılırlar.
+
+
+DEFAULT_MODEL = "turbo"
+
+# Süreç içi model kaydı: aynı model ikinci kez diskten yüklenmez.
+# Bellek için en fazla bu kadar model aynı anda tutulur (en eski kullanılan çıkarılır).
+MAX_LOADED_MODELS = 2
+_model_registry = OrderedDict()
+_model_lock = threading.Lock()
+
+# Whisper'ın beklediği örnekleme hızı
+SAMPLE_RATE = 16000
+
+# Ses hazırlama yolu: "memory" sesi doğrudan belleğe çözer, "wav" eski geçici WAV yoludur.
+# İki yolu karşılaştırmak için ayarlardan (SPEECHRECOG_AUDIO_MODE) seçilebilir.
+AUDIO_MODE_MEMORY = "memory"
+AUDIO_MODE_WAV = "wav"
+AUDIO_MODES = (AUDIO_MODE_MEMORY, AUDIO_MODE_WAV)
+DEFAULT_AUDIO_MODE = AUDIO_MODE_MEMORY
+
+# transcribe'a verilen çözme seçenekleri; önbellek anahtarının da parçasıdır.
+# fp16=False, çoğu CPU için daha kararlı çalışır.
+TRANSCRIBE_OPTIONS = {'fp16': False}
+
+# Çözüm yolları (decode_mode): tüm ses tek geçişte, sırayla pencere pencere, paralel parçalarla
+SINGLE = "single"
+WINDOWED = "windowed"
+CHUNKED = "chunked"
+
+
+def load_whisper_model(model_name=DEFAULT_MODEL, backend=DEFAULT_BACKEND):
+    """Whisper modelini yükle ve seçilen çıkarım arka ucuna (backends.py) hazırla"""
+    import whisper
+    return instrument_model(apply_backend(whisper.load_model(model_name), backend))
+
+
+def get_model(model_name=DEFAULT_MODEL, backend=DEFAULT_BACKEND):
+    """Modeli süreç içi kayıttan döndür, yoksa yükle.
+
+    (model, yükleme süresi sn) döndürür; model kayıttan geldiyse süre 0'dır.
+    """
+    key = (model_name, backend or DEFAULT_BACKEND)
+    with _model_lock:
+        if key in _model_registry:
+            _model_registry.move_to_end(key)
+            return _model_registry[key], 0.0
+        started = time.perf_counter()
+        model = load_whisper_model(model_name, backend)
+        _model_registry[key] = model
+        while len(_model_registry) > MAX_LOADED_MODELS:
+            _model_registry.popitem(last=False)
+        return model, time.perf_counter() - started
+
+
+def warm_up_imports():
+    """Ağır modülleri önceden içe aktarır (arka plan thread'inde çağrılmak için); süreyi döndürür"""
+    started = time.perf_counter()
+    import numpy  # noqa: F401
+    import whisper  # noqa: F401
+    import moviepy  # noqa: F401
+    return time.perf_counter() - started
+
+
+def limit_torch_threads(num_threads):
+    """Süreç başına torch thread sayısını sınırla (çok süreçli çalışmada aşırı yüklenmeyi önler)"""
+    try:
+        import torch
+        torch.set_num_threads(max(1, int(num_threads)))
+    except Exception as e:
+        print(f"Torch thread sayısı ayarlanamadı: {e}")
+
+
+def ffmpeg_binary():
+    """Kullanılacak ffmpeg yolunu bul (moviepy ile gelen imageio-ffmpeg öncelikli)"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+
+def ffprobe_binary():
+    """ffprobe yolunu bul (önce ffmpeg'in yanında, sonra PATH'te); yoksa None"""
+    ffmpeg = ffmpeg_binary()
+    name = "ffprobe.exe" if os.name == "nt" else "ffprobe"
+    if os.path.dirname(ffmpeg):
+        candidate = os.path.join(os.path.dirname(ffmpeg), name)
+        if os.path.exists(candidate):
+            return candidate
+    return shutil.which("ffprobe")
+
+
+def probe_media(path):
+    """Kabı tek ffprobe çağrısıyla inceler.
+
+    {'format', 'duration', 'has_video', 'video': {'codec', 'width', 'height'} ya da None,
+    'audio': {'index', 'codec', 'sample_rate', 'channels'} ya da None, 'audio_tracks'}
+    döndürür; ffprobe yoksa ya da okuyamazsa None.
+    """
+    ffprobe = ffprobe_binary()
+    if ffprobe is None:
+        return None
+    cmd = [ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", path]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=60)
+        data = json.loads(proc.stdout or b'{}')
+    except Exception:
+        return None
+    if proc.returncode != 0 or 'format' not in data:
+        return None
+
+    streams = data.get('streams', [])
+    audio_streams = [stream for stream in streams if stream.get('codec_type') == "audio"]
+    audio = None
+    if audio_streams:
+        stream = audio_streams[0]
+        audio = {
+            'index': 0,  # ses izleri arasındaki sıra (-map 0:a:0)
+            'codec': stream.get('codec_name'),
+            'sample_rate': int(stream.get('sample_rate') or 0),
+            'channels': int(stream.get('channels') or 0),
+        }
+    # Kapak resmi (attached_pic) gerçek bir video izi sayılmaz
+    video_streams = [stream for stream in streams if stream.get('codec_type') == "video"
+                     and not stream.get('disposition', {}).get('attached_pic')]
+    video = None
+    if video_streams:
+        stream = video_streams[0]
+        video = {
+            'codec': stream.get('codec_name'),
+            'width': int(stream.get('width') or 0),
+            'height': int(stream.get('height') or 0),
+        }
+    return {
+        'format': data['format'].get('format_name', ''),
+        'duration': float(data['format'].get('duration') or 0.0),
+        'has_video': video is not None,
+        'video': video,
+        'audio': audio,
+        'audio_tracks': len(audio_streams),
+    }
+
+
+def is_whisper_ready(probe):
+    """Girdi zaten 16 kHz mono 16-bit PCM WAV mı (çözme gerekmez)"""
+    audio = probe and probe['audio']
+    return bool(audio and probe['format'] == "wav" and not probe['has_video'] and audio['codec'] == "pcm_s16le"
+                and audio['sample_rate'] == SAMPLE_RATE and audio['channels'] == 1)
+
+
+def read_pcm_wav(path):
+    """16 kHz mono 16-bit WAV'ı ffmpeg'e gerek kalmadan float32 diziye okur"""
+    import wave
+    import numpy as np
+    with wave.open(path, 'rb') as f:
+        frames = f.readframes(f.getnframes())
+    return np.frombuffer(frames, np.int16).astype(np.float32) / 32768.0
+
+
+def audio_decode_args(probe=None):
+    """Yalnızca ses izini çözüp tek geçişte 16 kHz monoya indiren ffmpeg çıktı argümanları"""
+    stream = f"0:a:{probe['audio']['index']}" if probe and probe['audio'] else "0:a:0?"
+    return ["-map", stream, "-vn", "-sn", "-dn", "-threads", "0", "-ac", "1", "-ar", str(SAMPLE_RATE)]
+
+
+def decode_audio_to_memory(video_path, probe=None):
+    """Ses izini tek ffmpeg geçişinde 16 kHz mono float32 NumPy dizisine çözer.
+
+    Video kareleri çözülmez (yalnızca ses izi demux edilir); girdi zaten
+    16 kHz mono WAV ise ffmpeg hiç çalıştırılmaz.
+    """
+    probe = probe if probe is not None else probe_media(video_path)
+    if probe is not None and probe['audio'] is None:
+        raise Exception("Videoda ses izi bulunamadı")
+    if is_whisper_ready(probe):
+        return read_pcm_wav(video_path)
+    cmd = [
+        ffmpeg_binary(), "-nostdin", "-loglevel", "error",
+        "-threads", "0", "-i", video_path,
+        *audio_decode_args(probe), "-f", "s16le", "-acodec", "pcm_s16le",
+        "-",
+    ]
+    import numpy as np
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise Exception(f"Ses çözülemedi: {proc.stderr.decode(errors='ignore').strip()}")
+    if not proc.stdout:
+        raise Exception("Videoda ses izi bulunamadı")
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def extract_audio(video_path, mode=None, probe=None):
+    """Sesi transcribe'a verilecek biçimde hazırlar, (ses, süre) döndürür.
+
+    memory modunda ses bir float32 dizisidir; wav modunda (ya da bellek içi
+    çözme başarısız olursa) geçici bir WAV dosyasının yoludur. probe verilmezse
+    dosya burada incelenir.
+    """
+    mode = mode or DEFAULT_AUDIO_MODE
+    probe = probe if probe is not None else probe_media(video_path)
+    if probe is not None and probe['audio'] is None:
+        # Geri dönüş yolları da ses bulamaz; asıl hatayı onların hatasıyla örtme
+        raise Exception("Videoda ses izi bulunamadı")
+    if mode == AUDIO_MODE_MEMORY:
+        try:
+            audio = decode_audio_to_memory(video_path, probe)
+            return audio, len(audio) / SAMPLE_RATE
+        except Exception as e:
+            print(f"Bellek içi çözme başarısız, WAV yoluna dönülüyor: {e}")
+    return extract_audio_wav(video_path, probe)
+
+
+def extract_audio_wav(video_path, probe=None):
+    """Videodan geçici bir WAV dosyası çıkarır, (yol, süre) döndürür."""
+    temp_dir = tempfile.gettempdir()
+    # Dosya adını daha benzersiz hale getirelim (aynı anda çalışan süreçler çakışmasın)
+    base_name = os.path.basename(video_path)
+    audio_filename = f"temp_audio_{os.path.splitext(base_name)[0]}_{os.getpid()}.wav"
+    audio_path = os.path.join(temp_dir, audio_filename)
+
+    # Önce ffmpeg ile doğrudan 16 kHz mono WAV; olmazsa moviepy'nin genel okuyucusu
+    cmd = [
+        ffmpeg_binary(), "-nostdin", "-loglevel", "error", "-y",
+        "-threads", "0", "-i", video_path,
+        *audio_decode_args(probe), "-acodec", "pcm_s16le",
+        audio_path,
+    ]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode == 0 and os.path.exists(audio_path):
+            return audio_path, os.path.getsize(audio_path) / (2 * SAMPLE_RATE)
+    except Exception as e:
+        print(f"ffmpeg ile WAV çıkarılamadı, moviepy deneniyor: {e}")
+
+    from moviepy import AudioFileClip
+    with AudioFileClip(video_path) as audio_clip:
+        duration = audio_clip.duration or 0.0
+        audio_clip.write_audiofile(audio_path, logger=None, codec='pcm_s16le')
+
+    if not os.path.exists(audio_path):
+        raise Exception("Ses dosyası oluşturulamadı")
+
+    return audio_path, duration
+
+
+def decode_options(language=None):
+    """transcribe'a verilecek seçenekler; language verilirse Whisper dili yeniden tespit etmez"""
+    options = dict(TRANSCRIBE_OPTIONS)
+    if language:
+        options['language'] = language
+    return options
+
+
+def transcribe_audio(model, audio, language=None):
+    """Sesi (dosya yolu ya da float32 dizi) transkribe eder, segment listesini döndürür."""
+    result = model.transcribe(audio, **decode_options(language))
+    return result.get('segments', [{'start': 0, 'end': 0, 'text': result.get('text', '')}])
+
+
+def remove_temp_audio(audio_path):
+    """Geçici ses dosyasını güvenli şekilde sil (bellek içi seste bir şey yapmaz)"""
+    if isinstance(audio_path, str) and os.path.exists(audio_path):
+        try:
+            os.remove(audio_path)
+        except Exception as e_del:
+            print(f"Geçici ses dosyası silinemedi: {e_del}")
+
+
+def transcribe_options(vad=False, backend=DEFAULT_BACKEND, language_detect=False):
+    """Sonucu etkileyen seçenekler (önbellek anahtarına katılır; çözüm yolununkiler decode_mode'dan gelir)"""
+    options = dict(TRANSCRIBE_OPTIONS)
+    if backend and backend != DEFAULT_BACKEND:
+        options['backend'] = backend
+    if vad:
+        options['vad'] = True
+    if language_detect:
+        # Önceden tespit edilen dile sabitlenmiş çözüm, pencere başına tespitten farklı sonuç verebilir
+        options['language_detect'] = True
+    return options
+
+
+def decode_mode(seconds, chunker=None, pool_only=False, streaming=False, checkpoint=False, in_memory=True):
+    """Sesin hangi yoldan çözüleceği: (SINGLE/WINDOWED/CHUNKED, önbellek anahtarına katılan seçenekler).
+
+    Tek geçiş, 120 sn'lik pencereler ve paralel parçalar aynı sese farklı
+    transkript verir; bu yüzden yol önbellek anahtarına katılır. Akış
+    (on_segment) ve checkpoint yolu aynı pencerelerle çözdüğünden ikisi de
+    WINDOWED sayılır. Parçalama seçenekleri yalnızca parçalı yol gerçekten
+    çalışacaksa eklenir. Karar özgün ses süresine (VAD öncesi) göre verilir.
+    """
+    if chunker is not None and (pool_only or chunker.should_chunk(seconds)):
+        return CHUNKED, dict(chunker.options(), decode=CHUNKED)
+    if in_memory:
+        from checkpoint import should_checkpoint
+        if streaming or (checkpoint and should_checkpoint(seconds)):
+            return WINDOWED, {'decode': WINDOWED}
+    return SINGLE, {}
+
+
+def cache_keys(prepared, model_name, mode_options):
+    """Hazırlanan girdinin parmak izlerinden (dosya, çözülmüş ses) verilen çözüm yoluyla önbellek anahtarları"""
+    options = dict(prepared['options'], **mode_options)
+    return [TranscriptCache.make_key(fingerprint, model_name, options) for fingerprint in prepared['fingerprints']]
+
+
+def prepare_media(video_path, audio_mode=None, cache=None, model_name=DEFAULT_MODEL, options=None,
+                  vad=False, as_array=False, on_stage=None, language_rules=None,
+                  chunker=None, streaming=False, checkpoint=True, pool_only=False):
+    """Transkripsiyon öncesi (G/Ç ve ffmpeg ağırlıklı) aşama.
+
+    Önbelleğe bakar, sesi çıkarır ve gerekirse VAD uygular. Dönen sözlük
+    transcribe_prepared'a verilir; iş bitince release_media ile temizlenmelidir.
+    Önbellekte sonuç varsa sözlüğün 'entry' alanı doludur ve ses çıkarılmaz;
+    kaydın dili language_rules'a göre başka modele yönlendirilecekse kayıt
+    kullanılmaz ve ses yine çıkarılır. chunker, streaming (on_segment
+    verilecek mi), checkpoint ve pool_only (model yok, her şey parça
+    havuzunda) transcribe_prepared'a verilecek değerlerdir; anahtardaki çözüm
+    yolunu (decode_mode) belirler. Her çağrı önbellekte tek isabet ya da ıska sayılır.
+    """
+    def stage(name, info=None):
+        if on_stage:
+            on_stage(name, info)
+
+    def usable(entry):
+        if entry is None:
+            return False
+        if language_rules is None or not language_rules.detect or not entry.get('language'):
+            return True
+        import language as prepass
+        return language_rules.decide(entry['language'])[0] != prepass.REROUTE
+
+    options = options if options is not None else transcribe_options(vad=vad)
+    in_memory = as_array or vad or (audio_mode or DEFAULT_AUDIO_MODE) == AUDIO_MODE_MEMORY
+    prepared = {'audio': None, 'samples': None, 'mapping': None, 'duration': 0.0, 'fingerprints': [],
+                'options': options, 'entry': None, 'source': video_path, 'vad_stats': None}
+    tried = set()
+
+    def keys(seconds):
+        mode_options = decode_mode(seconds, chunker, pool_only, streaming, checkpoint and bool(video_path),
+                                   in_memory)[1]
+        return cache_keys(prepared, model_name, mode_options)
+
+    def lookup(seconds):
+        """Anahtarlardan birinde kullanılabilir kayıt varsa onu döndürür (isabet/ıska burada sayılmaz)"""
+        for key in keys(seconds):
+            if key in tried:
+                continue
+            tried.add(key)
+            entry = cache.get(key, count=False)
+            if usable(entry):
+                return entry
+        return None
+
+    probe = None
+    if cache is not None:
+        with timed_stage("cache"):
+            prepared['fingerprints'].append(file_fingerprint(video_path))
+            # Çözüm yolu süreye bağlı; ses çıkarılmadan süre kaptan okunur (ıskada çıkarma da bunu kullanır)
+            probe = probe_media(video_path)
+            entry = lookup(probe['duration']) if probe is not None else None
+        if entry is not None:
+            cache.record_lookup(True)
+            stage("cache_hit")
+            prepared['entry'] = entry
+            return prepared
+
+    try:
+        stage("extract")
+        started = time.perf_counter()
+        with timed_stage("extract"):
+            audio, duration = extract_audio(video_path, mode=audio_mode, probe=probe)
+        prepared['audio'], prepared['duration'] = audio, duration
+        stage("extracted", {'seconds': time.perf_counter() - started, 'duration': duration,
+                            'bytes': os.path.getsize(video_path)})
+        if cache is not None:
+            with timed_stage("cache"):
+                if not isinstance(audio, str):
+                    prepared['fingerprints'].append(audio_fingerprint(audio))
+                # Kaptaki süre çözülen sesten farklı bir yol seçtirdiyse dosya anahtarına da yeniden bakılır
+                entry = lookup(duration)
+            cache.record_lookup(entry is not None)
+            if entry is not None:
+                stage("cache_hit")
+                for key in keys(duration):
+                    cache.put(key, model_name, entry['segments'], entry['duration'], entry.get('language'))
+                prepared['entry'] = entry
+                release_media(prepared)
+                return prepared
+
+        samples = audio
+        if isinstance(audio, str) and (vad or as_array):
+            import whisper
+            with timed_stage("extract"):
+                samples = whisper.load_audio(audio)
+        if vad:
+            from vad import apply_vad
+            with timed_stage("vad"):
+                samples, prepared['mapping'], prepared['vad_stats'] = apply_vad(samples)
+            stage("vad", prepared['vad_stats'])
+        prepared['samples'] = samples
+        return prepared
+    except Exception:
+        release_media(prepared)
+        raise
+
+
+def release_media(prepared):
+    """prepare_media'nın tuttuğu sesi ve geçici dosyayı bırak"""
+    remove_temp_audio(prepared['audio'])
+    prepared['audio'] = prepared['samples'] = None
+
+
+def transcribe_prepared(model, prepared, cache=None, model_name=DEFAULT_MODEL, on_stage=None,
+                        chunker=None, on_segment=None, checkpoint=True, language_rules=None):
+    """Transkripsiyon (işlemci ağırlıklı) aşaması; (segmentler, ses süresi) döndürür.
+
+    checkpoint=True ise uzun sesler pencere pencere günlüğe yazılarak çözülür ve
+    yarıda kalmış bir işin günlüğü varsa kaldığı yerden devam edilir (checkpoint.py).
+    language_rules (language.LanguageRules) verilirse önce dil tespit edilip tam
+    çözüm o dile sabitlenir; kurallara uymayan dosya atlanır (segmentsiz döner ve
+    önbelleğe yazılmaz) ya da başka modele yönlendirilir. Karar "language"
+    aşamasının bilgisindedir ('action', 'reason'). Önbellekten dönülen sonuçlara
+    da kayıtla saklanan dil üzerinden aynı kurallar uygulanır.
+    """
+    entry = prepared['entry']
+    if entry is not None:
+        if language_rules is not None and language_rules.detect and entry.get('language'):
+            import language as prepass
+            action, reason = language_rules.decide(entry['language'])
+            if on_stage:
+                on_stage("language", dict(entry['language'], cached=True, action=action, reason=reason))
+            if action == prepass.SKIP:
+                return [], entry['duration']
+        return replay_segments(entry, on_segment)
+
+    if on_stage:
+        on_stage("transcribe", {'duration': prepared['duration']})
+    from checkpoint import iter_checkpointed_segments, should_checkpoint
+    samples, mapping = prepared['samples'], prepared['mapping']
+    segments = []
+    # Dil tespiti "transcribe" aşamasının içinde ölçülür (rapordaki decode = transcribe - language_detection)
+    with timed_stage("transcribe"):
+        language = None
+        detected = None
+        checkpoint_model = model_name
+        if language_rules is not None and language_rules.detect and model is not None:
+            import language as prepass
+            result = prepass.run_prepass(model, prepared, model_name,
+                                         cache=prepass.default_cache() if cache is not None else None)
+            if result is not None:
+                language = result['language']
+                detected = {field: result[field] for field in ('language', 'probability', 'speech_ratio')}
+                action, reason = language_rules.decide(result)
+                if on_stage:
+                    on_stage("language", dict(result, action=action, reason=reason))
+                if action == prepass.SKIP:
+                    return [], prepared['duration']
+                if action == prepass.REROUTE:
+                    model, _ = get_model(language_rules.reroute_model, prepared['options'].get('backend', DEFAULT_BACKEND))
+                    # Yönlendirilen sonuç bu modelin önbellek anahtarlarına yazılmamalı
+                    cache, chunker = None, None
+                    checkpoint_model = language_rules.reroute_model
+                    if not getattr(model, 'is_multilingual', True):
+                        language = None
+
+        duration = prepared['duration']
+        mode, mode_options = decode_mode(duration, chunker, model is None, on_segment is not None,
+                                         checkpoint and bool(prepared['source']), not isinstance(samples, str))
+        if mapping is not None and len(samples) == 0:
+            stream = []
+        elif mode == CHUNKED:
+            stream = chunker.iter_transcribe(samples, language)
+        elif mode == WINDOWED and checkpoint and prepared['source'] and should_checkpoint(duration):
+            # Yönlendirilen çözümün günlüğü özgün modelinkiyle karışmamalı
+            fingerprint = (prepared['fingerprints'] or [file_fingerprint(prepared['source'])])[0]
+            key = TranscriptCache.make_key(fingerprint, checkpoint_model, dict(prepared['options'], **mode_options))
+            stream = iter_checkpointed_segments(model, samples, key, on_stage=on_stage, language=language)
+        elif mode == WINDOWED:
+            from chunked import iter_window_segments
+            stream = iter_window_segments(model, samples, language=language)
+        else:
+            stream = transcribe_audio(model, samples, language)
+
+        if mapping is not None:
+            from vad import remap_segments
+        for segment in stream:
+            if mapping is not None:
+                segment = remap_segments([segment], mapping)[0]
+            segments.append(segment)
+            if on_segment is not None:
+                on_segment(segment)
+    if cache is not None:
+        with timed_stage("cache"):
+            for key in cache_keys(prepared, model_name, mode_options):
+                cache.put(key, model_name, segments, prepared['duration'], detected)
+    return segments, prepared['duration']
+
+
+def transcribe_file(model, video_path, audio_mode=None, cache=None, model_name=DEFAULT_MODEL, on_stage=None,
+                    chunker=None, vad=False, on_segment=None, backend=DEFAULT_BACKEND, language_rules=None):
+    """Ses çıkarma + transkripsiyon; (segmentler, ses süresi) döndürür.
+
+    cache verilirse önce dosya parmak izine, ıskada da çözülmüş sesin özetine
+    bakılır; sonuç iki anahtarla da saklanır. on_stage(aşama, bilgi) her aşamada
+    "extract", "extracted" (süre ve boyutla), "vad", "transcribe", "language"
+    (tespit edilen dil, konuşma oranı ve kural kararıyla), "resume" ya da
+    "cache_hit" ile çağrılır. chunker
+    (chunked.ChunkedTranscriber) verilirse uzun sesler parçalanıp paralel işlenir;
+    model None ise tüm sesler bu havuzda transkribe edilir. vad=True ise yalnızca
+    konuşma bölgeleri modele verilir ("vad" aşamasının bilgisi atlanan sesi içerir).
+    on_segment verilirse ses pencere pencere çözülür ve her segment (özgün zaman
+    çizelgesinde) hazır olur olmaz bu fonksiyona iletilir; "transcribe" aşamasının
+    bilgisi toplam süreyi içerir, ilerleme segment['end'] / süre ile hesaplanabilir.
+    backend, modelin yüklendiği arka uçtur; yalnızca önbellek anahtarını ayırmak için kullanılır.
+    language_rules için transcribe_prepared'a bakın.
+    """
+    language_detect = language_rules is not None and language_rules.detect
+    prepared = prepare_media(
+        video_path, audio_mode=audio_mode, cache=cache, model_name=model_name,
+        options=transcribe_options(vad, backend, language_detect), vad=vad,
+        as_array=chunker is not None or on_segment is not None or language_detect,
+        on_stage=on_stage, language_rules=language_rules,
+        chunker=chunker, streaming=on_segment is not None, pool_only=model is None
+    )
+    try:
+        return transcribe_prepared(model, prepared, cache=cache, model_name=model_name, on_stage=on_stage,
+                                   chunker=chunker, on_segment=on_segment, language_rules=language_rules)
+    finally:
+        release_media(prepared)
+
+
+def replay_segments(entry, on_segment=None):
+    """Önbellekten gelen sonucu canlı akışla aynı şekilde segment segment iletir"""
+    if on_segment is not None:
+        for segment in entry['segments']:
+            on_segment(segment)
+    return entry['segments'], entry['duration']
+
+
+def format_time(seconds):
+    """Zamanı saat:dakika:saniye,milisaniye formatına dönüştürür."""
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    milliseconds = int((seconds - int(seconds)) * 1000)
+    return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02},{milliseconds:03}"
+
+
+def format_segments(segments):
+    """Segmentlerden (zaman kodlu metin, temiz metin) üretir."""
+    timecoded_lines = []
+    clean_parts = []
+    with timed_stage("format"):
+        for segment in segments:
+            text = segment.get('text', '').strip()
+            if not text:
+                continue
+            start_time = format_time(segment.get('start', 0))
+            end_time = format_time(segment.get('end', 0))
+            timecoded_lines.append(f"[{start_time} --> {end_time}] {text}\n")
+            clean_parts.append(text)
+    return "".join(timecoded_lines), " ".join(clean_parts)
@@ -0,0 +1,507 @@
+"""Yerel transkripsiyon servisi (HTTP) ve istekler arası toplu çözme.
+
+Tek bir güçlü makinede herkesin kullanacağı paylaşımlı servis: model bir kez
+yüklenir, gelen her işin sesi ~30 saniyelik pencerelere bölünür ve farklı
+isteklerden gelen pencereler tek bir toplu (batch) whisper.decode çağrısında
+çözülür. Böylece her dosya için ayrı transcribe döngüsü yerine model her
+adımda birden çok pencereyi birlikte işler.
+
+Uç noktalar:
+    POST /jobs              {"path": "..."} ya da ham dosya gövdesi (X-Filename başlığıyla)
+    GET  /jobs/<id>[?wait=sn] iş durumu; tamamlandıysa segmentler
+                            (biten işler --job-ttl sn sonra unutulur)
+    GET  /metrics           kuyruk derinliği, toplu çözme boyutları, verim
+
+Kullanım:
+    python SpeechRecog.py serve [--host 127.0.0.1] [--port 8765] [--model turbo] [--max-batch 8]
+
+Not: Pencereler sessiz noktalardan kesilir ama whisper'ın kendi transcribe
+döngüsündeki sıcaklık geri dönüşü ve zaman damgasına göre kaydırma yoktur;
+doğruluk yerine paylaşımlı verim öne çıkarılmıştır.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pipeline
+from backends import BACKENDS, DEFAULT_BACKEND, configure_threads
+from cache import TranscriptCache, audio_fingerprint
+from config import load_config
+
+
+# Whisper'ın tek seferde işlediği pencere uzunluğu
+WINDOW_SECONDS = 30
+# Pencere sonu, sınırdan bu kadar saniye geriye kadar en sessiz noktaya çekilir
+WINDOW_SEARCH_SECONDS = 3
+# Zaman damgası token'larının çözünürlüğü (sn)
+TIME_PRECISION = 0.02
+# whisper.transcribe ile aynı "konuşma yok" eşikleri
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+# Biten işler bu kadar saniye sonra, ya da bu sayıyı aşınca en eskiden başlayarak unutulur
+JOB_TTL_SECONDS = 3600
+MAX_FINISHED_JOBS = 1000
+# GET /jobs/<id>?wait= için en uzun bekleme
+MAX_WAIT_SECONDS = 600
+# POST /jobs ile yüklenebilecek en büyük gövde (gövde belleğe okunur)
+MAX_UPLOAD_MB = 512
+
+QUEUED = "queued"
+DECODING = "decoding"
+TRANSCRIBING = "transcribing"
+DONE = "done"
+FAILED = "failed"
+
+
+def silence_windows(audio, max_seconds=WINDOW_SECONDS, search_seconds=WINDOW_SEARCH_SECONDS):
+    """Sesi en fazla max_seconds uzunluğunda, sessiz noktalardan kesilmiş pencerelere böler.
+
+    (başlangıç_sn, pencere) listesi döndürür.
+    """
+    import numpy as np
+    from chunked import FRAME_SECONDS, frame_energy
+
+    rate = pipeline.SAMPLE_RATE
+    window = int(max_seconds * rate)
+    frame = int(FRAME_SECONDS * rate)
+    energy = frame_energy(audio)
+    windows = []
+    position = 0
+    while len(audio) - position > window:
+        low = (position + window - int(search_seconds * rate)) // frame
+        high = (position + window) // frame
+        cut = (low + int(np.argmin(energy[low:high]))) * frame if high > low else position + window
+        windows.append((position / rate, audio[position:cut]))
+        position = cut
+    if len(audio) - position > 0:
+        windows.append((position / rate, audio[position:]))
+    return windows
+
+
+def tokens_to_segments(tokens, tokenizer, offset, window_seconds):
+    """Zaman damgalı token dizisini (start, end, text) segmentlerine çevirir"""
+    segments = []
+    start = None
+    last = 0.0
+    text_tokens = []
+    for token in tokens:
+        if token >= tokenizer.timestamp_begin:
+            timestamp = (token - tokenizer.timestamp_begin) * TIME_PRECISION
+            last = timestamp
+            if start is None:
+                start = timestamp
+            else:
+                if text_tokens:
+                    segments.append((start, timestamp, text_tokens))
+                start, text_tokens = None, []
+        elif token < tokenizer.eot:
+            text_tokens.append(token)
+    if text_tokens:
+        segments.append((last if start is None else start, window_seconds, text_tokens))
+
+    result = []
+    for seg_start, seg_end, seg_tokens in segments:
+        text = tokenizer.decode(seg_tokens).strip()
+        if text:
+            result.append({
+                'start': offset + min(seg_start, window_seconds),
+                'end': offset + min(max(seg_end, seg_start), window_seconds),
+                'text': text,
+            })
+    return result
+
+
+class ServiceJob:
+    _ids = itertools.count(1)
+
+    def __init__(self, source, language=None):
+        self.id = next(ServiceJob._ids)
+        self.source = source
+        self.language = language
+        self.status = QUEUED
+        self.error = None
+        self.duration = 0.0
+        self.detected_language = None
+        self.windows = []
+        self.window_count = 0  # İş bitince windows (ses) bırakılır, sayısı burada kalır
+        self.next_window = 0
+        self.window_results = {}
+        self.segments = []
+        self.cache_key = None
+        self.created = time.time()
+        self.finished = None
+        self.done = threading.Event()
+
+    def to_json(self, include_segments=True):
+        data = {
+            'id': self.id,
+            'status': self.status,
+            'duration': self.duration,
+            'language': self.language or self.detected_language,
+            'windows': self.window_count,
+            'windows_done': len(self.window_results),
+            'error': self.error,
+            'elapsed': (self.finished or time.time()) - self.created,
+        }
+        if include_segments and self.status == DONE:
+            data['segments'] = self.segments
+        return data
+
+
+class BatchTranscriber:
+    """İşleri kabul eden, seslerini çözen ve pencerelerini toplu çözen servis çekirdeği"""
+
+    def __init__(self, model_name=pipeline.DEFAULT_MODEL, max_batch=8, batch_wait=0.05, decode_workers=2,
+                 cache=None, backend=DEFAULT_BACKEND, job_ttl=JOB_TTL_SECONDS, max_finished_jobs=MAX_FINISHED_JOBS):
+        self.model_name = model_name
+        self.backend = backend
+        self.max_batch = max(1, max_batch)
+        self.batch_wait = batch_wait
+        self.cache = cache
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self.model = None
+        self.tokenizer = None
+        self.jobs = {}
+        self.active = []
+        self.condition = threading.Condition()
+        self.decode_pool = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="decode")
+        self.stopped = False
+        self.metrics = {
+            'jobs_submitted': 0,
+            'jobs_done': 0,
+            'jobs_failed': 0,
+            'jobs_evicted': 0,
+            'cache_hits': 0,
+            'batches': 0,
+            'windows_decoded': 0,
+            'batch_size_histogram': {},
+            'audio_seconds_done': 0.0,
+            'decode_seconds': 0.0,
+            'last_batch_seconds': 0.0,
+        }
+
+    def start(self):
+        import whisper
+        self.model, load_seconds = pipeline.get_model(self.model_name, self.backend)
+        self.tokenizer = whisper.tokenizer.get_tokenizer(
+            self.model.is_multilingual, num_languages=self.model.num_languages, task="transcribe"
+        )
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        return load_seconds
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        self.decode_pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, source, language=None, remove_source=False):
+        """Dosya yolundan yeni iş oluştur; sesi arka planda çözülür"""
+        job = ServiceJob(source, language)
+        with self.condition:
+            self._evict()
+            self.jobs[job.id] = job
+            self.metrics['jobs_submitted'] += 1
+        self.decode_pool.submit(self._decode, job, remove_source)
+        return job
+
+    def _finish(self, job, status, error=None):
+        with self.condition:
+            job.status = status
+            job.error = error
+            job.finished = time.time()
+            job.windows = []
+            if job in self.active:
+                self.active.remove(job)
+            self.metrics['jobs_done' if status == DONE else 'jobs_failed'] += 1
+            if status == DONE:
+                self.metrics['audio_seconds_done'] += job.duration
+            self._evict()
+        job.done.set()
+
+    def _evict(self):
+        """Süresi dolan ve sınırı aşan biten işleri unut (condition tutulurken çağrılır)"""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if job.finished is not None),
+                          key=lambda job: job.finished)
+        expired = [job for job in finished if now - job.finished > self.job_ttl]
+        overflow = finished[len(expired):len(finished) - self.max_finished_jobs]
+        for job in expired + overflow:
+            del self.jobs[job.id]
+        self.metrics['jobs_evicted'] += len(expired) + len(overflow)
+
+    def _decode(self, job, remove_source):
+        try:
+            job.status = DECODING
+            audio = pipeline.decode_audio_to_memory(job.source)
+            job.duration = len(audio) / pipeline.SAMPLE_RATE
+            if self.cache is not None:
+                job.cache_key = self.cache.make_key(audio_fingerprint(audio), self.model_name,
+                                                    {'server': 'batched', 'language': job.language,
+                                                     'backend': self.backend})
+                entry = self.cache.get(job.cache_key)
+                if entry is not None:
+                    job.segments = entry['segments']
+                    with self.condition:
+                        self.metrics['cache_hits'] += 1
+                    self._finish(job, DONE)
+                    return
+            windows = silence_windows(audio)
+        except Exception as e:
+            self._finish(job, FAILED, str(e))
+            return
+        finally:
+            if remove_source:
+                pipeline.remove_temp_audio(job.source)
+
+        with self.condition:
+            job.windows = windows
+            job.window_count = len(windows)
+            job.status = TRANSCRIBING
+            if windows:
+                self.active.append(job)
+            self.condition.notify_all()
+        if not windows:
+            self._finish(job, DONE)
+
+    def queue_depth(self):
+        with self.condition:
+            waiting_windows = sum(len(job.windows) - job.next_window for job in self.active)
+            waiting_jobs = sum(1 for job in self.jobs.values() if job.status in (QUEUED, DECODING))
+        return waiting_jobs, waiting_windows
+
+    def _collect_batch(self):
+        """Aktif işlerden sırayla (her işten birer pencere, dolana kadar tur atarak) pencere topla"""
+        batch = []
+        while len(batch) < self.max_batch:
+            added = False
+            for job in list(self.active):
+                if job.next_window < len(job.windows) and len(batch) < self.max_batch:
+                    batch.append((job, job.next_window))
+                    job.next_window += 1
+                    added = True
+            if not added:
+                break
+        return batch
+
+    def _batch_loop(self):
+        while True:
+            with self.condition:
+                while not self.stopped and not any(job.next_window < len(job.windows) for job in self.active):
+                    self.condition.wait()
+                if self.stopped:
+                    return
+            # Diğer isteklerin de pencere eklemesi için kısa bir süre bekle
+            if self.batch_wait:
+                time.sleep(self.batch_wait)
+            with self.condition:
+                batch = self._collect_batch()
+            if batch:
+                try:
+                    self._run_batch(batch)
+                except Exception as e:
+                    # Toplu çözme thread'i tektir; ölürse yeni işler sonsuza dek bekler
+                    print(f"Toplu çözme hatası: {e}")
+                    for job, _ in batch:
+                        if not job.done.is_set():
+                            self._finish(job, FAILED, str(e))
+
+    def _run_batch(self, batch):
+        import torch
+        import whisper
+
+        started = time.perf_counter()
+        # Dil sabitlenmiş işler kendi diliyle, diğerleri (dil tespitli) birlikte çözülür
+        groups = {}
+        for job, index in batch:
+            groups.setdefault(job.language, []).append((job, index))
+
+        for language, items in groups.items():
+            # Bir gruptaki hata (mel, decode ya da sonucu saklama) yalnızca o gruptaki işleri düşürür
+            try:
+                mels = [
+                    whisper.log_mel_spectrogram(whisper.pad_or_trim(job.windows[index][1]), self.model.dims.n_mels)
+                    for job, index in items
+                ]
+                options = whisper.DecodingOptions(task="transcribe", language=language, fp16=False,
+                                                  without_timestamps=False)
+                with torch.no_grad():
+                    results = whisper.decode(self.model, torch.stack(mels).to(self.model.device), options)
+                for (job, index), result in zip(items, results):
+                    self._store_window(job, index, result)
+            except Exception as e:
+                for job, _ in items:
+                    if not job.done.is_set():
+                        self._finish(job, FAILED, str(e))
+
+        elapsed = time.perf_counter() - started
+        with self.condition:
+            size = str(len(batch))
+            self.metrics['batches'] += 1
+            self.metrics['windows_decoded'] += len(batch)
+            self.metrics['batch_size_histogram'][size] = self.metrics['batch_size_histogram'].get(size, 0) + 1
+            self.metrics['decode_seconds'] += elapsed
+            self.metrics['last_batch_seconds'] = elapsed
+
+    def _store_window(self, job, index, result):
+        if job.done.is_set():
+            return
+        offset, samples = job.windows[index]
+        window_seconds = len(samples) / pipeline.SAMPLE_RATE
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+            segments = []
+        else:
+            segments = tokens_to_segments(result.tokens, self.tokenizer, offset, window_seconds)
+        job.detected_language = job.detected_language or result.language
+        job.window_results[index] = segments
+        if len(job.window_results) == len(job.windows):
+            job.segments = [segment for i in range(len(job.windows)) for segment in job.window_results[i]]
+            for number, segment in enumerate(job.segments):
+                segment['id'] = number
+            if self.cache is not None and job.cache_key:
+                try:
+                    self.cache.put(job.cache_key, self.model_name, job.segments, job.duration)
+                except Exception as e:
+                    print(f"Önbelleğe yazılamadı: {e}")  # Transkript hazır; iş yine de tamamlanır
+            self._finish(job, DONE)
+
+    def metrics_snapshot(self):
+        waiting_jobs, waiting_windows = self.queue_depth()
+        with self.condition:
+            metrics = dict(self.metrics)
+            metrics['batch_size_histogram'] = dict(self.metrics['batch_size_histogram'])
+            metrics['active_jobs'] = len(self.active)
+            metrics['jobs_retained'] = len(self.jobs)
+        metrics['queue_depth_jobs'] = waiting_jobs
+        metrics['queue_depth_windows'] = waiting_windows
+        metrics['mean_batch_size'] = metrics['windows_decoded'] / metrics['batches'] if metrics['batches'] else 0.0
+        metrics['max_batch'] = self.max_batch
+        metrics['model'] = self.model_name
+        metrics['backend'] = self.backend
+        return metrics
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    transcriber = None
+    max_upload_bytes = MAX_UPLOAD_MB * 1024 * 1024
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/jobs':
+            return self._send_json(404, {'error': "Bulunamadı"})
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            return self._send_json(400, {'error': "Geçersiz Content-Length"})
+        if length < 0:
+            return self._send_json(400, {'error': "Geçersiz Content-Length"})
+        if length > self.max_upload_bytes:
+            # Gövde okunmadığı için bağlantı yeniden kullanılamaz
+            self.close_connection = True
+            return self._send_json(413, {'error': f"Gövde çok büyük (en fazla {self.max_upload_bytes // (1024 * 1024)} MB)"})
+        body = self.rfile.read(length) if length else b''
+        language = self.headers.get('X-Language') or None
+        try:
+            if (self.headers.get('Content-Type') or '').startswith('application/json'):
+                request = json.loads(body or b'{}')
+                path = request.get('path')
+                if not path or not os.path.isfile(path):
+                    return self._send_json(400, {'error': f"Dosya bulunamadı: {path}"})
+                job = self.transcriber.submit(path, language=request.get('language') or language)
+            else:
+                if not body:
+                    return self._send_json(400, {'error': "Boş gövde"})
+                suffix = os.path.splitext(self.headers.get('X-Filename') or '')[1] or '.bin'
+                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, prefix="speechrecog_upload_") as f:
+                    f.write(body)
+                job = self.transcriber.submit(f.name, language=language, remove_source=True)
+        except Exception as e:
+            return self._send_json(400, {'error': str(e)})
+        self._send_json(202, job.to_json(include_segments=False))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/metrics':
+            return self._send_json(200, self.transcriber.metrics_snapshot())
+        parts = url.path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'jobs' and parts[1].isdigit():
+            job = self.transcriber.jobs.get(int(parts[1]))
+            if job is None:
+                return self._send_json(404, {'error': "İş bulunamadı"})
+            wait = parse_qs(url.query).get('wait')
+            if wait:
+                try:
+                    seconds = float(wait[0])
+                except ValueError:
+                    seconds = math.nan
+                if not 0 <= seconds <= MAX_WAIT_SECONDS:
+                    return self._send_json(400, {'error': f"wait 0-{MAX_WAIT_SECONDS} sn arasında olmalı"})
+                job.done.wait(seconds)
+            return self._send_json(200, job.to_json())
+        self._send_json(404, {'error': "Bulunamadı"})
+
+
+def build_parser():
+    settings = load_config()
+    parser = argparse.ArgumentParser(prog="SpeechRecog.py serve", description="Yerel transkripsiyon servisi.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--model', default=settings['model'])
+    parser.add_argument('--max-batch', type=int, default=8, help="Tek decode çağrısındaki en fazla pencere")
+    parser.add_argument('--batch-wait-ms', type=int, default=50, help="Toplu çözmeden önce diğer istekleri bekleme süresi")
+    parser.add_argument('--backend', choices=BACKENDS, default=settings['backend'], help="Çıkarım arka ucu")
+    parser.add_argument('--intra-op-threads', type=int, default=settings['intra_op_threads'])
+    parser.add_argument('--inter-op-threads', type=int, default=settings['inter_op_threads'])
+    parser.add_argument('--max-upload-mb', type=int, default=MAX_UPLOAD_MB, help="Yüklenebilecek en büyük dosya (MB)")
+    parser.add_argument('--job-ttl', type=float, default=JOB_TTL_SECONDS,
+                        help="Biten işlerin sonucu bu kadar saniye sonra silinir")
+    parser.add_argument('--no-cache', action='store_true', help="Transkript önbelleğini kullanma")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    configure_threads(args.intra_op_threads, args.inter_op_threads)
+    transcriber = BatchTranscriber(args.model, max_batch=args.max_batch, batch_wait=args.batch_wait_ms / 1000,
+                                   cache=None if args.no_cache else TranscriptCache(), backend=args.backend,
+                                   job_ttl=args.job_ttl)
+    print(f"Model yükleniyor: {args.model} ({args.backend})")
+    load_seconds = transcriber.start()
+    print(f"Model hazır ({load_seconds:.1f} sn)")
+
+    ServiceHandler.transcriber = transcriber
+    ServiceHandler.max_upload_bytes = args.max_upload_mb * 1024 * 1024
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    print(f"Servis çalışıyor: http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        transcriber.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""checkpoint.py: günlükten devam, yarım son satır ve başlık uyuşmazlığı"""
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import checkpoint  # noqa: E402
+import pipeline  # noqa: E402
+from chunked import split_audio  # noqa: E402
+
+WINDOW_SECONDS = 2
+KEY = "test-key"
+
+
+class StubModel:
+    """Her pencere için içeriğine bağlı tek bir segment döndürür; fail_after çağrıdan sonra hata verir"""
+
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def transcribe(self, audio, initial_prompt=None, **options):
+        if self.fail_after is not None and self.calls >= self.fail_after:
+            raise RuntimeError("çöktü")
+        self.calls += 1
+        seconds = len(audio) / pipeline.SAMPLE_RATE
+        text = f"pencere {float(np.abs(audio).sum()):.3f}"
+        return {'text': text, 'segments': [{'start': 0.5, 'end': seconds - 0.5, 'text': text}]}
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPEECHRECOG_DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def audio():
+    """11 sn gürültü; pencereler 2, 4, 6 ve 8. saniyelerdeki sessiz boşluklardan bölünür"""
+    rate = pipeline.SAMPLE_RATE
+    samples = np.random.default_rng(0).uniform(-0.5, 0.5, 11 * rate).astype(np.float32)
+    for second in (2, 4, 6, 8):
+        samples[int((second - 0.2) * rate):int((second + 0.2) * rate)] = 0.0
+    return samples
+
+
+def transcribe(model, audio, key=KEY, window_seconds=WINDOW_SECONDS, stages=None):
+    on_stage = (lambda name, info=None: stages.append((name, info))) if stages is not None else None
+    return list(checkpoint.iter_checkpointed_segments(model, audio, key, window_seconds=window_seconds,
+                                                      on_stage=on_stage))
+
+
+def interrupt(audio, windows_done):
+    """İlk windows_done pencereden sonra çöken bir çalıştırma; günlük diskte kalır"""
+    with pytest.raises(RuntimeError):
+        transcribe(StubModel(fail_after=windows_done), audio)
+
+
+def journal_header(key=KEY):
+    with open(checkpoint.journal_path(key), 'r', encoding='utf-8') as f:
+        return json.loads(f.readline())
+
+
+def test_resume_skips_completed_windows(audio):
+    windows = len(split_audio(audio, WINDOW_SECONDS))
+    assert windows >= 3
+    expected = transcribe(StubModel(), audio, key="reference")
+
+    interrupt(audio, 2)
+    assert len(checkpoint.read_journal(checkpoint.journal_path(KEY), journal_header())) == 2
+
+    model = StubModel()
+    stages = []
+    assert transcribe(model, audio, stages=stages) == expected
+    assert model.calls == windows - 2
+    assert [info['windows_done'] for name, info in stages if name == "resume"] == [2]
+
+
+def test_journal_removed_after_completion(audio):
+    transcribe(StubModel(), audio)
+    with pytest.raises(FileNotFoundError):
+        open(checkpoint.journal_path(KEY))
+
+
+def test_torn_last_line_is_ignored(audio):
+    windows = len(split_audio(audio, WINDOW_SECONDS))
+    expected = transcribe(StubModel(), audio, key="reference")
+    interrupt(audio, 2)
+    path = checkpoint.journal_path(KEY)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "window", "index": 2, "segm')
+
+    assert len(checkpoint.read_journal(path, journal_header())) == 2
+    model = StubModel()
+    assert transcribe(model, audio) == expected
+    assert model.calls == windows - 2
+
+
+def test_header_mismatch_resets_journal(audio):
+    windows = len(split_audio(audio, WINDOW_SECONDS))
+    expected = transcribe(StubModel(), audio, key="reference")
+    interrupt(audio, 2)
+    path = checkpoint.journal_path(KEY)
+    assert checkpoint.read_journal(path, dict(journal_header(), bounds=[[0.0, 1.0]])) == []
+
+    # Günlük başka sınırlarla (ör. farklı pencere uzunluğuyla) yazılmış: eski pencereler kullanılmaz
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    header = json.loads(lines[0])
+    header['bounds'][0][1] += 0.5
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join([json.dumps(header)] + lines[1:]) + "\n")
+
+    model = StubModel()
+    stages = []
+    assert transcribe(model, audio, stages=stages) == expected
+    assert model.calls == windows
+    assert not [name for name, _ in stages if name == "resume"]
+
+
+def test_missing_journal_reads_empty():
+    assert checkpoint.read_journal(checkpoint.journal_path("yok"), {'bounds': []}) == []
@@ -0,0 +1,113 @@
+"""Parça dikişlerinde segment birleştirme (chunked.SegmentMerger) ve VAD zaman eşlemesi"""
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from chunked import SegmentMerger, _normalize, merge_chunk_segments  # noqa: E402
+from vad import map_time, remap_segments  # noqa: E402
+
+# (sıkıştırılmış_başlangıç_sn, özgün_başlangıç_sn, uzunluk_sn)
+MAPPING = [(0.0, 1.0, 2.0), (2.0, 5.0, 3.0), (5.0, 10.0, 1.0)]
+
+
+def segment(start, end, text):
+    return {'start': start, 'end': end, 'text': text}
+
+
+def assert_ordered(segments):
+    """start <= end, sıralı ve örtüşmeyen zamanlar, dikişte tekrar yok"""
+    for item in segments:
+        assert item['start'] <= item['end']
+    for previous, item in zip(segments, segments[1:]):
+        assert previous['start'] <= item['start']
+        assert previous['end'] <= item['start']
+        assert not (_normalize(previous['text']) == _normalize(item['text'])
+                    and item['start'] - previous['end'] < 1.0)
+
+
+def test_seam_duplicate_is_merged():
+    merged = merge_chunk_segments([
+        (0.0, 10.0, [segment(0.0, 4.0, "bir"), segment(9.0, 10.6, "Üç  dört")]),
+        (10.0, 20.0, [segment(9.4, 11.0, "üç dört"), segment(11.0, 15.0, "beş")]),
+    ])
+    assert [item['text'] for item in merged] == ["bir", "Üç  dört", "beş"]
+    assert merged[1]['end'] == 11.0
+    assert [item['id'] for item in merged] == [0, 1, 2]
+    assert_ordered(merged)
+
+
+def test_segment_goes_to_chunk_owning_its_middle():
+    merged = merge_chunk_segments([
+        (10.0, 20.0, [segment(9.8, 10.6, "sonra"), segment(12.0, 14.0, "son")]),
+        (0.0, 10.0, [segment(2.0, 4.0, "önce"), segment(9.8, 10.6, "sonra")]),
+    ])
+    assert [item['text'] for item in merged] == ["önce", "sonra", "son"]
+    assert_ordered(merged)
+
+
+def test_overlapping_segment_starts_after_previous():
+    merger = SegmentMerger()
+    ready = merger.add(0.0, 10.0, [segment(8.0, 10.4, "dört")])
+    ready += merger.add(10.0, 20.0, [segment(10.1, 10.2, "beş"), segment(12.0, 13.0, "altı")], last=True)
+    ready += merger.finish()
+    assert [item['start'] for item in ready] == [8.0, 10.4, 12.0]
+    assert ready[1]['end'] == 10.4
+    assert_ordered(ready)
+
+
+def test_random_chunks_keep_invariants():
+    rng = random.Random(13)
+    for _ in range(50):
+        bounds = [0.0]
+        while bounds[-1] < 100:
+            bounds.append(bounds[-1] + rng.uniform(5, 20))
+        chunks = []
+        for number, (own_start, own_end) in enumerate(zip(bounds, bounds[1:])):
+            position = own_start - rng.uniform(0, 1)
+            segments = []
+            while position < own_end + 1:
+                length = rng.uniform(0.2, 4)
+                segments.append(segment(position, position + length, f"{number}-{len(segments)}"))
+                position += length + rng.uniform(-0.5, 0.5)
+            # Bir sonraki parça dikişteki segmenti hafif kaymış olarak tekrar görür
+            if chunks and chunks[-1][2]:
+                seam = chunks[-1][2][-1]
+                segments.insert(0, segment(seam['start'] + 0.1, seam['end'] + 0.1, seam['text'].upper()))
+            chunks.append((own_start, own_end, segments))
+        assert_ordered(merge_chunk_segments(chunks))
+
+
+def test_map_time_within_regions():
+    assert map_time(0.5, MAPPING) == 1.5
+    assert map_time(2.5, MAPPING) == 5.5
+    assert map_time(5.5, MAPPING) == 10.5
+    # Bölge sınırı: başlangıç sonraki bölgeye, bitiş önceki bölgeye aittir
+    assert map_time(2.0, MAPPING) == 5.0
+    assert map_time(2.0, MAPPING, is_end=True) == 3.0
+    # Sıkıştırılmış sesin sonundan sonrası son bölgenin sonuna sabitlenir
+    assert map_time(9.0, MAPPING) == 11.0
+    assert map_time(1.5, []) == 1.5
+
+
+def test_map_time_is_monotonic():
+    times = [step / 100 for step in range(0, 700)]
+    for is_end in (False, True):
+        mapped = [map_time(seconds, MAPPING, is_end=is_end) for seconds in times]
+        assert mapped == sorted(mapped)
+        assert all(1.0 <= value <= 11.0 for value in mapped)
+
+
+def test_remap_segments_keeps_order_and_bounds():
+    segments = [segment(0.0, 1.9, "a"), segment(1.9, 2.0, "b"), segment(2.0, 2.0, "c"), segment(2.5, 5.2, "d"),
+                segment(4.9, 4.95, "e"), segment(5.5, 6.0, "f")]
+    segments.sort(key=lambda item: item['start'])
+    remapped = remap_segments(segments, MAPPING)
+    for item in remapped:
+        assert item['start'] <= item['end']
+    starts = [item['start'] for item in remapped]
+    assert starts == sorted(starts)
+    assert remapped[1]['end'] == 3.0  # Bölgenin tam sonunda biten segment sonraki bölgeye atlamaz
+    assert remapped[3] == {'start': 5.5, 'end': 10.2, 'text': "d"}
+    assert [item['text'] for item in remapped] == [item['text'] for item in segments]
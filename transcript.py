@@ -0,0 +1,121 @@
+"""Büyük transkriptler için sıkı segment deposu ve akışlı dışa aktarıcılar.
+
+SegmentStore segmentleri sözlük listesi yerine paralel dizilerde tutar:
+başlangıç/bitiş zamanları (array('d')) ve tek bir UTF-8 metin tamponu
+içindeki başlangıç ofsetleri (array('q')). 20 bin+ segmentte bile bellek
+küçük kalır ve i. segmente doğrudan erişilir; arayüz yalnızca görünen
+satırları bu depodan okur. Dışa aktarıcılar (TXT, SRT, VTT, JSON) depodan
+dosyaya satır satır yazar, tüm metni bellekte birleştirmez.
+"""
+import bisect
+import json
+import os
+from array import array
+
+from pipeline import format_time
+
+
+class SegmentStore:
+    def __init__(self, segments=None):
+        self.starts = array('d')
+        self.ends = array('d')
+        self.offsets = array('q', [0])
+        self.buffer = bytearray()
+        if segments:
+            self.extend(segments)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def append(self, start, end, text):
+        self.starts.append(float(start))
+        self.ends.append(float(end))
+        self.buffer.extend(text.encode('utf-8'))
+        self.offsets.append(len(self.buffer))
+
+    def append_segment(self, segment):
+        """Boş metinli segmentleri atlayarak ekler; eklendiyse True"""
+        text = segment.get('text', '').strip()
+        if not text:
+            return False
+        self.append(segment.get('start', 0), segment.get('end', 0), text)
+        return True
+
+    def extend(self, segments):
+        for segment in segments:
+            self.append_segment(segment)
+
+    def clear(self):
+        del self.starts[:], self.ends[:], self.offsets[1:]
+        self.buffer.clear()
+
+    def text(self, index):
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+    def segment(self, index):
+        return {'start': self.starts[index], 'end': self.ends[index], 'text': self.text(index)}
+
+    def iter_segments(self, first=0, last=None):
+        last = len(self) if last is None else min(last, len(self))
+        for index in range(first, last):
+            yield index, self.starts[index], self.ends[index], self.text(index)
+
+    def index_at(self, seconds):
+        """Verilen zamanı içeren (ya da ondan önce başlayan son) segmentin sırası"""
+        return max(0, bisect.bisect_right(self.starts, seconds) - 1)
+
+
+def timecoded_line(start, end, text):
+    return f"[{format_time(start)} --> {format_time(end)}] {text}"
+
+
+def vtt_time(seconds):
+    return format_time(seconds).replace(',', '.')
+
+
+def write_txt(store, f, first=0, clean=False):
+    """Zaman kodlu (her segment bir satır) ya da temiz (boşlukla birleşik) metin"""
+    for index, start, end, text in store.iter_segments(first):
+        if clean:
+            f.write(text if index == first else " " + text)
+        else:
+            f.write(timecoded_line(start, end, text) + "\n")
+
+
+def write_srt(store, f, first=0):
+    for number, (_, start, end, text) in enumerate(store.iter_segments(first), 1):
+        f.write(f"{number}\n{format_time(start)} --> {format_time(end)}\n{text}\n\n")
+
+
+def write_vtt(store, f, first=0):
+    f.write("WEBVTT\n\n")
+    for _, start, end, text in store.iter_segments(first):
+        f.write(f"{vtt_time(start)} --> {vtt_time(end)}\n{text}\n\n")
+
+
+def write_json(store, f, first=0):
+    f.write('{"segments": [')
+    for index, start, end, text in store.iter_segments(first):
+        if index > first:
+            f.write(',')
+        f.write('\n  ' + json.dumps({'id': index - first, 'start': start, 'end': end, 'text': text}, ensure_ascii=False))
+    f.write('\n]}\n')
+
+
+EXPORT_FORMATS = {
+    '.txt': ("Text files", write_txt),
+    '.srt': ("SubRip subtitles", write_srt),
+    '.vtt': ("WebVTT subtitles", write_vtt),
+    '.json': ("JSON", write_json),
+}
+
+
+def export(store, path, first=0, clean=False):
+    """Depoyu dosya uzantısına göre biçimde yazar (bilinmeyen uzantılar TXT olarak)"""
+    extension = os.path.splitext(path)[1].lower()
+    writer = EXPORT_FORMATS.get(extension, EXPORT_FORMATS['.txt'])[1]
+    with open(path, 'w', encoding='utf-8') as f:
+        if writer is write_txt:
+            writer(store, f, first, clean=clean)
+        else:
+            writer(store, f, first)
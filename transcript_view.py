@@ -0,0 +1,141 @@
+"""Yalnızca görünen satırları çizen (sanallaştırılmış) transkript görünümü.
+
+Text widget'ı tüm transkripti tutmaz: SegmentStore'daki segmentlerden
+yalnızca ekrana sığan pencere (birkaç satır payla) yazılır. Kaydırma
+çubuğu ve fare tekerleği, widget'ın kendi kaydırması yerine pencerenin
+başlangıç segmentini değiştirir; böylece 20 bin+ segmentte de kaydırma,
+ekleme ve silme sabit maliyettedir.
+
+Satırlar kaydırılarak (wrap) birden çok ekran satırı kaplayabildiğinden
+pencere, segment sayısına göre değil Text'in ölçtüğü ekran satırlarına
+(displaylines) göre doldurulur ve sona dayandığında geri çekilir. Görünüm
+salt okunurdur: metin depodan üretildiği için düzenlemeler saklanmaz.
+"""
+from tkinter import BOTH, DISABLED, END, LEFT, NORMAL, RIGHT, VERTICAL, Y, Frame, Text
+from tkinter import font as tkfont
+from tkinter import ttk
+
+from transcript import timecoded_line
+
+
+# Görünen satırlara ek olarak çizilen satır sayısı (satır kaydırma payı)
+OVERSCAN_ROWS = 4
+
+
+class VirtualTranscriptView(Frame):
+    """clean=False: her segment "[başlangıç --> bitiş] metin" satırı; clean=True: boşlukla birleşik metin"""
+
+    def __init__(self, parent, store, clean=False, text_options=None, **frame_options):
+        super().__init__(parent, **frame_options)
+        self.store = store
+        self.clean = clean
+        # Bu sıradan önceki segmentler gösterilmez (kart "temizlendiğinde" ileri alınır)
+        self.first_visible = 0
+        self.top = 0
+        self.rendered = (0, 0, 0)  # (ilk segment, son segment, çizildiğinde depodaki segment sayısı)
+
+        self.text = Text(self, wrap='word', **(text_options or {}))
+        self.text.configure(state=DISABLED)
+        self.scrollbar = ttk.Scrollbar(self, orient=VERTICAL, command=self.on_scrollbar)
+        self.text.pack(side=LEFT, fill=BOTH, expand=True)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.line_height = tkfont.Font(font=self.text.cget('font')).metrics('linespace')
+
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", self.on_mousewheel)
+        self.text.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.text.bind("<Button-5>", lambda event: self.scroll_rows(3))
+        self.text.bind("<Prior>", lambda event: self.scroll_rows(-self.visible_rows()))
+        self.text.bind("<Next>", lambda event: self.scroll_rows(self.visible_rows()))
+
+    def count(self):
+        return max(0, len(self.store) - self.first_visible)
+
+    def visible_rows(self):
+        text = self.text
+        padding = 2 * sum(int(text.cget(option)) for option in ('pady', 'borderwidth', 'highlightthickness'))
+        return max(1, (text.winfo_height() - padding) // max(1, self.line_height))
+
+    def display_lines(self):
+        """Yazılı içeriğin kapladığı ekran satırı sayısı (kaydırılan satırlar dahil)"""
+        count = self.text.count("1.0", "end-1c", "displaylines")
+        return (count[0] if count else 0) + 1
+
+    def segment_text(self, start, end, text):
+        return text if self.clean else timecoded_line(start, end, text)
+
+    def render(self):
+        """Görünen pencereyi depodan yeniden yaz"""
+        total = self.count()
+        rows = self.visible_rows()
+        separator = " " if self.clean else "\n"
+        self.top = max(0, min(self.top, total - 1))
+        first = self.first_visible + self.top
+        last = first
+
+        self.text.configure(state=NORMAL)
+        try:
+            self.text.delete(1.0, END)
+            # Görünen alan (ve kaydırma payı) ekran satırı olarak dolana kadar segment ekle
+            while last < len(self.store) and (last == first or self.display_lines() < rows + OVERSCAN_ROWS):
+                batch_end = min(last + rows + OVERSCAN_ROWS, len(self.store))
+                self.text.insert(END, "".join(
+                    (separator if index > first else "") + self.segment_text(start, end, text)
+                    for index, start, end, text in self.store.iter_segments(last, batch_end)))
+                last = batch_end
+            # Sona dayanıldıysa son segmentler ekranın altında kalmasın: alan dolana kadar geriye doğru ekle
+            while last == len(self.store) and first > self.first_visible and self.display_lines() < rows:
+                first -= 1
+                segment = self.store.segment(first)
+                self.text.insert("1.0", self.segment_text(segment['start'], segment['end'], segment['text']) + separator)
+        finally:
+            self.text.configure(state=DISABLED)
+        self.top = first - self.first_visible
+        self.rendered = (first, last, len(self.store))
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def refresh(self):
+        """Depoya segment eklendi: yalnızca görünen pencere etkileniyorsa yeniden çiz"""
+        first, last, stored = self.rendered
+        if last >= stored or last > len(self.store):
+            # Pencere deponun sonuna dayanıyordu (boş alan olabilir) ya da depo küçüldü
+            self.render()
+        elif self.count():
+            # Pencere dolu; yalnızca kaydırma çubuğunun oranı değişti
+            total = self.count()
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_rows()) / total))
+
+    def reset(self):
+        self.first_visible = 0
+        self.top = 0
+        self.render()
+
+    def clear(self):
+        """Şimdiye kadarki segmentleri bu görünümden gizle (depo değişmez)"""
+        self.first_visible = len(self.store)
+        self.top = 0
+        self.render()
+
+    def scroll_rows(self, rows):
+        self.top = max(0, self.top + rows)
+        self.render()
+        return "break"
+
+    def scroll_to_index(self, index):
+        """Depodaki index. segmenti görünümün en üstüne getir"""
+        self.top = max(0, index - self.first_visible)
+        self.render()
+
+    def on_mousewheel(self, event):
+        return self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.top = int(float(amount) * self.count())
+            self.render()
+        elif action == "scroll":
+            step = self.visible_rows() if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
@@ -0,0 +1,130 @@
+"""Enerji tabanlı konuşma aktivitesi tespiti (VAD).
+
+Uzun sessizlik, oda gürültüsü ve düşük seviyeli arka plan sesleri Whisper'a
+verilmeden önce çıkarılır. Yalnızca konuşma bölgeleri art arda eklenip
+transkribe edilir; ortaya çıkan segment zamanları map_time ile özgün zaman
+çizelgesine geri taşınır, böylece format_time çıktısı değişmez.
+"""
+import bisect
+
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+
+FRAME_SECONDS = 0.03
+# Konuşma eşiği: gürültü tabanının bu kadar dB üstü (en az ABSOLUTE_FLOOR_DB)
+MARGIN_DB = 12.0
+ABSOLUTE_FLOOR_DB = -50.0
+# Bundan kısa sessizlikler konuşmanın parçası sayılır, bundan kısa konuşmalar atılır
+MIN_SILENCE_SECONDS = 0.6
+MIN_SPEECH_SECONDS = 0.25
+# Kelime başı/sonu kırpılmasın diye her bölgeye iki yandan eklenen pay
+PAD_SECONDS = 0.25
+
+
+def frame_levels_db(audio, frame_seconds=FRAME_SECONDS):
+    """Her karenin RMS seviyesini dBFS olarak döndürür"""
+    frame = max(1, int(frame_seconds * SAMPLE_RATE))
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def detect_speech(audio, margin_db=MARGIN_DB, min_silence=MIN_SILENCE_SECONDS,
+                  min_speech=MIN_SPEECH_SECONDS, pad=PAD_SECONDS):
+    """Konuşma bölgelerini (başlangıç_örneği, bitiş_örneği) listesi olarak döndürür"""
+    levels = frame_levels_db(audio)
+    if len(levels) == 0:
+        return []
+
+    # Gürültü tabanı: en sessiz karelerin seviyesi
+    noise_floor = float(np.percentile(levels, 10))
+    threshold = max(noise_floor + margin_db, ABSOLUTE_FLOOR_DB)
+    active = levels > threshold
+
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    edges = np.flatnonzero(np.diff(active.astype(np.int8)))
+    starts = list(edges[~active[edges]] + 1)
+    ends = list(edges[active[edges]] + 1)
+    if active[0]:
+        starts.insert(0, 0)
+    if active[-1]:
+        ends.append(len(active))
+
+    regions = []
+    for start, end in zip(starts, ends):
+        start, end = start * frame, end * frame
+        if regions and (start - regions[-1][1]) < min_silence * SAMPLE_RATE:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    padding = int(pad * SAMPLE_RATE)
+    speech = []
+    for start, end in regions:
+        if end - start < min_speech * SAMPLE_RATE:
+            continue
+        start, end = max(0, start - padding), min(len(audio), end + padding)
+        if speech and start <= speech[-1][1]:
+            speech[-1] = (speech[-1][0], end)
+        else:
+            speech.append((start, end))
+    return speech
+
+
+def apply_vad(audio, **kwargs):
+    """Yalnızca konuşma bölgelerini birleştirir.
+
+    (konuşma_sesi, eşleme, istatistik) döndürür. eşleme, (sıkıştırılmış_başlangıç_sn,
+    özgün_başlangıç_sn, uzunluk_sn) listesidir; istatistik toplam/konuşma/atlanan
+    saniyeleri içerir.
+    """
+    regions = detect_speech(audio, **kwargs)
+    mapping = []
+    compact_position = 0
+    for start, end in regions:
+        mapping.append((compact_position / SAMPLE_RATE, start / SAMPLE_RATE, (end - start) / SAMPLE_RATE))
+        compact_position += end - start
+
+    if regions:
+        speech_audio = np.concatenate([audio[start:end] for start, end in regions])
+    else:
+        speech_audio = np.zeros(0, dtype=np.float32)
+
+    total = len(audio) / SAMPLE_RATE
+    speech = len(speech_audio) / SAMPLE_RATE
+    stats = {
+        'total_seconds': total,
+        'speech_seconds': speech,
+        'skipped_seconds': total - speech,
+        'skipped_ratio': (total - speech) / total if total else 0.0,
+        'regions': len(regions),
+    }
+    return speech_audio, mapping, stats
+
+
+def map_time(seconds, mapping, is_end=False):
+    """Sıkıştırılmış ses üzerindeki bir zamanı özgün zaman çizelgesine taşır"""
+    if not mapping:
+        return seconds
+    starts = [item[0] for item in mapping]
+    # Bitiş zamanları, bölgenin tam sonuna denk gelirse bir sonraki bölgeye değil bu bölgeye aittir
+    index = (bisect.bisect_left(starts, seconds) if is_end else bisect.bisect_right(starts, seconds)) - 1
+    index = max(0, index)
+    compact_start, original_start, length = mapping[index]
+    return original_start + min(max(seconds - compact_start, 0.0), length)
+
+
+def remap_segments(segments, mapping):
+    """Segmentlerin zamanlarını özgün zaman çizelgesine taşır"""
+    remapped = []
+    for segment in segments:
+        segment = dict(segment)
+        segment['start'] = map_time(segment.get('start', 0), mapping)
+        segment['end'] = max(segment['start'], map_time(segment.get('end', 0), mapping, is_end=True))
+        remapped.append(segment)
+    return remapped
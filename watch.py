@@ -0,0 +1,256 @@
+"""Klasör izleme (watch) modu: klasöre bırakılan kayıtları kendiliğinden transkribe eder.
+
+Bir ya da daha fazla klasör belirli aralıklarla taranır. Yeni bir video,
+boyutu ve değişiklik zamanı bir süre sabit kaldığında (kopyalama bitince)
+işlenir; çıktılar toplu moddaki gibi dosyanın yanına, geçici dosyadan yerine
+konarak yazılır. Aynı anda en fazla --workers dosya işlenir.
+
+Durum ~/.speechrecog/watch.db içinde tutulur: her dosyanın boyutu, değişiklik
+zamanı ve içerik parmak izi. Yeniden başlatıldığında boyutu ve zamanı
+değişmemiş dosyalar parmak izi hesaplanmadan atlanır; başka adla kopyalanmış
+ama içeriği zaten işlenmiş dosyalar da (parmak izinden) atlanır. Hata veren
+dosyalar artan aralıklarla ve yeniden başlatıldığında tekrar denenir.
+
+Kullanım:
+    python SpeechRecog.py watch gelen/ [paylasim/] [--workers 2] [--interval 5] [--stable-seconds 10]
+"""
+import argparse
+import contextlib
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import batch
+import pipeline
+from backends import BACKENDS
+from cache import data_dir, file_fingerprint
+from config import load_config
+
+
+DONE = "done"
+FAILED = "failed"
+DUPLICATE = "duplicate"
+# Bu durumlardaki dosyalar değişmedikçe tekrar işlenmez; FAILED olanlar yeniden denenir
+SETTLED = (DONE, DUPLICATE)
+
+# Hata veren dosya ilk kez bu kadar sonra, sonra her seferinde iki katı (en fazla RETRY_MAX_SECONDS) sonra denenir
+RETRY_SECONDS = 60
+RETRY_MAX_SECONDS = 3600
+
+
+class WatchState:
+    """İzlenen dosyaların kalıcı durumu: yol -> (boyut, değişiklik zamanı, parmak izi, sonuç)"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(data_dir(), "watch.db")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " fingerprint TEXT NOT NULL, status TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS files_fingerprint ON files(fingerprint, status)")
+            # Tarama her dosya için veritabanına gitmesin diye bitmiş dosyaların imzaları bellekte tutulur
+            self.signatures = {path: (size, mtime_ns) for path, size, mtime_ns in conn.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE status IN (?, ?)", SETTLED).fetchall()}
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def is_known(self, path, signature):
+        """Dosya bu haliyle işlendi mi (hata verenler bilinmiyor sayılır, yeniden denenir)"""
+        return self.signatures.get(path) == signature
+
+    def processed_as(self, fingerprint):
+        """Bu içerik daha önce başarıyla işlendiyse o dosyanın yolu"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT path FROM files WHERE fingerprint = ? AND status = ?",
+                               (fingerprint, DONE)).fetchone()
+        return row[0] if row else None
+
+    def mark(self, path, signature, fingerprint, status):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO files(path, size, mtime_ns, fingerprint, status, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?)", (path, signature[0], signature[1], fingerprint, status, time.time())
+            )
+        if status in SETTLED:
+            self.signatures[path] = signature
+        else:
+            self.signatures.pop(path, None)
+
+
+def scan(directories, recursive=False):
+    """İzlenen klasörlerdeki videoları (yol, stat) olarak üretir"""
+    stack = list(directories)
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            print(f"Klasör okunamadı: {directory}: {e}")
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith(batch.VIDEO_EXTENSIONS):
+                    yield os.path.abspath(entry.path), entry.stat()
+            except OSError:
+                continue  # Tarama sırasında silinen dosya
+
+
+class FolderWatcher:
+    def __init__(self, directories, executor, workers=1, stable_seconds=10.0, recursive=False, state=None):
+        self.directories = directories
+        self.executor = executor
+        self.workers = workers
+        self.stable_seconds = stable_seconds
+        self.recursive = recursive
+        self.state = state or WatchState()
+        self.pending = {}  # yol -> (imza, imzanın ilk görüldüğü an)
+        self.running = {}  # future -> (yol, imza, parmak izi)
+        self.failures = {}  # yol -> (imza, deneme sayısı, yeniden deneme anı)
+        self.results = []
+
+    def poll(self):
+        """Bir tarama turu: biten işleri kaydet, kararlı hale gelen yeni dosyaları sıraya al"""
+        self.collect()
+        now = time.time()
+        running_paths = {path for path, _, _ in self.running.values()}
+        seen = set()
+        ready = []
+        for path, stat in scan(self.directories, self.recursive):
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if path in running_paths or self.state.is_known(path, signature) or stat.st_size == 0:
+                continue
+            failure = self.failures.get(path)
+            if failure is not None and failure[0] == signature and now < failure[2]:
+                continue
+            seen.add(path)
+            previous = self.pending.get(path)
+            if previous is None or previous[0] != signature:
+                # Değişiklik zamanına güvenilmez (robocopy yarım dosyaya 1980 tarihini ve tam boyutu
+                # verir); her dosya en az bir tam kararlılık aralığı boyunca gözlenir
+                self.pending[path] = (signature, now)
+                previous = self.pending[path]
+            if now - previous[1] >= self.stable_seconds:
+                ready.append(path)
+        # Taramada artık görünmeyen (silinen ya da taşınan) dosyaları unut
+        self.pending = {path: value for path, value in self.pending.items() if path in seen}
+
+        for path in sorted(ready):
+            if len(self.running) >= self.workers:
+                break
+            self.start(path)
+
+    def start(self, path):
+        signature = self.pending.pop(path)[0]
+        try:
+            fingerprint = file_fingerprint(path)
+        except OSError as e:
+            print(f"Dosya okunamadı: {path}: {e}")
+            return
+        original = self.state.processed_as(fingerprint)
+        if original is not None:
+            print(f"⏭️ {os.path.basename(path)} zaten işlendi ({original}), atlanıyor")
+            self.state.mark(path, signature, fingerprint, DUPLICATE)
+            return
+        print(f"➕ {os.path.basename(path)}")
+        self.running[self.executor.submit(batch._process_one, path)] = (path, signature, fingerprint)
+
+    def collect(self):
+        for future in [future for future in self.running if future.done()]:
+            path, signature, fingerprint = self.running.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'path': path, 'duration': 0.0, 'segments': 0, 'skipped': 0.0, 'elapsed': 0.0, 'error': str(e)}
+            self.results.append(result)
+            total = len(self.results) + len(self.running) + len(self.pending)
+            batch.print_result(len(self.results), total, result)
+            if result['error']:
+                attempts = self.failures[path][1] + 1 if path in self.failures else 1
+                delay = min(RETRY_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+                self.failures[path] = (signature, attempts, time.time() + delay)
+                print(f"🔁 {os.path.basename(path)} {delay} sn sonra yeniden denenecek")
+                self.state.mark(path, signature, fingerprint, FAILED)
+            else:
+                self.failures.pop(path, None)
+                self.state.mark(path, signature, fingerprint, DONE)
+
+    def idle(self):
+        """--once için: bekleyen ya da çalışan iş yok (yeniden denenecek hatalı dosyalar beklenmez)"""
+        return not self.pending and not self.running
+
+
+def build_parser():
+    settings = load_config()
+    parser = argparse.ArgumentParser(prog="SpeechRecog.py watch", description="Klasörlere bırakılan videoları kendiliğinden transkribe eder.")
+    parser.add_argument('directories', nargs='+', help="İzlenecek klasörler")
+    parser.add_argument('--workers', type=int, default=1, help="Aynı anda işlenecek en fazla dosya (her işçi kendi modelini yükler)")
+    parser.add_argument('--interval', type=float, default=5.0, help="Tarama aralığı (sn)")
+    parser.add_argument('--stable-seconds', type=float, default=10.0,
+                        help="Dosyanın boyutu ve zamanı bu kadar süre değişmeyince yazılması bitmiş sayılır")
+    parser.add_argument('--recursive', action='store_true', help="Alt klasörleri de izle")
+    parser.add_argument('--once', action='store_true', help="Mevcut dosyaları işle ve çık")
+    parser.add_argument('--model', default=settings['model'], help="Whisper model adı")
+    parser.add_argument('--audio-mode', choices=pipeline.AUDIO_MODES, default=settings['audio_mode'],
+                        help="memory: sesi doğrudan belleğe çöz, wav: geçici WAV dosyası kullan")
+    parser.add_argument('--vad', action='store_true', default=settings['vad'],
+                        help="Konuşma dışı sesi (sessizlik, gürültü) modele vermeden atla")
+    parser.add_argument('--backend', choices=BACKENDS, default=settings['backend'],
+                        help="Çıkarım arka ucu: stock (fp32) ya da int8 (dinamik nicemleme, yalnızca CPU)")
+    parser.add_argument('--intra-op-threads', type=int, default=settings['intra_op_threads'],
+                        help="İşçi başına torch işlem içi thread sayısı (0 = çekirdek sayısı / işçi)")
+    parser.add_argument('--inter-op-threads', type=int, default=settings['inter_op_threads'],
+                        help="torch işlemler arası thread sayısı (0 = torch varsayılanı)")
+    batch.add_language_arguments(parser, settings)
+    parser.add_argument('--no-cache', action='store_true', help="Transkript önbelleğini kullanma")
+    parser.add_argument('--no-library', action='store_true', help="Transkriptleri aranabilir kütüphaneye ekleme")
+    parser.add_argument('--report', default=None, help="Dosya başına aşama sürelerinin yazılacağı JSONL raporu")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    directories = [os.path.abspath(directory) for directory in args.directories]
+    missing = [directory for directory in directories if not os.path.isdir(directory)]
+    if missing:
+        print(f"Klasör bulunamadı: {', '.join(missing)}")
+        return 1
+
+    workers = max(1, args.workers)
+    threads_per_worker = args.intra_op_threads or max(1, (os.cpu_count() or 1) // workers)
+    print(f"İzleniyor: {', '.join(directories)} ({workers} işçi, model: {args.model}, her {args.interval:.0f} sn)")
+    with ProcessPoolExecutor(max_workers=workers, initializer=batch._init_worker,
+                             initargs=(args.model, threads_per_worker, args.audio_mode, not args.no_cache, args.vad,
+                                       args.backend, args.inter_op_threads, args.report, False,
+                                       not args.no_library, batch.language_rules(args))) as executor:
+        watcher = FolderWatcher(directories, executor, workers=workers, stable_seconds=args.stable_seconds,
+                                recursive=args.recursive)
+        try:
+            while True:
+                watcher.poll()
+                if args.once and watcher.idle():
+                    break
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            print("Durduruluyor...")
+            executor.shutdown(wait=False, cancel_futures=True)
+            return 130
+    return 0 if all(not r['error'] for r in watcher.results) else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())